@@ -0,0 +1,240 @@
+"""
+업스트림별 적응형 동시 요청 제한 (AIMD)
+=======================================
+속도 제한(rate_limiter)은 "1초에 몇 번"을 지켜주지만, 동시에 몇 개를
+열어둘지는 정하지 않아요. 백필처럼 요청을 많이 보내는 작업은
+KRX가 얼마나 버텨주는지 모르니 고정값을 정하기도 어렵습니다.
+
+AdaptiveConcurrency는 (초등학생 설명):
+  - 호스트마다 "동시에 들어갈 수 있는 인원(window)"을 정해두고
+  - 요청이 잘 끝날 때마다 인원을 조금씩 늘려요 (덧셈 증가: window마다 +1)
+  - 403/429/503을 받거나 세션이 튕기면(LOGOUT) 인원을 반으로 줄여요 (곱셈 감소)
+  → TCP 혼잡 제어처럼, 버틸 수 있는 만큼까지 빠르게, 막히면 바로 물러남
+
+  - 한 번 줄인 뒤 KRX_AIMD_COOLDOWN_SEC 동안은 또 줄이지 않음
+    (동시에 튕긴 요청 여러 개가 window를 바닥까지 떨어뜨리지 않도록)
+
+설정:
+  KRX_AIMD_INITIAL=4  KRX_AIMD_MIN=1  KRX_AIMD_MAX=16
+  KRX_AIMD_DECREASE=0.5  KRX_AIMD_COOLDOWN_SEC=2
+
+사용법:
+  aimd = get_adaptive_concurrency()
+  with aimd.slot(url) as slot:
+      resp = session.post(url, ...)
+      if resp.status_code in BACKOFF_STATUS:
+          slot.backoff()
+  aimd.backoff(url, "logout")     # 응답 내용으로 세션 끊김을 알게 됐을 때
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+AIMD_INITIAL = float(os.environ.get("KRX_AIMD_INITIAL", "4"))
+AIMD_MIN = float(os.environ.get("KRX_AIMD_MIN", "1"))
+AIMD_MAX = float(os.environ.get("KRX_AIMD_MAX", "16"))
+AIMD_DECREASE = float(os.environ.get("KRX_AIMD_DECREASE", "0.5"))
+AIMD_COOLDOWN = float(os.environ.get("KRX_AIMD_COOLDOWN_SEC", "2"))
+
+# 차단/과부하로 보고 window를 줄이는 응답 코드
+BACKOFF_STATUS = (403, 429, 503)
+
+
+def _host(url_or_host: str) -> str:
+    if "://" in url_or_host:
+        return urlparse(url_or_host).hostname or url_or_host
+    return url_or_host
+
+
+def _set_done(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class _Window:
+    __slots__ = (
+        "limit", "in_flight", "peak", "successes", "backoffs",
+        "last_backoff", "last_reason",
+    )
+
+    def __init__(self, limit: float):
+        self.limit = limit
+        self.in_flight = 0
+        self.peak = 0
+        self.successes = 0
+        self.backoffs = 0
+        self.last_backoff = 0.0
+        self.last_reason: Optional[str] = None
+
+
+class Slot:
+    """slot() 안에서 결과를 알려주는 핸들 (기본: 예외 없으면 성공)"""
+
+    __slots__ = ("outcome", "reason")
+
+    def __init__(self):
+        self.outcome = "ok"
+        self.reason: Optional[str] = None
+
+    def backoff(self, reason: str = "throttled"):
+        self.outcome = "backoff"
+        self.reason = reason
+
+
+class AdaptiveConcurrency:
+    """호스트별 AIMD 동시 요청 창 (스레드 + asyncio 안전)"""
+
+    def __init__(
+        self,
+        initial: float = AIMD_INITIAL,
+        minimum: float = AIMD_MIN,
+        maximum: float = AIMD_MAX,
+        decrease: float = AIMD_DECREASE,
+        cooldown: float = AIMD_COOLDOWN,
+    ):
+        self.minimum = max(1.0, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.initial = min(self.maximum, max(self.minimum, initial))
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self._cond = threading.Condition()
+        self._windows: dict[str, _Window] = {}
+        # 호스트 → 자리를 기다리는 asyncio 대기자 (이벤트 루프, future)
+        self._async_waiters: dict[str, list[tuple[asyncio.AbstractEventLoop, asyncio.Future]]] = {}
+
+    def _window(self, host: str) -> _Window:
+        window = self._windows.get(host)
+        if window is None:
+            window = _Window(self.initial)
+            self._windows[host] = window
+        return window
+
+    def _try_enter(self, host: str) -> bool:
+        window = self._window(host)
+        if window.in_flight >= int(window.limit):
+            return False
+        window.in_flight += 1
+        window.peak = max(window.peak, window.in_flight)
+        return True
+
+    def _decrease(self, window: _Window, host: str, reason: str):
+        now = time.monotonic()
+        window.last_reason = reason
+        if now - window.last_backoff < self.cooldown:
+            return
+        old = window.limit
+        window.limit = max(self.minimum, window.limit * self.decrease)
+        window.last_backoff = now
+        window.backoffs += 1
+        logger.warning(f"[AIMD] {host} 동시 요청 {old:.1f} → {window.limit:.1f} ({reason})")
+
+    def _leave(self, host: str, slot: Slot):
+        with self._cond:
+            window = self._window(host)
+            window.in_flight -= 1
+            if slot.outcome == "ok":
+                window.successes += 1
+                window.limit = min(self.maximum, window.limit + 1.0 / window.limit)
+            elif slot.outcome == "backoff":
+                self._decrease(window, host, slot.reason or "throttled")
+            self._cond.notify_all()
+            self._wake_async(host)
+
+    def _wake_async(self, host: str):
+        """자리가 났다고 asyncio 대기자에게 알림 (어느 스레드에서 불러도 각자의 루프로 전달)"""
+        for loop, waiter in self._async_waiters.pop(host, ()):
+            try:
+                loop.call_soon_threadsafe(_set_done, waiter)
+            except RuntimeError:
+                pass  # 이미 닫힌 루프
+
+    @contextmanager
+    def slot(self, url_or_host: str):
+        """동시 요청 자리 하나 차지 (자리가 없으면 날 때까지 대기)"""
+        host = _host(url_or_host)
+        with self._cond:
+            while not self._try_enter(host):
+                self._cond.wait(timeout=1.0)
+        slot = Slot()
+        try:
+            yield slot
+        except BaseException:
+            slot.outcome = "error"  # 네트워크 오류 등은 window를 바꾸지 않음
+            raise
+        finally:
+            self._leave(host, slot)
+
+    @asynccontextmanager
+    async def slot_async(self, url_or_host: str):
+        """slot의 asyncio 버전 (이벤트 루프를 막지 않고 대기)"""
+        host = _host(url_or_host)
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self._try_enter(host):
+                    break
+                # 자리가 날 때 _leave가 깨워줄 future를 걸어두고 기다림
+                waiter = loop.create_future()
+                self._async_waiters.setdefault(host, []).append((loop, waiter))
+            try:
+                await waiter
+            finally:
+                with self._cond:
+                    waiters = self._async_waiters.get(host)
+                    if waiters and (loop, waiter) in waiters:
+                        waiters.remove((loop, waiter))
+        slot = Slot()
+        try:
+            yield slot
+        except BaseException:
+            slot.outcome = "error"
+            raise
+        finally:
+            self._leave(host, slot)
+
+    def backoff(self, url_or_host: str, reason: str):
+        """응답 본문 등으로 뒤늦게 알게 된 차단 신호 (예: LOGOUT)"""
+        host = _host(url_or_host)
+        with self._cond:
+            self._decrease(self._window(host), host, reason)
+
+    def status(self) -> dict:
+        with self._cond:
+            return {
+                "initial": self.initial,
+                "min": self.minimum,
+                "max": self.maximum,
+                "decrease": self.decrease,
+                "cooldown_sec": self.cooldown,
+                "hosts": {
+                    host: {
+                        "window": round(w.limit, 2),
+                        "in_flight": w.in_flight,
+                        "peak_in_flight": w.peak,
+                        "successes": w.successes,
+                        "backoffs": w.backoffs,
+                        "last_backoff_reason": w.last_reason,
+                    }
+                    for host, w in sorted(self._windows.items())
+                },
+            }
+
+
+# 전역 싱글톤
+_aimd: Optional[AdaptiveConcurrency] = None
+
+
+def get_adaptive_concurrency() -> AdaptiveConcurrency:
+    """적응형 동시 요청 제한기 싱글톤"""
+    global _aimd
+    if _aimd is None:
+        _aimd = AdaptiveConcurrency()
+    return _aimd
@@ -5,9 +5,23 @@ KRX ID/PW 로그인 → 31개 데이터 엔드포인트 + 자연어 질의 + 온
 프론트엔드: krxdata.co.kr/data-explore/
 
 모든 엔드포인트는 /api/data-explore/ prefix로 노출됩니다.
+
+Stale-while-revalidate 모드 (KRX_SWR_ENABLED=1):
+  캐시에 조금 오래된 값이 있으면 KRX를 기다리지 않고 바로 돌려주고,
+  새 값은 뒤에서 받아와 캐시를 갈아 끼웁니다.
+  - 응답 헤더 X-Data-Age: 데이터를 받아온 지 몇 초 지났는지
+  - 엔드포인트별 최대 허용 나이(SWR_MAX_STALE)를 넘으면 기다려서 새로 받음
+
+일괄 조회 (POST /api/data-explore/batch):
+  화면 하나에 필요한 요청 여러 개를 한 번에 보내면, 같은 요청은 합치고
+  나머지는 동시에 실행해서 항목별 결과(실패는 항목별 error)로 돌려줍니다.
 """
 
+import asyncio
 import logging
+import os
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -16,12 +30,48 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
 from .krx_auth import get_krx_auth, KRX_AUTH_ENDPOINTS
+from .krx_calendar import get_calendar
 from .krx_ontology import execute_nl_query, get_ontology_summary
+from .krx_schema import json_records
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# ── Stale-while-revalidate 설정 ──
+
+SWR_ENABLED = os.environ.get("KRX_SWR_ENABLED", "0").lower() in ("1", "true", "yes")
+
+# 기본 최대 허용 나이 (초) — 이보다 오래된 캐시는 바로 돌려주지 않음
+SWR_DEFAULT_MAX_STALE = int(os.environ.get("KRX_SWR_MAX_STALE_SEC", "300"))
+
+# 엔드포인트별 최대 허용 나이 (장중에 빨리 바뀌는 시세는 짧게)
+SWR_MAX_STALE = {
+    "all_stock_price": 60,
+    "market_cap": 60,
+    "index_price": 60,
+    "etf_price": 60,
+    "etn_price": 60,
+    "elw_price": 60,
+    "derivative_price": 60,
+    "market_trading": 120,
+    "short_selling_top50": 120,
+}
+
+_swr_lock = threading.Lock()
+_swr_refreshing: set[tuple] = set()
+# 실행 중인 백그라운드 갱신 태스크 (GC로 사라지지 않도록 참조 유지)
+_swr_tasks: set[asyncio.Task] = set()
+_swr_stats = {"served_stale": 0, "served_fresh": 0, "waited": 0, "refreshes": 0, "refresh_errors": 0}
+
+# ── 일괄 조회 설정 ──
+
+# 한 번에 받을 수 있는 항목 수
+BATCH_MAX_ITEMS = int(os.environ.get("KRX_BATCH_MAX_ITEMS", "50"))
+
+# 일괄 조회 하나가 동시에 실행하는 조회 수 (실제 KRX 속도는 호스트별 제한기가 조절)
+BATCH_CONCURRENCY = int(os.environ.get("KRX_BATCH_CONCURRENCY", "8"))
+
 
 # ── 자연어 질의 요청 모델 ──
 
@@ -30,20 +80,60 @@ class NLQueryRequest(BaseModel):
     execute: bool = True
 
 
+# ── 일괄 조회 요청 모델 ──
+
+class BatchItem(BaseModel):
+    endpoint: str
+    params: dict = {}
+    id: Optional[str] = None  # 결과 키 (없으면 항목 순서 번호)
+
+
+class BatchRequest(BaseModel):
+    items: list[BatchItem]
+
+
+# 기간 엔드포인트의 시작일 기본값 (오늘로부터 며칠 전) — 개별 라우트와 /batch가 같이 씀
+# 여기 없는 기간 엔드포인트(stock_daily)는 시작일을 꼭 받아야 함
+RANGE_DEFAULT_DAYS = {
+    "index_trend": 30,
+    "investor_summary": 7,
+    "investor_trend": 30,
+    "investor_daily": 30,
+    "investor_by_stock": 30,
+    "investor_top_net_buying": 7,
+    "program_daily": 30,
+    "short_selling_stock": 30,
+    "short_selling_stock_daily": 30,
+    "short_selling_investor": 30,
+    "short_selling_balance": 30,
+    "bond_yield_trend": 90,
+}
+
+# KRX_AUTH_ENDPOINTS의 default_params에 없는 라우트 기본값
+ROUTE_PARAM_DEFAULTS = {
+    "index_trend": {"idxCd": "1"},
+}
+
+
+def _default_start(endpoint_key: str) -> str:
+    """기간 엔드포인트의 기본 시작일 (YYYYMMDD)"""
+    days = RANGE_DEFAULT_DAYS[endpoint_key]
+    return (datetime.now() - timedelta(days=days)).strftime("%Y%m%d")
+
+
 def _today() -> str:
-    """오늘 날짜 (YYYYMMDD). 주말이면 직전 금요일."""
-    d = datetime.now()
-    wd = d.weekday()
-    if wd == 5:  # Saturday
-        d -= timedelta(days=1)
-    elif wd == 6:  # Sunday
-        d -= timedelta(days=2)
-    return d.strftime("%Y%m%d")
-
-
-def _df_to_response(df, endpoint_key: str, extra: dict = None) -> JSONResponse:
-    """DataFrame → JSON 응답"""
-    records = df.to_dict(orient="records") if not df.empty else []
+    """오늘 날짜 (YYYYMMDD). 휴장일(주말/공휴일)이면 직전 거래일."""
+    return get_calendar().latest_trading_day()
+
+
+def _records(df) -> list[dict]:
+    """DataFrame → 행 리스트 (스키마상 숫자 컬럼의 "-"/빈칸 NaN은 JSON null로)"""
+    return json_records(df)
+
+
+def _df_to_response(df, endpoint_key: str, extra: dict = None, age: float = None) -> JSONResponse:
+    """DataFrame → JSON 응답 (age가 있으면 X-Data-Age 헤더 추가)"""
+    records = _records(df)
     body = {
         "endpoint": endpoint_key,
         "rows": len(records),
@@ -52,7 +142,76 @@ def _df_to_response(df, endpoint_key: str, extra: dict = None) -> JSONResponse:
     }
     if extra:
         body.update(extra)
-    return JSONResponse(body)
+    headers = {"X-Data-Age": str(int(age))} if age is not None else None
+    return JSONResponse(body, headers=headers)
+
+
+def _swr_bump(name: str):
+    with _swr_lock:
+        _swr_stats[name] += 1
+
+
+def _swr_refresh(endpoint_key: str, params: dict):
+    """백그라운드 갱신 (같은 요청은 한 번만)"""
+    key = (endpoint_key, tuple(sorted((k, str(v)) for k, v in params.items())))
+    with _swr_lock:
+        if key in _swr_refreshing:
+            return
+        _swr_refreshing.add(key)
+
+    async def run():
+        try:
+            await get_krx_auth().fetch_async(endpoint_key, **params)
+            _swr_bump("refreshes")
+        except Exception as e:
+            logger.warning(f"[SWR] 백그라운드 갱신 실패 ({endpoint_key}): {e}")
+            _swr_bump("refresh_errors")
+        finally:
+            with _swr_lock:
+                _swr_refreshing.discard(key)
+
+    task = asyncio.get_running_loop().create_task(run())
+    _swr_tasks.add(task)
+    task.add_done_callback(_swr_tasks.discard)
+
+
+async def _fetch(endpoint_key: str, **params):
+    """엔드포인트 조회 → (DataFrame, 데이터 나이 초 또는 None)
+
+    SWR 모드가 꺼져 있으면 기존처럼 바로 KRX에서 가져옵니다.
+    KRX 요청은 공유 AsyncClient로 보내므로 기다리는 동안 다른 요청을 처리합니다.
+    """
+    auth = get_krx_auth()
+    if not SWR_ENABLED:
+        return await auth.fetch_async(endpoint_key, **params), None
+
+    # 공유 캐시 조회는 소켓 읽기 + Parquet 복원이라 스레드에서
+    hit = await asyncio.to_thread(auth.peek, endpoint_key, **params)
+    if hit is not None:
+        df, age, fresh = hit
+        if fresh:
+            _swr_bump("served_fresh")
+            return df, age
+        if age <= SWR_MAX_STALE.get(endpoint_key, SWR_DEFAULT_MAX_STALE):
+            _swr_bump("served_stale")
+            _swr_refresh(endpoint_key, params)
+            return df, age
+
+    # 캐시 없음 또는 너무 오래됨 → 기다려서 새로 받음 (이벤트 루프는 막지 않음)
+    _swr_bump("waited")
+    df = await auth.fetch_async(endpoint_key, **params)
+    return df, 0.0
+
+
+def _swr_status() -> dict:
+    with _swr_lock:
+        return {
+            "enabled": SWR_ENABLED,
+            "default_max_stale_sec": SWR_DEFAULT_MAX_STALE,
+            "max_stale_sec": SWR_MAX_STALE,
+            "refreshing": len(_swr_refreshing),
+            **_swr_stats,
+        }
 
 
 # ── 메타 엔드포인트 ──
@@ -61,7 +220,9 @@ def _df_to_response(df, endpoint_key: str, extra: dict = None) -> JSONResponse:
 async def status():
     """KRX 로그인 상태 확인"""
     auth = get_krx_auth()
-    return auth.status()
+    body = auth.status()
+    body["swr"] = _swr_status()
+    return body
 
 
 @router.get("/endpoints")
@@ -102,6 +263,102 @@ async def nl_query(
         )
 
 
+# ── 일괄 조회 ──
+
+def _batch_params(endpoint_key: str, params: dict) -> dict:
+    """개별 엔드포인트와 같은 기본값 채우기 (날짜 생략 시 최근 거래일/기간 기본값)
+
+    Raises:
+        ValueError: 시작일 기본값이 없는 기간 엔드포인트(stock_daily)에 strtDd가 없음
+    """
+    params = {k: str(v) for k, v in params.items() if v is not None}
+    for key, value in ROUTE_PARAM_DEFAULTS.get(endpoint_key, {}).items():
+        params.setdefault(key, value)
+    if KRX_AUTH_ENDPOINTS[endpoint_key].get("date_param") == "trdDd":
+        params.setdefault("trdDd", _today())
+        return params
+    if "strtDd" not in params:
+        if endpoint_key not in RANGE_DEFAULT_DAYS:
+            raise ValueError("기간 엔드포인트는 params.strtDd(YYYYMMDD)가 필요합니다")
+        params["strtDd"] = _default_start(endpoint_key)
+    params.setdefault("endDd", _today())
+    return params
+
+
+@router.post("/batch")
+async def batch(req: BatchRequest):
+    """
+    여러 엔드포인트를 한 번에 조회.
+    같은 (endpoint, params) 항목은 한 번만 조회하고, 나머지는 동시에 실행합니다.
+    실패한 항목은 results[키].error 로 알려주고 다른 항목은 그대로 돌려줍니다.
+    날짜를 생략하면 개별 엔드포인트와 같은 기본값(최근 거래일, RANGE_DEFAULT_DAYS)을 씁니다.
+
+    요청 예: {"items": [{"id": "kospi", "endpoint": "all_stock_price", "params": {"mktId": "STK"}},
+                        {"endpoint": "index_price"}]}
+    """
+    if len(req.items) > BATCH_MAX_ITEMS:
+        return JSONResponse(
+            {"error": f"항목은 최대 {BATCH_MAX_ITEMS}개까지 보낼 수 있습니다", "items": len(req.items)},
+            status_code=400,
+        )
+
+    started = time.time()
+    results: dict[str, dict] = {}
+    jobs: dict[tuple, list[str]] = {}  # 중복 제거된 조회 → 그 결과를 받을 항목 키들
+    job_params: dict[tuple, tuple[str, dict]] = {}
+    keys: list[str] = []  # 항목 순서대로 결과를 돌려주기 위해
+    for i, item in enumerate(req.items):
+        item_key = item.id or str(i)
+        if item_key in keys:
+            item_key = f"{item_key}#{i}"
+        keys.append(item_key)
+        if item.endpoint not in KRX_AUTH_ENDPOINTS:
+            results[item_key] = {"endpoint": item.endpoint, "ok": False, "error": "알 수 없는 엔드포인트"}
+            continue
+        try:
+            params = _batch_params(item.endpoint, item.params)
+        except ValueError as e:
+            results[item_key] = {"endpoint": item.endpoint, "ok": False, "error": str(e)}
+            continue
+        job = (item.endpoint, tuple(sorted(params.items())))
+        jobs.setdefault(job, []).append(item_key)
+        job_params[job] = (item.endpoint, params)
+
+    semaphore = asyncio.Semaphore(max(1, BATCH_CONCURRENCY))
+
+    async def run(job: tuple) -> dict:
+        endpoint_key, params = job_params[job]
+        try:
+            async with semaphore:
+                df, age = await _fetch(endpoint_key, **params)
+        except Exception as e:
+            logger.warning(f"[batch] {endpoint_key} 조회 실패: {e}")
+            return {"endpoint": endpoint_key, "params": params, "ok": False, "error": str(e)}
+        records = _records(df)
+        return {
+            "endpoint": endpoint_key,
+            "params": params,
+            "ok": True,
+            "rows": len(records),
+            "columns": list(df.columns) if not df.empty else [],
+            "age": int(age) if age is not None else None,
+            "data": records,
+        }
+
+    order = list(jobs)
+    for job, result in zip(order, await asyncio.gather(*(run(job) for job in order))):
+        for item_key in jobs[job]:
+            results[item_key] = result
+
+    return JSONResponse({
+        "items": len(req.items),
+        "unique": len(order),
+        "failed": sum(1 for r in results.values() if not r["ok"]),
+        "elapsed_sec": round(time.time() - started, 3),
+        "results": {k: results[k] for k in keys},
+    })
+
+
 # ── 단일 날짜 조회 엔드포인트 ──
 
 @router.get("/all-stock-price")
@@ -109,9 +366,8 @@ async def all_stock_price(
     date: str = Query(default=None, description="YYYYMMDD"),
     market: str = Query(default="STK", description="STK/KSQ/KNX"),
 ):
-    auth = get_krx_auth()
-    df = auth.fetch("all_stock_price", trdDd=date or _today(), mktId=market)
-    return _df_to_response(df, "all_stock_price", {"date": date or _today()})
+    df, age = await _fetch("all_stock_price", trdDd=date or _today(), mktId=market)
+    return _df_to_response(df, "all_stock_price", {"date": date or _today()}, age=age)
 
 
 @router.get("/market-cap")
@@ -119,79 +375,68 @@ async def market_cap(
     date: str = Query(default=None),
     market: str = Query(default="STK"),
 ):
-    auth = get_krx_auth()
-    df = auth.fetch("market_cap", trdDd=date or _today(), mktId=market)
-    return _df_to_response(df, "market_cap", {"date": date or _today()})
+    df, age = await _fetch("market_cap", trdDd=date or _today(), mktId=market)
+    return _df_to_response(df, "market_cap", {"date": date or _today()}, age=age)
 
 
 @router.get("/market-trading")
 async def market_trading(date: str = Query(default=None), market: str = Query(default="STK")):
-    auth = get_krx_auth()
-    df = auth.fetch("market_trading", trdDd=date or _today(), mktId=market)
-    return _df_to_response(df, "market_trading")
+    df, age = await _fetch("market_trading", trdDd=date or _today(), mktId=market)
+    return _df_to_response(df, "market_trading", age=age)
 
 
 @router.get("/foreign-holding")
 async def foreign_holding(date: str = Query(default=None), market: str = Query(default="STK")):
-    auth = get_krx_auth()
-    df = auth.fetch("foreign_holding", trdDd=date or _today(), mktId=market)
-    return _df_to_response(df, "foreign_holding")
+    df, age = await _fetch("foreign_holding", trdDd=date or _today(), mktId=market)
+    return _df_to_response(df, "foreign_holding", age=age)
 
 
 @router.get("/foreign-exhaustion")
 async def foreign_exhaustion(date: str = Query(default=None), market: str = Query(default="STK")):
-    auth = get_krx_auth()
-    df = auth.fetch("foreign_exhaustion", trdDd=date or _today(), mktId=market)
-    return _df_to_response(df, "foreign_exhaustion")
+    df, age = await _fetch("foreign_exhaustion", trdDd=date or _today(), mktId=market)
+    return _df_to_response(df, "foreign_exhaustion", age=age)
 
 
 @router.get("/sector-price")
 async def sector_price(date: str = Query(default=None), market: str = Query(default="STK")):
-    auth = get_krx_auth()
-    df = auth.fetch("sector_price", trdDd=date or _today(), mktId=market)
-    return _df_to_response(df, "sector_price")
+    df, age = await _fetch("sector_price", trdDd=date or _today(), mktId=market)
+    return _df_to_response(df, "sector_price", age=age)
 
 
 @router.get("/index-price")
 async def index_price(date: str = Query(default=None)):
-    auth = get_krx_auth()
-    df = auth.fetch("index_price", trdDd=date or _today())
-    return _df_to_response(df, "index_price")
+    df, age = await _fetch("index_price", trdDd=date or _today())
+    return _df_to_response(df, "index_price", age=age)
 
 
 @router.get("/etf-price")
 async def etf_price(date: str = Query(default=None)):
-    auth = get_krx_auth()
-    df = auth.fetch("etf_price", trdDd=date or _today())
-    return _df_to_response(df, "etf_price")
+    df, age = await _fetch("etf_price", trdDd=date or _today())
+    return _df_to_response(df, "etf_price", age=age)
 
 
 @router.get("/etn-price")
 async def etn_price(date: str = Query(default=None)):
-    auth = get_krx_auth()
-    df = auth.fetch("etn_price", trdDd=date or _today())
-    return _df_to_response(df, "etn_price")
+    df, age = await _fetch("etn_price", trdDd=date or _today())
+    return _df_to_response(df, "etn_price", age=age)
 
 
 @router.get("/elw-price")
 async def elw_price(date: str = Query(default=None)):
-    auth = get_krx_auth()
-    df = auth.fetch("elw_price", trdDd=date or _today())
-    return _df_to_response(df, "elw_price")
+    df, age = await _fetch("elw_price", trdDd=date or _today())
+    return _df_to_response(df, "elw_price", age=age)
 
 
 @router.get("/short-selling-all")
 async def short_selling_all(date: str = Query(default=None), market: str = Query(default="STK")):
-    auth = get_krx_auth()
-    df = auth.fetch("short_selling_all", trdDd=date or _today(), mktId=market)
-    return _df_to_response(df, "short_selling_all")
+    df, age = await _fetch("short_selling_all", trdDd=date or _today(), mktId=market)
+    return _df_to_response(df, "short_selling_all", age=age)
 
 
 @router.get("/short-selling-top50")
 async def short_selling_top50(date: str = Query(default=None)):
-    auth = get_krx_auth()
-    df = auth.fetch("short_selling_top50", trdDd=date or _today())
-    return _df_to_response(df, "short_selling_top50")
+    df, age = await _fetch("short_selling_top50", trdDd=date or _today())
+    return _df_to_response(df, "short_selling_top50", age=age)
 
 
 @router.get("/derivative-price")
@@ -199,51 +444,44 @@ async def derivative_price(
     date: str = Query(default=None),
     prodId: str = Query(default="KRDRVFUK2I", description="상품코드"),
 ):
-    auth = get_krx_auth()
-    df = auth.fetch("derivative_price", trdDd=date or _today(), prodId=prodId)
-    return _df_to_response(df, "derivative_price")
+    df, age = await _fetch("derivative_price", trdDd=date or _today(), prodId=prodId)
+    return _df_to_response(df, "derivative_price", age=age)
 
 
 @router.get("/bond-price")
 async def bond_price(date: str = Query(default=None)):
-    auth = get_krx_auth()
-    df = auth.fetch("bond_price", trdDd=date or _today())
-    return _df_to_response(df, "bond_price")
+    df, age = await _fetch("bond_price", trdDd=date or _today())
+    return _df_to_response(df, "bond_price", age=age)
 
 
 @router.get("/bond-yield")
 async def bond_yield(date: str = Query(default=None)):
-    auth = get_krx_auth()
-    df = auth.fetch("bond_yield", trdDd=date or _today())
-    return _df_to_response(df, "bond_yield")
+    df, age = await _fetch("bond_yield", trdDd=date or _today())
+    return _df_to_response(df, "bond_yield", age=age)
 
 
 @router.get("/program-trading")
 async def program_trading(date: str = Query(default=None)):
-    auth = get_krx_auth()
-    df = auth.fetch("program_trading", trdDd=date or _today())
-    return _df_to_response(df, "program_trading")
+    df, age = await _fetch("program_trading", trdDd=date or _today())
+    return _df_to_response(df, "program_trading", age=age)
 
 
 @router.get("/dividend")
 async def dividend(date: str = Query(default=None)):
-    auth = get_krx_auth()
-    df = auth.fetch("dividend", trdDd=date or _today())
-    return _df_to_response(df, "dividend")
+    df, age = await _fetch("dividend", trdDd=date or _today())
+    return _df_to_response(df, "dividend", age=age)
 
 
 @router.get("/issued-securities")
 async def issued_securities(date: str = Query(default=None)):
-    auth = get_krx_auth()
-    df = auth.fetch("issued_securities", trdDd=date or _today())
-    return _df_to_response(df, "issued_securities")
+    df, age = await _fetch("issued_securities", trdDd=date or _today())
+    return _df_to_response(df, "issued_securities", age=age)
 
 
 @router.get("/gold-price")
 async def gold_price(date: str = Query(default=None)):
-    auth = get_krx_auth()
-    df = auth.fetch("gold_price", trdDd=date or _today())
-    return _df_to_response(df, "gold_price")
+    df, age = await _fetch("gold_price", trdDd=date or _today())
+    return _df_to_response(df, "gold_price", age=age)
 
 
 # ── 기간 조회 엔드포인트 ──
@@ -254,21 +492,19 @@ async def stock_daily(
     start_date: str = Query(description="YYYYMMDD"),
     end_date: str = Query(default=None),
 ):
-    auth = get_krx_auth()
-    df = auth.fetch("stock_daily", isuCd=isuCd, strtDd=start_date, endDd=end_date or _today())
-    return _df_to_response(df, "stock_daily")
+    df, age = await _fetch("stock_daily", isuCd=isuCd, strtDd=start_date, endDd=end_date or _today())
+    return _df_to_response(df, "stock_daily", age=age)
 
 
 @router.get("/index-trend")
 async def index_trend(
-    idxCd: str = Query(default="1", description="지수코드"),
+    idxCd: str = Query(default=ROUTE_PARAM_DEFAULTS["index_trend"]["idxCd"], description="지수코드"),
     start_date: str = Query(default=None),
     end_date: str = Query(default=None),
 ):
-    auth = get_krx_auth()
-    sd = start_date or (datetime.now() - timedelta(days=30)).strftime("%Y%m%d")
-    df = auth.fetch("index_trend", idxCd=idxCd, strtDd=sd, endDd=end_date or _today())
-    return _df_to_response(df, "index_trend")
+    sd = start_date or _default_start("index_trend")
+    df, age = await _fetch("index_trend", idxCd=idxCd, strtDd=sd, endDd=end_date or _today())
+    return _df_to_response(df, "index_trend", age=age)
 
 
 @router.get("/investor-summary")
@@ -277,10 +513,9 @@ async def investor_summary(
     end_date: str = Query(default=None),
     market: str = Query(default="STK"),
 ):
-    auth = get_krx_auth()
-    sd = start_date or (datetime.now() - timedelta(days=7)).strftime("%Y%m%d")
-    df = auth.fetch("investor_summary", strtDd=sd, endDd=end_date or _today(), mktId=market)
-    return _df_to_response(df, "investor_summary")
+    sd = start_date or _default_start("investor_summary")
+    df, age = await _fetch("investor_summary", strtDd=sd, endDd=end_date or _today(), mktId=market)
+    return _df_to_response(df, "investor_summary", age=age)
 
 
 @router.get("/investor-trend")
@@ -289,10 +524,9 @@ async def investor_trend(
     end_date: str = Query(default=None),
     market: str = Query(default="STK"),
 ):
-    auth = get_krx_auth()
-    sd = start_date or (datetime.now() - timedelta(days=30)).strftime("%Y%m%d")
-    df = auth.fetch("investor_trend", strtDd=sd, endDd=end_date or _today(), mktId=market)
-    return _df_to_response(df, "investor_trend")
+    sd = start_date or _default_start("investor_trend")
+    df, age = await _fetch("investor_trend", strtDd=sd, endDd=end_date or _today(), mktId=market)
+    return _df_to_response(df, "investor_trend", age=age)
 
 
 @router.get("/investor-daily")
@@ -301,10 +535,9 @@ async def investor_daily(
     end_date: str = Query(default=None),
     market: str = Query(default="STK"),
 ):
-    auth = get_krx_auth()
-    sd = start_date or (datetime.now() - timedelta(days=30)).strftime("%Y%m%d")
-    df = auth.fetch("investor_daily", strtDd=sd, endDd=end_date or _today(), mktId=market)
-    return _df_to_response(df, "investor_daily")
+    sd = start_date or _default_start("investor_daily")
+    df, age = await _fetch("investor_daily", strtDd=sd, endDd=end_date or _today(), mktId=market)
+    return _df_to_response(df, "investor_daily", age=age)
 
 
 @router.get("/investor-by-stock")
@@ -313,10 +546,9 @@ async def investor_by_stock(
     start_date: str = Query(default=None),
     end_date: str = Query(default=None),
 ):
-    auth = get_krx_auth()
-    sd = start_date or (datetime.now() - timedelta(days=30)).strftime("%Y%m%d")
-    df = auth.fetch("investor_by_stock", isuCd=isuCd, strtDd=sd, endDd=end_date or _today())
-    return _df_to_response(df, "investor_by_stock")
+    sd = start_date or _default_start("investor_by_stock")
+    df, age = await _fetch("investor_by_stock", isuCd=isuCd, strtDd=sd, endDd=end_date or _today())
+    return _df_to_response(df, "investor_by_stock", age=age)
 
 
 @router.get("/investor-top-net-buying")
@@ -325,10 +557,9 @@ async def investor_top_net_buying(
     end_date: str = Query(default=None),
     invstTpCd: str = Query(default="9000", description="9000=외국인, 1000=기관"),
 ):
-    auth = get_krx_auth()
-    sd = start_date or (datetime.now() - timedelta(days=7)).strftime("%Y%m%d")
-    df = auth.fetch("investor_top_net_buying", strtDd=sd, endDd=end_date or _today(), invstTpCd=invstTpCd)
-    return _df_to_response(df, "investor_top_net_buying")
+    sd = start_date or _default_start("investor_top_net_buying")
+    df, age = await _fetch("investor_top_net_buying", strtDd=sd, endDd=end_date or _today(), invstTpCd=invstTpCd)
+    return _df_to_response(df, "investor_top_net_buying", age=age)
 
 
 @router.get("/program-daily")
@@ -336,10 +567,9 @@ async def program_daily(
     start_date: str = Query(default=None),
     end_date: str = Query(default=None),
 ):
-    auth = get_krx_auth()
-    sd = start_date or (datetime.now() - timedelta(days=30)).strftime("%Y%m%d")
-    df = auth.fetch("program_daily", strtDd=sd, endDd=end_date or _today())
-    return _df_to_response(df, "program_daily")
+    sd = start_date or _default_start("program_daily")
+    df, age = await _fetch("program_daily", strtDd=sd, endDd=end_date or _today())
+    return _df_to_response(df, "program_daily", age=age)
 
 
 @router.get("/short-selling-stock")
@@ -348,10 +578,9 @@ async def short_selling_stock(
     start_date: str = Query(default=None),
     end_date: str = Query(default=None),
 ):
-    auth = get_krx_auth()
-    sd = start_date or (datetime.now() - timedelta(days=30)).strftime("%Y%m%d")
-    df = auth.fetch("short_selling_stock", isuCd=isuCd, strtDd=sd, endDd=end_date or _today())
-    return _df_to_response(df, "short_selling_stock")
+    sd = start_date or _default_start("short_selling_stock")
+    df, age = await _fetch("short_selling_stock", isuCd=isuCd, strtDd=sd, endDd=end_date or _today())
+    return _df_to_response(df, "short_selling_stock", age=age)
 
 
 @router.get("/short-selling-stock-daily")
@@ -360,10 +589,9 @@ async def short_selling_stock_daily(
     start_date: str = Query(default=None),
     end_date: str = Query(default=None),
 ):
-    auth = get_krx_auth()
-    sd = start_date or (datetime.now() - timedelta(days=30)).strftime("%Y%m%d")
-    df = auth.fetch("short_selling_stock_daily", isuCd=isuCd, strtDd=sd, endDd=end_date or _today())
-    return _df_to_response(df, "short_selling_stock_daily")
+    sd = start_date or _default_start("short_selling_stock_daily")
+    df, age = await _fetch("short_selling_stock_daily", isuCd=isuCd, strtDd=sd, endDd=end_date or _today())
+    return _df_to_response(df, "short_selling_stock_daily", age=age)
 
 
 @router.get("/short-selling-investor")
@@ -371,10 +599,9 @@ async def short_selling_investor(
     start_date: str = Query(default=None),
     end_date: str = Query(default=None),
 ):
-    auth = get_krx_auth()
-    sd = start_date or (datetime.now() - timedelta(days=30)).strftime("%Y%m%d")
-    df = auth.fetch("short_selling_investor", strtDd=sd, endDd=end_date or _today())
-    return _df_to_response(df, "short_selling_investor")
+    sd = start_date or _default_start("short_selling_investor")
+    df, age = await _fetch("short_selling_investor", strtDd=sd, endDd=end_date or _today())
+    return _df_to_response(df, "short_selling_investor", age=age)
 
 
 @router.get("/short-selling-balance")
@@ -383,10 +610,9 @@ async def short_selling_balance(
     start_date: str = Query(default=None),
     end_date: str = Query(default=None),
 ):
-    auth = get_krx_auth()
-    sd = start_date or (datetime.now() - timedelta(days=30)).strftime("%Y%m%d")
-    df = auth.fetch("short_selling_balance", isuCd=isuCd, strtDd=sd, endDd=end_date or _today())
-    return _df_to_response(df, "short_selling_balance")
+    sd = start_date or _default_start("short_selling_balance")
+    df, age = await _fetch("short_selling_balance", isuCd=isuCd, strtDd=sd, endDd=end_date or _today())
+    return _df_to_response(df, "short_selling_balance", age=age)
 
 
 @router.get("/bond-yield-trend")
@@ -395,7 +621,6 @@ async def bond_yield_trend(
     end_date: str = Query(default=None),
     bndKindTpCd: str = Query(default="3000", description="3000=국고3년"),
 ):
-    auth = get_krx_auth()
-    sd = start_date or (datetime.now() - timedelta(days=90)).strftime("%Y%m%d")
-    df = auth.fetch("bond_yield_trend", strtDd=sd, endDd=end_date or _today(), bndKindTpCd=bndKindTpCd)
-    return _df_to_response(df, "bond_yield_trend")
+    sd = start_date or _default_start("bond_yield_trend")
+    df, age = await _fetch("bond_yield_trend", strtDd=sd, endDd=end_date or _today(), bndKindTpCd=bndKindTpCd)
+    return _df_to_response(df, "bond_yield_trend", age=age)
@@ -8,10 +8,13 @@ KRX 데이터마켓(data.krx.co.kr)에 아이디/비밀번호로 로그인하고
   1. KRX 로그인 페이지에 아이디/비밀번호를 보냅니다 (학교 홈페이지 로그인처럼)
   2. 로그인 성공하면 "출입증"(JSESSIONID 쿠키)을 받아요
   3. 이 출입증으로 KRX의 모든 데이터를 가져올 수 있어요
-  4. 출입증이 만료되면(25분) 자동으로 다시 로그인해요
+  4. 출입증이 만료되기 전(20분)에 백그라운드에서 새 출입증으로 바꿔 끼워요
+     (만료(25분)되거나 튕겨나면 그때는 바로 다시 로그인)
 
 특징:
   - 브라우저 필요 없음! 순수 requests POST로 로그인
+  - asyncio용 fetch_async/fetch_json_async: 로그인 쿠키를 공유하는
+    httpx.AsyncClient 연결 풀(keep-alive)로 요청 → 이벤트 루프를 막지 않음
   - CAPTCHA 없음 (KRX 자체 계정은 CAPTCHA 안 걸림)
   - 중복 로그인 자동 처리 (skipDup=Y)
   - 세션 만료 자동 감지 + 재로그인
@@ -19,23 +22,65 @@ KRX 데이터마켓(data.krx.co.kr)에 아이디/비밀번호로 로그인하고
 사용법:
   auth = get_krx_auth()
   data = auth.fetch_data("dbms/MDC/STAT/standard/MDCSTAT01501", mktId="STK", trdDd="20260312")
+  df = await auth.fetch_async("all_stock_price", mktId="STK")   # async 핸들러에서
 """
 
+import asyncio
 import json
 import logging
 import os
 import time
-import threading
+from functools import partial
 from typing import Optional
 
+import httpx
 import requests
 import pandas as pd
+import pyarrow as pa
+
+try:
+    from .adaptive_concurrency import get_adaptive_concurrency
+    from .krx_cache import cache_key, get_krx_cache, get_negative_cache, negative_ttl_for, ttl_for
+    from .krx_range_cache import fetch_range, fetch_range_async, get_range_cache
+    from .krx_schema import get_schema_registry, records_to_arrow
+    from .krx_store import get_snapshot_store
+    from .rate_limiter import limited_request, limited_request_async
+    from .session_pool import SessionPool
+    from .single_flight import AsyncSingleFlight, SingleFlight
+except ImportError:
+    from adaptive_concurrency import get_adaptive_concurrency
+    from krx_cache import cache_key, get_krx_cache, get_negative_cache, negative_ttl_for, ttl_for
+    from krx_range_cache import fetch_range, fetch_range_async, get_range_cache
+    from krx_schema import get_schema_registry, records_to_arrow
+    from krx_store import get_snapshot_store
+    from rate_limiter import limited_request, limited_request_async
+    from session_pool import SessionPool
+    from single_flight import AsyncSingleFlight, SingleFlight
+
+try:
+    import orjson
+except ImportError:  # 없으면 표준 json (bytes를 그대로 읽는 것은 같음)
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 # 세션 유효 시간 (KRX는 30분이지만 안전하게 25분)
 SESSION_MAX_AGE = 25 * 60
 
+# 만료 전에 백그라운드에서 새 세션으로 교체하는 나이 (초)
+SESSION_REFRESH_AGE = min(
+    int(os.environ.get("KRX_SESSION_REFRESH_SEC", str(20 * 60))), SESSION_MAX_AGE - 60
+)
+
+# 백그라운드 교체(로그인) 실패 후 다시 시도하기까지 쉬는 시간 (초)
+SESSION_RETRY_SEC = 60
+
+# 비동기 클라이언트 연결 풀 (워커 하나가 동시에 열어둘 KRX 연결 수)
+HTTP_MAX_CONNECTIONS = int(os.environ.get("KRX_HTTP_MAX_CONNECTIONS", "32"))
+HTTP_MAX_KEEPALIVE = int(os.environ.get("KRX_HTTP_MAX_KEEPALIVE", "16"))
+HTTP_KEEPALIVE_EXPIRY = float(os.environ.get("KRX_HTTP_KEEPALIVE_SEC", "30"))
+HTTP_TIMEOUT = float(os.environ.get("KRX_HTTP_TIMEOUT_SEC", "30"))
+
 # KRX URL
 KRX_LOGIN_PAGE = "https://data.krx.co.kr/contents/MDC/COMS/client/view/login.jsp?site=mdc"
 KRX_LOGIN_API = "https://data.krx.co.kr/contents/MDC/COMS/client/MDCCOMS001D1.cmd"
@@ -54,6 +99,11 @@ KRX_AUTH_ENDPOINTS = {
         "response_key": "OutBlock_1",
         "default_params": {"mktId": "STK", "share": "1", "money": "1"},
         "date_param": "trdDd",
+        "schema": {
+            "ISU_SRT_CD": "string", "ISU_ABBRV": "string", "MKT_NM": "category",
+            "TDD_CLSPRC": "int", "TDD_OPNPRC": "int", "TDD_HGPRC": "int", "TDD_LWPRC": "int",
+            "ACC_TRDVOL": "int", "ACC_TRDVAL": "int", "FLUC_RT": "float", "MKTCAP": "int",
+        },
     },
     "stock_daily": {
         "bld": "dbms/MDC/STAT/standard/MDCSTAT01701",
@@ -61,6 +111,7 @@ KRX_AUTH_ENDPOINTS = {
         "response_key": "output",
         "default_params": {},
         "date_param": None,  # isuCd, strtDd, endDd
+        "row_date_field": "TRD_DD",  # 기간 캐시(gap-filling)용 행 날짜 컬럼
     },
     "market_cap": {
         "bld": "dbms/MDC/STAT/standard/MDCSTAT01901",
@@ -83,6 +134,10 @@ KRX_AUTH_ENDPOINTS = {
         "response_key": "output",
         "default_params": {"mktId": "STK", "share": "1"},
         "date_param": "trdDd",
+        "schema": {
+            "ISU_SRT_CD": "string", "ISU_ABBRV": "string",
+            "EPS": "int", "PER": "float", "BPS": "int", "PBR": "float", "DPS": "int", "DVD_YLD": "float",
+        },
     },
     "foreign_exhaustion": {
         "bld": "dbms/MDC/STAT/standard/MDCSTAT03701",
@@ -98,6 +153,7 @@ KRX_AUTH_ENDPOINTS = {
         "response_key": "block1",
         "default_params": {"mktId": "STK"},
         "date_param": "trdDd",
+        "schema": {"ISU_SRT_CD": "string", "ISU_ABBRV": "string", "IDX_IND_NM": "category"},
     },
     "index_price": {
         "bld": "dbms/MDC/STAT/standard/MDCSTAT00101",
@@ -112,6 +168,7 @@ KRX_AUTH_ENDPOINTS = {
         "response_key": "output",
         "default_params": {"idxIndMidclssCd": "02"},
         "date_param": None,  # strtDd, endDd, idxCd
+        "row_date_field": "TRD_DD",  # 기간 캐시(gap-filling)용 행 날짜 컬럼
     },
     # ========== 투자자별 ==========
     "investor_summary": {
@@ -127,6 +184,7 @@ KRX_AUTH_ENDPOINTS = {
         "response_key": "output",
         "default_params": {"mktId": "STK", "inqTpCd": "1", "trdVolVal": "2", "askBid": "3"},
         "date_param": None,  # strtDd, endDd
+        "row_date_field": "TRD_DD",  # 기간 캐시(gap-filling)용 행 날짜 컬럼
     },
     "investor_daily": {
         "bld": "dbms/MDC/STAT/standard/MDCSTAT02203",
@@ -185,6 +243,10 @@ KRX_AUTH_ENDPOINTS = {
         "response_key": "output",
         "default_params": {},
         "date_param": "trdDd",
+        "schema": {
+            "ISU_CD": "string", "ISU_ABBRV": "string", "ULY_NM": "category", "ISUR_NM": "category",
+            "RGHT_TP_NM": "category", "TDD_CLSPRC": "int", "FLUC_RT": "float", "ACC_TRDVOL": "int",
+        },
     },
     # ========== 공매도 ==========
     "short_selling_all": {
@@ -258,6 +320,7 @@ KRX_AUTH_ENDPOINTS = {
         "response_key": "output",
         "default_params": {"inqTpCd": "E", "bndKindTpCd": "3000"},  # 3000=국고3년
         "date_param": None,  # strtDd, endDd
+        "row_date_field": "DISCLS_DD",  # 기간 캐시(gap-filling)용 행 날짜 컬럼
     },
     # ========== 배당/발행증권/금 ==========
     "dividend": {
@@ -284,6 +347,39 @@ KRX_AUTH_ENDPOINTS = {
 }
 
 
+def krx_accounts() -> list[tuple[str, str]]:
+    """로그인할 계정 목록
+
+    KRX_ACCOUNTS="id1:pw1,id2:pw2" 로 여러 계정을 주면 계정마다 세션을 하나씩
+    만들어 풀로 씁니다. 같은 계정으로 두 번 로그인하면(skipDup=Y) 먼저 만든
+    세션이 튕기므로 계정 하나당 세션 하나입니다. 없으면 KRX_ID/KRX_PW 하나.
+    """
+    accounts: dict[str, str] = {}
+    for part in os.environ.get("KRX_ACCOUNTS", "").split(","):
+        krx_id, sep, krx_pw = part.strip().partition(":")
+        if krx_id and sep:
+            accounts.setdefault(krx_id, krx_pw)
+    if not accounts:
+        accounts[os.environ.get("KRX_ID", "goguma")] = os.environ.get("KRX_PW", "mindongjaE1!")
+    return list(accounts.items())
+
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _decode_json(body: bytes, allow_logout: bool = False) -> Optional[dict]:
+    """getJsonData.cmd 응답 바이트 → dict (HTML 에러 페이지/LOGOUT이면 None)
+
+    resp.text로 한 번, resp.json()으로 또 한 번 전체를 문자열로 풀지 않고
+    바이트 그대로 한 번만 파싱해요 (orjson이 있으면 orjson).
+    """
+    if not body[:64].lstrip().startswith(b"{"):
+        return None
+    if not allow_logout and b"LOGOUT" in body:
+        return None
+    return _json_loads(body)
+
+
 class KRXAuth:
     """KRX 인증 세션 관리자 — ID/PW 로그인 방식
 
@@ -291,50 +387,41 @@ class KRXAuth:
       - 한 번 로그인하면 25분간 유효
       - 만료되면 자동으로 다시 로그인
       - 여러 요청을 동시에 보내도 안전 (스레드 락)
+      - 계정이 여러 개면 카드도 여러 장 (세션 풀, 가장 한가한 카드로 요청)
     """
 
     def __init__(self):
-        self._lock = threading.Lock()
-        self._session: Optional[requests.Session] = None
-        self._session_created_at: float = 0
-        self._logged_in: bool = False
-        self._member_no: Optional[str] = None
+        # 계정마다 따로 로그인한 세션 풀 (가장 한가한 세션으로 요청)
+        self.pool = SessionPool(
+            "krx_auth",
+            [(krx_id, partial(self._new_session, krx_id, krx_pw)) for krx_id, krx_pw in krx_accounts()],
+            max_age=SESSION_MAX_AGE,
+            refresh_age=SESSION_REFRESH_AGE,
+            retry_sec=SESSION_RETRY_SEC,
+        )
+        # 동시에 들어온 같은 (bld, params) 요청은 한 번만 전송
+        self._flight = SingleFlight("krx_auth")
+        self._async_flight = AsyncSingleFlight("krx_auth_async")
+        # 이벤트 루프 → {풀 자리 번호: [AsyncClient, 쿠키를 맞춘 requests 세션]}
+        self._clients: dict[asyncio.AbstractEventLoop, dict[int, list]] = {}
 
     def get_authenticated_session(self) -> Optional[requests.Session]:
-        """인증된 requests 세션을 반환합니다.
+        """인증된 requests 세션을 반환합니다 (풀에서 가장 한가한 세션).
+
+        교체 시점이 지난 세션은 그대로 돌려주고 새 세션은 백그라운드에서
+        준비합니다. 로그인을 기다리는 건 살아 있는 세션이 하나도 없을 때뿐입니다.
 
         Returns:
             인증된 세션. 로그인 실패 시 None
         """
-        now = time.time()
-
-        # 세션이 아직 유효한지 확인
-        if (
-            self._session is not None
-            and self._logged_in
-            and (now - self._session_created_at) < SESSION_MAX_AGE
-        ):
-            return self._session
-
-        # 세션 만료 → 재로그인
-        with self._lock:
-            # Double-check (다른 스레드가 이미 갱신했을 수 있음)
-            if (
-                self._session is not None
-                and self._logged_in
-                and (time.time() - self._session_created_at) < SESSION_MAX_AGE
-            ):
-                return self._session
-
-            krx_id = os.environ.get("KRX_ID", "goguma")
-            krx_pw = os.environ.get("KRX_PW", "mindongjaE1!")
-
-            if self._login(krx_id, krx_pw):
-                return self._session
-            return None
+        return self.pool.get()
+
+    def _new_session(self, krx_id: str, krx_pw: str) -> Optional[tuple[requests.Session, Optional[str]]]:
+        """로그인한 새 세션을 만들기만 함 (현재 세션은 건드리지 않음)
 
-    def _login(self, krx_id: str, krx_pw: str) -> bool:
-        """KRX에 ID/PW로 로그인"""
+        Returns:
+            (세션, MBR_NO). 로그인 실패 시 None
+        """
         s = requests.Session()
         s.headers.update({
             "User-Agent": (
@@ -346,12 +433,12 @@ class KRXAuth:
 
         try:
             # Step 1: 로그인 페이지 → JSESSIONID 쿠키
-            s.get(KRX_LOGIN_PAGE, timeout=15)
+            limited_request(s, "GET", KRX_LOGIN_PAGE, timeout=15)
             time.sleep(0.3)
 
             # Step 2: ID/PW 전송
-            resp = s.post(
-                KRX_LOGIN_API,
+            resp = limited_request(
+                s, "POST", KRX_LOGIN_API,
                 data={"mbrId": krx_id, "pw": krx_pw, "skipDup": "Y"},
                 headers={
                     "Referer": KRX_LOGIN_PAGE,
@@ -366,29 +453,25 @@ class KRXAuth:
 
             # 로그인 성공 판단: CD001이거나 MBR_NO가 있으면 성공
             if error_code == "CD001" or mbr_no:
-                self._member_no = mbr_no
-                self._session = s
-                self._session_created_at = time.time()
-                self._logged_in = True
-
                 s.headers.update({
                     "Referer": "https://data.krx.co.kr/contents/MDC/MDI/mdiLoader/index.cmd",
                     "X-Requested-With": "XMLHttpRequest",
                 })
-
-                logger.info(f"KRX 로그인 성공 (MBR_NO={self._member_no})")
-                return True
+                return s, mbr_no
             else:
                 logger.error(f"KRX 로그인 실패: {error_code} - {result.get('_error_message')}")
-                return False
+                return None
 
         except Exception as e:
             logger.error(f"KRX 로그인 예외: {e}", exc_info=True)
-            return False
+            return None
 
     def fetch_json(self, bld: str, **params) -> dict:
         """인증된 세션으로 KRX JSON 데이터를 가져옵니다.
 
+        같은 (bld, params) 요청이 이미 진행 중이면 새로 보내지 않고
+        그 결과를 함께 받습니다 (single-flight).
+
         Args:
             bld: KRX 데이터 경로
             **params: 추가 파라미터
@@ -396,34 +479,113 @@ class KRXAuth:
         Returns:
             KRX 응답 JSON. 실패 시 빈 딕셔너리
         """
-        session = self.get_authenticated_session()
-        if not session:
-            return {}
+        key = (bld, tuple(sorted((k, str(v)) for k, v in params.items())))
+        return self._flight.do(key, self._fetch_json, bld, params)
 
+    def _fetch_json(self, bld: str, params: dict) -> dict:
+        """fetch_json의 실제 전송부 (single-flight leader만 실행)"""
         data = {"bld": bld, "locale": "ko_KR"}
         data.update(params)
 
-        try:
-            resp = session.post(KRX_DATA_API, data=data, timeout=30)
-            text = resp.text.strip()
-
-            # 비정상 응답 감지 (HTML 에러 페이지 또는 LOGOUT)
-            if not text.startswith("{") or "LOGOUT" in text:
-                logger.warning("KRX 세션 만료 — 재로그인")
-                self._logged_in = False
-                session = self.get_authenticated_session()
-                if not session:
-                    return {}
-                resp = session.post(KRX_DATA_API, data=data, timeout=30)
-                text = resp.text.strip()
-                if not text.startswith("{"):
-                    return {}
-
-            return resp.json()
+        with self.pool.checkout() as lease:
+            if not lease:
+                return {}
+            try:
+                resp = limited_request(lease.session, "POST", KRX_DATA_API, data=data, timeout=30)
+                result = _decode_json(resp.content)
+
+                # 비정상 응답 감지 (HTML 에러 페이지 또는 LOGOUT)
+                if result is None:
+                    logger.warning("KRX 세션 만료 — 다른 세션으로 재시도")
+                    get_adaptive_concurrency().backoff(KRX_DATA_API, "session kicked")
+                    if not self.pool.reissue(lease):
+                        return {}
+                    resp = limited_request(lease.session, "POST", KRX_DATA_API, data=data, timeout=30)
+                    result = _decode_json(resp.content, allow_logout=True)
+
+                return result or {}
+
+            except Exception as e:
+                logger.error(f"KRX 데이터 수집 실패 (bld={bld}): {e}")
+                return {}
+
+    # ── asyncio 클라이언트 ──
+
+    def _get_client(self, lease) -> httpx.AsyncClient:
+        """현재 이벤트 루프에서 lease 세션 자리의 공유 AsyncClient (쿠키를 맞춰서 반환)
+
+        로그인 자체는 드물게 일어나므로 기존 requests 로그인을 스레드에서 실행하고,
+        받은 JSESSIONID 쿠키와 헤더를 AsyncClient에 복사합니다.
+        풀의 자리마다 클라이언트가 따로 있고, 그 자리의 세션이 교체되면
+        다음 요청 때 쿠키를 다시 맞춥니다.
+        """
+        loop = asyncio.get_running_loop()
+        clients = self._clients.get(loop)
+        if clients is None:
+            for closed in [lp for lp in self._clients if lp.is_closed()]:
+                del self._clients[closed]
+            clients = self._clients[loop] = {}
+
+        entry = clients.get(lease.index)
+        if entry is None:
+            client = httpx.AsyncClient(
+                timeout=HTTP_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+                ),
+            )
+            entry = clients[lease.index] = [client, None]
 
-        except Exception as e:
-            logger.error(f"KRX 데이터 수집 실패 (bld={bld}): {e}")
-            return {}
+        client, synced = entry
+        if synced is not lease.session:
+            client.headers.update(lease.session.headers)
+            client.cookies = httpx.Cookies(lease.session.cookies)
+            entry[1] = lease.session
+        return client
+
+    async def fetch_json_async(self, bld: str, **params) -> dict:
+        """fetch_json의 asyncio 버전 (공유 연결 풀 사용, 이벤트 루프를 막지 않음)
+
+        Returns:
+            KRX 응답 JSON. 실패 시 빈 딕셔너리
+        """
+        key = (bld, tuple(sorted((k, str(v)) for k, v in params.items())))
+        return await self._async_flight.do(key, self._fetch_json_async, bld, params)
+
+    async def _fetch_json_async(self, bld: str, params: dict) -> dict:
+        data = {"bld": bld, "locale": "ko_KR"}
+        data.update(params)
+
+        async with self.pool.checkout_async() as lease:
+            if not lease:
+                return {}
+            try:
+                client = self._get_client(lease)
+                resp = await limited_request_async(client, "POST", KRX_DATA_API, data=data)
+                result = _decode_json(resp.content)
+
+                if result is None:
+                    logger.warning("KRX 세션 만료 — 다른 세션으로 재시도")
+                    get_adaptive_concurrency().backoff(KRX_DATA_API, "session kicked")
+                    if not await self.pool.reissue_async(lease):
+                        return {}
+                    client = self._get_client(lease)
+                    resp = await limited_request_async(client, "POST", KRX_DATA_API, data=data)
+                    result = _decode_json(resp.content, allow_logout=True)
+
+                return result or {}
+
+            except Exception as e:
+                logger.error(f"KRX 데이터 수집 실패 (bld={bld}, async): {e}")
+                return {}
+
+    async def aclose(self):
+        """현재 이벤트 루프의 AsyncClient 연결 정리 (서버 종료 시)"""
+        clients = self._clients.pop(asyncio.get_running_loop(), None) or {}
+        for client, _ in clients.values():
+            await client.aclose()
 
     def fetch(self, endpoint_key: str, **params) -> pd.DataFrame:
         """KRX_AUTH_ENDPOINTS에 정의된 엔드포인트로 DataFrame을 가져옵니다.
@@ -435,18 +597,160 @@ class KRXAuth:
         Returns:
             pandas DataFrame
         """
+        return self._load(endpoint_key, params)
+
+    def refresh(self, endpoint_key: str, **params) -> pd.DataFrame:
+        """캐시/스냅샷을 건너뛰고 KRX에서 새로 받아 캐시/스냅샷을 갱신 (캐시 워밍용)"""
+        return self._load(endpoint_key, params, force=True)
+
+    async def fetch_async(self, endpoint_key: str, **params) -> pd.DataFrame:
+        """fetch의 asyncio 버전 — 캐시/스냅샷/기간 캐시는 그대로 쓰고
+        KRX 요청만 공유 AsyncClient로 보냅니다 (async 핸들러에서 사용)
+
+        공유 캐시(Redis 소켓 + Parquet 복원), 스냅샷 파일 읽기/쓰기, Arrow 변환은
+        블로킹 작업이라 스레드에서 돌리고 이벤트 루프에는 KRX 요청만 남깁니다.
+        """
+        hit, ctx = await asyncio.to_thread(self._lookup, endpoint_key, params)
+        if hit is not None:
+            return hit
+        ep, merged, key, use_store = ctx
+
+        items = None
+        if ep.get("row_date_field"):
+            items = await fetch_range_async(
+                endpoint_key, ep, merged, lambda p: self._fetch_items_async(ep, p)
+            )
+        if items is None:
+            items = await self._fetch_items_async(ep, merged)
+        return await asyncio.to_thread(self._finish, endpoint_key, merged, key, items, use_store)
+
+    def _load(self, endpoint_key: str, params: dict, force: bool = False) -> pd.DataFrame:
+        hit, ctx = self._lookup(endpoint_key, params, force)
+        if hit is not None:
+            return hit
+        ep, merged, key, use_store = ctx
+
+        # 기간 엔드포인트는 빠진 날짜 구간만 받아서 이어 붙임
+        items = None
+        if ep.get("row_date_field"):
+            items = fetch_range(
+                endpoint_key, ep, merged, lambda p: self._fetch_items(ep, p)
+            )
+        if items is None:
+            items = self._fetch_items(ep, merged)
+        return self._finish(endpoint_key, merged, key, items, use_store)
+
+    def _lookup(self, endpoint_key: str, params: dict, force: bool = False):
+        """KRX에 묻기 전 확인 단계 (fetch/fetch_async 공용)
+
+        Returns:
+            (바로 돌려줄 DataFrame 또는 None, (ep, merged, key, use_store))
+        """
         ep = KRX_AUTH_ENDPOINTS.get(endpoint_key)
         if not ep:
             logger.error(f"알 수 없는 엔드포인트: {endpoint_key}")
-            return pd.DataFrame()
+            return pd.DataFrame(), None
 
         # 파라미터 구성 (기본값 + 사용자 값)
         merged = dict(ep["default_params"])
         merged.update(params)
 
-        result = self.fetch_json(ep["bld"], **merged)
-        if not result:
+        # 1) 인메모리 캐시 → 2) 확정 거래일 로컬 스냅샷 순서로 확인
+        cache = get_krx_cache()
+        key = cache_key("krx_auth", endpoint_key, merged)
+        cached = None if force else cache.get(key)
+        if cached is not None:
+            return cached, None
+        if not force and get_negative_cache().is_empty(key):
+            return pd.DataFrame(), None  # 최근에 빈 결과였던 요청 (휴장일 등)
+
+        store = get_snapshot_store()
+        use_store = store.accepts(ep, merged)
+        if use_store and not force:
+            stored = store.get(endpoint_key, merged)
+            if stored is not None:
+                cache.set(key, stored, ttl_for(merged))
+                return stored, None
+        return None, (ep, merged, key, use_store)
+
+    def _finish(self, endpoint_key: str, merged: dict, key: tuple,
+                items: Optional[list], use_store: bool) -> pd.DataFrame:
+        """받아온 행 → DataFrame 정리 + 캐시/스냅샷 저장 (fetch/fetch_async 공용)"""
+        negative = get_negative_cache()
+        if items is None:
+            return pd.DataFrame()  # 수집 실패 → 기억하지 않음
+        if not items:
+            negative.add(key, negative_ttl_for(merged))
             return pd.DataFrame()
+        negative.discard(key)
+
+        df = self._to_frame(endpoint_key, items)
+        logger.info(f"KRX 수집 ({endpoint_key}): {len(df)}행 x {len(df.columns)}열")
+        get_krx_cache().set(key, df, ttl_for(merged))
+        if use_store:
+            get_snapshot_store().put(endpoint_key, merged, df)
+        return df
+
+    @staticmethod
+    def _to_frame(endpoint_key: str, items: list) -> pd.DataFrame:
+        """행 리스트 → 엔드포인트 스키마대로 타입을 맞춘 DataFrame
+
+        행 dict → 컬럼별 Arrow 배열로 바로 옮기고 숫자 변환도 Arrow에서 한 번에.
+        글자가 아닌 값이 섞인 응답이면 예전처럼 DataFrame을 만든 뒤 변환합니다.
+        """
+        schema = KRX_AUTH_ENDPOINTS[endpoint_key].get("schema")
+        registry = get_schema_registry()
+        try:
+            table = records_to_arrow(items)
+        except (pa.ArrowTypeError, pa.ArrowInvalid):
+            return registry.apply(endpoint_key, pd.DataFrame(items), schema)
+        return registry.apply_arrow(endpoint_key, table, schema)
+
+    def collect(self, endpoint_key: str, **params) -> Optional[pd.DataFrame]:
+        """KRX에서 새로 받아 스냅샷에만 저장 (백필용 — 인메모리 캐시를 밀어내지 않음)
+
+        Returns:
+            DataFrame (데이터 없는 날이면 빈 DataFrame). 수집 실패 시 None
+        """
+        ep = KRX_AUTH_ENDPOINTS[endpoint_key]
+        merged = {**ep["default_params"], **params}
+        items = self._fetch_items(ep, merged)
+        if items is None:
+            return None
+        df = self._to_frame(endpoint_key, items) if items else pd.DataFrame()
+        store = get_snapshot_store()
+        if not df.empty and store.accepts(ep, merged):
+            store.put(endpoint_key, merged, df)
+        return df
+
+    def peek(self, endpoint_key: str, **params) -> Optional[tuple[pd.DataFrame, float, bool]]:
+        """KRX에 묻지 않고 인메모리 캐시에 있는 값만 확인 (만료된 값 포함)
+
+        Returns:
+            (DataFrame, 저장 후 경과 초, 아직 유효한지) 또는 None
+        """
+        ep = KRX_AUTH_ENDPOINTS.get(endpoint_key)
+        if not ep:
+            return None
+        merged = dict(ep["default_params"])
+        merged.update(params)
+        return get_krx_cache().peek(cache_key("krx_auth", endpoint_key, merged))
+
+    def _fetch_items(self, ep: dict, params: dict) -> Optional[list]:
+        """getJsonData.cmd 응답에서 행 리스트를 꺼냄
+
+        Returns:
+            행 리스트 (데이터 없으면 빈 리스트). 수집 실패 시 None
+        """
+        return self._extract_items(ep, self.fetch_json(ep["bld"], **params))
+
+    async def _fetch_items_async(self, ep: dict, params: dict) -> Optional[list]:
+        return self._extract_items(ep, await self.fetch_json_async(ep["bld"], **params))
+
+    @staticmethod
+    def _extract_items(ep: dict, result: dict) -> Optional[list]:
+        if not result:
+            return None
 
         # 응답 키에서 데이터 추출
         items = result.get(ep["response_key"], [])
@@ -458,42 +762,32 @@ class KRXAuth:
                     items = result[key]
                     break
 
-        if not items:
-            return pd.DataFrame()
-
-        df = pd.DataFrame(items)
-
-        # 숫자 컬럼 정리 (쉼표 제거, 숫자 변환)
-        for col in df.columns:
-            if df[col].dtype == object:
-                cleaned = df[col].str.replace(",", "", regex=False).str.strip('"')
-                try:
-                    df[col] = pd.to_numeric(cleaned)
-                except (ValueError, TypeError):
-                    pass
-
-        logger.info(f"KRX 수집 ({endpoint_key}): {len(df)}행 x {len(df.columns)}열")
-        return df
+        return items or []
 
     @property
     def is_logged_in(self) -> bool:
-        if not self._logged_in or self._session is None:
-            return False
-        if time.time() - self._session_created_at > SESSION_MAX_AGE:
-            self._logged_in = False
-            return False
-        return True
+        return self.pool.is_live()
 
     def status(self) -> dict:
         return {
             "logged_in": self.is_logged_in,
-            "member_no": self._member_no if self._logged_in else None,
-            "session_age_sec": (
-                int(time.time() - self._session_created_at)
-                if self._logged_in else None
-            ),
             "session_max_age_sec": SESSION_MAX_AGE,
+            "session_pool": self.pool.status(),
             "method": "krx_id_pw_login",
+            "json_decoder": "orjson" if orjson is not None else "json",
+            "cache": get_krx_cache().status(),
+            "negative_cache": get_negative_cache().status(),
+            "single_flight": self._flight.status(),
+            "async_single_flight": self._async_flight.status(),
+            "async_http": {
+                "clients": sum(len(c) for c in self._clients.values()),
+                "max_connections": HTTP_MAX_CONNECTIONS,
+                "max_keepalive": HTTP_MAX_KEEPALIVE,
+                "keepalive_expiry_sec": HTTP_KEEPALIVE_EXPIRY,
+            },
+            "range_cache": get_range_cache().status(),
+            "snapshot_store": get_snapshot_store().status(),
+            "schema": get_schema_registry().status(),
             "available_endpoints": list(KRX_AUTH_ENDPOINTS.keys()),
         }
 
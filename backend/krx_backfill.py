@@ -0,0 +1,443 @@
+"""
+KRX 과거 데이터 백필 — 거래일마다 한 번씩 부르는 전종목 데이터를 한꺼번에
+==========================================================================
+all_stock_price, short_selling_all, foreign_holding 같은 엔드포인트는
+하루치씩만 주기 때문에, 몇 년치 기록을 만들려면 거래일마다 API를 불러야 했어요
+(지금까지는 /api/krx-auth/* 를 손으로 짠 스크립트로 돌렸고요).
+
+백필은 (초등학생 설명):
+  1. "어떤 데이터 × 어떤 시장 × 언제부터 언제까지"를 받아서
+  2. 거래일 달력으로 (엔드포인트, 날짜, 시장) 할 일 목록을 펼치고
+  3. 일꾼 여러 명(스레드 풀)이 나눠서 KRX에서 받아 스냅샷 저장소에 넣어요
+     - KRX로 가는 속도는 호스트별 속도 제한기/AIMD가 지켜줌
+     - 인메모리 캐시는 건드리지 않음 (10년치가 캐시를 밀어내지 않도록)
+  4. 끝낸 일은 체크포인트(JSONL 한 줄씩)에 적어두니까,
+     중간에 꺼져도 같은 명령을 다시 실행하면 남은 일부터 이어서 해요
+     - 작업 ID는 (엔드포인트, 시장, 기간)으로 정해짐 → 같은 명령 = 같은 작업
+     - 이미 스냅샷이 있는 날짜도 건너뜀
+     - 실패한 일은 한 번 더 시도하고, 그래도 실패면 다음 실행 때 다시 시도
+
+  - 저장소는 확정된 거래일만 받으므로 아직 확정 전인 오늘은 제외
+  - 진행률: 처리 건수, 초당 처리 수, 남은 시간(ETA)
+
+사용법 (CLI):
+  python krx_backfill.py --endpoints all_stock_price,foreign_holding \\
+      --markets STK,KSQ --start 20160101 --end 20251231
+  python krx_backfill.py --endpoints all --start 20250101      # trdDd 엔드포인트 전체
+
+사용법 (관리 API — main.py):
+  POST /api/admin/backfill              {"endpoints": [...], "markets": [...], "start": ..., "end": ...}
+  GET  /api/admin/backfill              작업 목록 + 진행률
+  GET  /api/admin/backfill/{job_id}
+  POST /api/admin/backfill/{job_id}/stop
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Optional
+
+try:
+    from .krx_auth import get_krx_auth, KRX_AUTH_ENDPOINTS
+    from .krx_calendar import get_calendar
+    from .krx_schema import FORMAT_VERSION
+    from .krx_store import STORE_DIR, get_snapshot_store
+except ImportError:
+    from krx_auth import get_krx_auth, KRX_AUTH_ENDPOINTS
+    from krx_calendar import get_calendar
+    from krx_schema import FORMAT_VERSION
+    from krx_store import STORE_DIR, get_snapshot_store
+
+logger = logging.getLogger(__name__)
+
+# 동시에 돌리는 일꾼 수 (실제 KRX 속도는 호스트별 속도 제한기가 조절)
+BACKFILL_CONCURRENCY = int(os.environ.get("KRX_BACKFILL_CONCURRENCY", "4"))
+
+# 체크포인트 위치 (기본: 스냅샷 저장소 안 _backfill)
+CHECKPOINT_DIR = os.environ.get("KRX_BACKFILL_DIR", os.path.join(STORE_DIR, "_backfill"))
+
+# 기본 대상 시장
+DEFAULT_MARKETS = ("STK", "KSQ")
+
+# 한 번 실행 안에서 실패한 일을 다시 시도하는 횟수
+RETRY_PASSES = 1
+
+
+def backfill_endpoints() -> list[str]:
+    """백필할 수 있는 엔드포인트 (날짜 하나로 조회하는 trdDd 엔드포인트)"""
+    return [k for k, ep in KRX_AUTH_ENDPOINTS.items() if ep.get("date_param") == "trdDd"]
+
+
+def _task_id(endpoint_key: str, trd_dd: str, mkt_id: Optional[str]) -> str:
+    return f"{endpoint_key}|{trd_dd}|{mkt_id or '-'}"
+
+
+class BackfillJob:
+    """(엔드포인트 × 시장 × 기간) 백필 작업 하나 — 체크포인트로 이어하기"""
+
+    def __init__(
+        self,
+        endpoints: list[str],
+        start: str,
+        end: str,
+        markets: Optional[list[str]] = None,
+        concurrency: int = BACKFILL_CONCURRENCY,
+        checkpoint_dir: str = CHECKPOINT_DIR,
+    ):
+        unknown = [e for e in endpoints if e not in backfill_endpoints()]
+        if unknown:
+            raise ValueError(f"백필할 수 없는 엔드포인트: {', '.join(unknown)} (trdDd 엔드포인트만 가능)")
+        if start > end:
+            raise ValueError(f"시작일({start})이 종료일({end})보다 늦습니다")
+        self.endpoints = sorted(set(endpoints))
+        self.markets = sorted(set(markets or DEFAULT_MARKETS))
+        self.start = start
+        self.end = end
+        self.concurrency = max(1, concurrency)
+
+        spec = {"endpoints": self.endpoints, "markets": self.markets, "start": start, "end": end}
+        # 저장 형식이 바뀌면 새 작업 — 옛 체크포인트의 "done"이 새 경로의 빈자리를 가리지 않도록
+        job = {**spec, "format": FORMAT_VERSION}
+        self.job_id = hashlib.sha1(json.dumps(job, sort_keys=True).encode()).hexdigest()[:12]
+        self.spec = spec
+        self._spec_path = os.path.join(checkpoint_dir, f"{self.job_id}.json")
+        self._log_path = os.path.join(checkpoint_dir, f"{self.job_id}.jsonl")
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._state = "pending"
+        self._progress = {
+            "total": 0, "resumed": 0, "stored": 0, "done": 0, "empty": 0, "failed": 0,
+            "rows": 0, "started_at": None, "finished_at": None, "error": None,
+        }
+        self._last_task: Optional[str] = None
+
+    # ── 할 일 목록 ──
+
+    def tasks(self) -> list[tuple[str, str, Optional[str]]]:
+        """(엔드포인트, 거래일, 시장) 목록 — 날짜 순 (확정 전인 날은 제외)"""
+        store = get_snapshot_store()
+        days = [d for d in get_calendar().trading_days(self.start, self.end) if store.is_finalized(d)]
+        out = []
+        for day in days:
+            for endpoint_key in self.endpoints:
+                if "mktId" in KRX_AUTH_ENDPOINTS[endpoint_key]["default_params"]:
+                    out.extend((endpoint_key, day, mkt) for mkt in self.markets)
+                else:
+                    out.append((endpoint_key, day, None))
+        return out
+
+    def _load_checkpoint(self) -> dict[str, dict]:
+        """체크포인트에 적힌 결과 (마지막 줄이 반쯤 쓰였으면 무시)"""
+        finished: dict[str, dict] = {}
+        if not os.path.exists(self._log_path):
+            return finished
+        with open(self._log_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                finished[rec["task"]] = rec
+        return finished
+
+    def _record(self, log, task: str, status: str, rows: int):
+        rec = {"task": task, "status": status, "rows": rows, "at": round(time.time(), 1)}
+        with self._lock:
+            log.write(json.dumps(rec) + "\n")
+            log.flush()
+            self._last_task = task
+
+    # ── 실행 ──
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self) -> dict:
+        """할 일을 모두 처리 (stop()으로 멈추면 처리 중인 일만 마치고 반환)
+
+        스레드 대상으로 도므로 예외를 밖으로 던지지 않고, state를 "error"로 바꾸고
+        메시지를 progress의 error에 남김 (같은 작업을 다시 시작하면 체크포인트부터 이어감)
+        """
+        try:
+            return self._run()
+        except Exception as e:
+            logger.exception(f"[backfill {self.job_id}] 오류로 중단: {e}")
+            with self._lock:
+                self._state = "error"
+                self._progress["error"] = f"{type(e).__name__}: {e}"
+                self._progress["finished_at"] = time.time()
+            return self.status()
+
+    def _run(self) -> dict:
+        os.makedirs(os.path.dirname(self._log_path), exist_ok=True)
+        with open(self._spec_path, "w", encoding="utf-8") as f:
+            json.dump(self.spec, f, ensure_ascii=False)
+
+        all_tasks = self.tasks()
+        finished = self._load_checkpoint()
+        store = get_snapshot_store()
+        pending = []
+        resumed = stored = 0
+        for endpoint_key, day, mkt in all_tasks:
+            tid = _task_id(endpoint_key, day, mkt)
+            rec = finished.get(tid)
+            if rec and rec["status"] in ("done", "empty"):
+                resumed += 1
+                continue
+            merged = {**KRX_AUTH_ENDPOINTS[endpoint_key]["default_params"], "trdDd": day}
+            if mkt:
+                merged["mktId"] = mkt
+            if store.has(endpoint_key, merged):
+                stored += 1  # 워머나 이전 수집으로 이미 저장됨
+                continue
+            pending.append((endpoint_key, day, mkt))
+
+        with self._lock:
+            self._state = "running"
+            self._progress.update({
+                "total": len(all_tasks), "resumed": resumed, "stored": stored,
+                "done": 0, "empty": 0, "failed": 0, "rows": 0,
+                "started_at": time.time(), "finished_at": None, "error": None,
+            })
+        logger.info(
+            f"[backfill {self.job_id}] {self.start}~{self.end} {','.join(self.endpoints)} "
+            f"({','.join(self.markets)}): {len(all_tasks)}건 중 {len(pending)}건 남음, 동시 {self.concurrency}"
+        )
+
+        auth = get_krx_auth()
+
+        def work(task: tuple[str, str, Optional[str]]):
+            endpoint_key, day, mkt = task
+            params = {"trdDd": day, **({"mktId": mkt} if mkt else {})}
+            return auth.collect(endpoint_key, **params)
+
+        # 꺼지면서 반쯤 쓴 줄이 있으면 줄을 바꿔서 다음 기록과 섞이지 않게
+        partial = False
+        if os.path.exists(self._log_path) and os.path.getsize(self._log_path):
+            with open(self._log_path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                partial = f.read(1) != b"\n"
+
+        with open(self._log_path, "a", encoding="utf-8") as log:
+            if partial:
+                log.write("\n")
+            for attempt in range(RETRY_PASSES + 1):
+                failed = self._run_pass(pending, work, log, final=attempt == RETRY_PASSES)
+                if not failed or self._stop.is_set():
+                    break
+                logger.info(f"[backfill {self.job_id}] 실패 {len(failed)}건 재시도")
+                pending = failed
+
+        with self._lock:
+            self._state = "stopped" if self._stop.is_set() else "finished"
+            self._progress["finished_at"] = time.time()
+        status = self.status()
+        logger.info(
+            f"[backfill {self.job_id}] {status['state']}: 저장 {status['done']}, 빈 날 {status['empty']}, "
+            f"실패 {status['failed']}, {status['rows']}행, {status['elapsed_sec']}초"
+        )
+        return status
+
+    def _run_pass(self, tasks: list, work, log, final: bool) -> list:
+        """할 일을 일꾼들에게 나눠줌 (일꾼 수만큼만 미리 넣어서 stop()에 바로 반응)
+
+        Returns:
+            실패한 할 일 목록
+        """
+        failed = []
+        queue = iter(tasks)
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="krx-backfill") as pool:
+            running = {}
+
+            def submit_next() -> bool:
+                task = next(queue, None)
+                if task is None or self._stop.is_set():
+                    return False
+                running[pool.submit(work, task)] = task
+                return True
+
+            for _ in range(self.concurrency):
+                if not submit_next():
+                    break
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    tid = _task_id(*task)
+                    try:
+                        df = future.result()
+                    except Exception as e:
+                        logger.warning(f"[backfill {self.job_id}] {tid} 실패: {e}")
+                        df = None
+                    if df is None:
+                        failed.append(task)
+                        if final:
+                            self._record(log, tid, "failed", 0)
+                            self._bump("failed")
+                    else:
+                        status = "done" if not df.empty else "empty"
+                        self._record(log, tid, status, len(df))
+                        self._bump(status, len(df))
+                    submit_next()
+        return failed
+
+    def _bump(self, name: str, rows: int = 0):
+        with self._lock:
+            self._progress[name] += 1
+            self._progress["rows"] += rows
+
+    def status(self) -> dict:
+        with self._lock:
+            p = dict(self._progress)
+            state = self._state
+            last_task = self._last_task
+        processed = p["done"] + p["empty"] + p["failed"]
+        remaining = max(0, p["total"] - p["resumed"] - p["stored"] - processed)
+        started = p["started_at"]
+        elapsed = ((p["finished_at"] or time.time()) - started) if started else 0.0
+        rate = processed / elapsed if elapsed > 0 else 0.0
+        return {
+            "job_id": self.job_id,
+            **self.spec,
+            "state": state,
+            "concurrency": self.concurrency,
+            **p,
+            "remaining": remaining,
+            "percent": round(100.0 * (p["total"] - remaining) / p["total"], 1) if p["total"] else 0.0,
+            "elapsed_sec": round(elapsed, 1),
+            "tasks_per_sec": round(rate, 2),
+            "eta_sec": round(remaining / rate) if rate > 0 and state == "running" else None,
+            "last_task": last_task,
+            "checkpoint": self._log_path,
+        }
+
+
+class BackfillManager:
+    """관리 API용 — 백필 작업을 백그라운드 스레드로 돌리고 상태를 보관"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jobs: dict[str, BackfillJob] = {}
+        self._threads: dict[str, threading.Thread] = {}
+
+    def start(self, job: BackfillJob) -> tuple[BackfillJob, bool]:
+        """작업 시작. 같은 작업이 이미 돌고 있으면 그 작업을 돌려줌
+
+        Returns:
+            (작업, 새로 시작했는지)
+        """
+        with self._lock:
+            thread = self._threads.get(job.job_id)
+            if thread is not None and thread.is_alive():
+                return self._jobs[job.job_id], False
+            self._jobs[job.job_id] = job
+            thread = threading.Thread(
+                target=job.run, name=f"krx-backfill-{job.job_id}", daemon=True
+            )
+            self._threads[job.job_id] = thread
+            thread.start()
+        return job, True
+
+    def stop(self, job_id: str) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return False
+        job.stop()
+        return True
+
+    def get(self, job_id: str) -> Optional[BackfillJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def status(self) -> dict:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return {
+            "endpoints": backfill_endpoints(),
+            "default_concurrency": BACKFILL_CONCURRENCY,
+            "checkpoint_dir": CHECKPOINT_DIR,
+            "jobs": [job.status() for job in jobs],
+        }
+
+
+# 전역 싱글톤
+_manager: Optional[BackfillManager] = None
+
+
+def get_backfill_manager() -> BackfillManager:
+    """백필 작업 관리자 싱글톤"""
+    global _manager
+    if _manager is None:
+        _manager = BackfillManager()
+    return _manager
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="KRX 과거 데이터 백필 (체크포인트로 이어하기)")
+    parser.add_argument(
+        "--endpoints", required=True,
+        help="쉼표 구분 엔드포인트 (all = trdDd 엔드포인트 전체)",
+    )
+    parser.add_argument("--markets", default=",".join(DEFAULT_MARKETS), help="쉼표 구분 mktId (기본 STK,KSQ)")
+    parser.add_argument("--start", required=True, help="시작일 YYYYMMDD")
+    parser.add_argument("--end", default=None, help="종료일 YYYYMMDD (기본: 최근 거래일)")
+    parser.add_argument("--concurrency", type=int, default=BACKFILL_CONCURRENCY)
+    parser.add_argument("--progress-sec", type=float, default=10.0, help="진행률 출력 간격 (초)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+    endpoints = backfill_endpoints() if args.endpoints == "all" else [
+        e.strip() for e in args.endpoints.split(",") if e.strip()
+    ]
+    markets = [m.strip() for m in args.markets.split(",") if m.strip()]
+    try:
+        job = BackfillJob(
+            endpoints, args.start, args.end or get_calendar().latest_trading_day(),
+            markets=markets, concurrency=args.concurrency,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    runner = threading.Thread(target=job.run, name="krx-backfill", daemon=True)
+    runner.start()
+    try:
+        while runner.is_alive():
+            runner.join(args.progress_sec)
+            s = job.status()
+            if s["state"] == "running":
+                eta = f"{s['eta_sec'] // 60}분 {s['eta_sec'] % 60}초" if s["eta_sec"] is not None else "-"
+                print(
+                    f"[{s['job_id']}] {s['percent']}% ({s['total'] - s['remaining']}/{s['total']}) "
+                    f"저장 {s['done']} 빈 날 {s['empty']} 실패 {s['failed']} "
+                    f"{s['tasks_per_sec']}/초 남은 시간 {eta}",
+                    flush=True,
+                )
+    except KeyboardInterrupt:
+        print("중단 요청 — 처리 중인 일만 마치고 멈춥니다 (같은 명령으로 이어하기)", flush=True)
+        job.stop()
+        runner.join()
+
+    s = job.status()
+    print(json.dumps({k: s[k] for k in (
+        "job_id", "state", "total", "resumed", "stored", "done", "empty", "failed", "rows", "elapsed_sec",
+    )}, ensure_ascii=False))
+    if s["state"] == "error":
+        print(f"오류로 중단: {s['error']} (같은 명령으로 이어하기)", flush=True)
+        return 1
+    return 0 if s["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,312 @@
+"""
+KRX 인메모리 캐시 — 장 운영시간에 따라 유효기간이 달라지는 TTL/LRU 캐시
+========================================================================
+같은 질문(같은 엔드포인트 + 같은 파라미터)이 반복되면
+KRX에 다시 묻지 않고 메모리에 기억해둔 DataFrame을 돌려줍니다.
+
+유효기간(TTL) 규칙 (초등학생 설명):
+  - 장중(09:00~15:30)의 오늘 데이터 → 몇 초만 기억 (계속 바뀌니까)
+  - 장 마감 후 오늘 데이터 → 몇 시간 기억
+  - 확정된 데이터(지난 날짜, 18:00 이후 오늘) → 사실상 영원히 기억 (절대 안 바뀌니까)
+  - 빈 결과(휴장일 등)는 NegativeCache에 따로 기억 (오늘 발표 전이면 1분, 확정이면 6시간)
+  - 휴장일/특수 개장시간은 거래일 달력(krx_calendar)이 판단
+
+용량 관리:
+  - 항목 개수가 아니라 DataFrame의 실제 메모리 크기(바이트)로 관리
+  - 용량을 넘으면 가장 오래 안 쓴 항목부터 버림 (LRU)
+  - 만료된 항목도 LRU로 밀려날 때까지는 남겨둠 → peek()으로 "조금 오래된 값"을
+    바로 돌려주고 뒤에서 새로 받는 stale-while-revalidate에 사용
+
+캐시 백엔드 (KRX_CACHE_URL):
+  - 비어 있으면 프로세스 안 메모리(TTLCache) — 워커마다 따로
+  - redis://host:6379/0 이면 Redis 프로토콜 서버(RedisCache) — 모든 워커가 공유
+    (DataFrame은 Parquet 바이트로 저장, 연결 실패 시 메모리 캐시로 대체)
+
+사용법:
+  cache = get_krx_cache()
+  key = cache_key("krx_auth", "all_stock_price", params)
+  df = cache.get(key)
+  if df is None:
+      df = ...  # KRX에서 수집
+      cache.set(key, df, ttl_for(params))
+"""
+
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Optional
+
+import pandas as pd
+
+try:
+    from .krx_calendar import KST, get_calendar
+except ImportError:
+    from krx_calendar import KST, get_calendar
+
+logger = logging.getLogger(__name__)
+
+# TTL (초)
+INTRADAY_TTL = 10              # 장중 오늘 데이터
+AFTER_CLOSE_TTL = 3 * 60 * 60  # 장 마감 후(또는 장 시작 전) 오늘 데이터
+PAST_TTL = 30 * 24 * 60 * 60   # 지난 날짜 (사실상 영구 — LRU로만 밀려남)
+
+# 최대 메모리 사용량 (기본 256MB)
+CACHE_MAX_BYTES = int(os.environ.get("KRX_CACHE_MAX_MB", "256")) * 1024 * 1024
+
+# 빈 결과(휴장일, 없는 종목 등) 기억 시간 (초)
+NEGATIVE_TODAY_TTL = 60            # 오늘(데이터 확정 전) — 곧 발표될 수 있으니 짧게
+NEGATIVE_PAST_TTL = 6 * 60 * 60    # 확정된 날짜 — 다시 물어도 비어 있음
+NEGATIVE_MAX_ENTRIES = 10000
+
+
+def cache_key(namespace: str, endpoint_key: str, params: dict) -> tuple:
+    """캐시 키 — 파라미터 순서와 상관없이 같은 조합이면 같은 키"""
+    return (namespace, endpoint_key, tuple(sorted((k, str(v)) for k, v in params.items())))
+
+
+def is_market_open(now: Optional[datetime] = None) -> bool:
+    """지금 정규장이 열려 있는지 (휴장일/특수 개장시간 반영)"""
+    return get_calendar().is_market_open(now)
+
+
+def ttl_for(params: dict, now: Optional[datetime] = None) -> float:
+    """요청 파라미터의 기준일로 TTL 결정
+
+    기준일: trdDd(단일날짜) 또는 endDd(기간 조회의 끝날짜).
+    기준일이 없으면 '오늘' 데이터로 취급합니다.
+    """
+    now = now or datetime.now(KST)
+    today = now.strftime("%Y%m%d")
+    ref = str(params.get("trdDd") or params.get("endDd") or today)
+
+    if get_calendar().is_finalized(ref, now):
+        return PAST_TTL
+    if is_market_open(now):
+        return INTRADAY_TTL
+    return AFTER_CLOSE_TTL
+
+
+def negative_ttl_for(params: dict, now: Optional[datetime] = None) -> float:
+    """빈 결과를 기억할 시간 — 확정된 날짜면 길게, 오늘(발표 전)이면 짧게"""
+    now = now or datetime.now(KST)
+    ref = str(params.get("trdDd") or params.get("endDd") or now.strftime("%Y%m%d"))
+    if get_calendar().is_finalized(ref, now):
+        return NEGATIVE_PAST_TTL
+    return NEGATIVE_TODAY_TTL
+
+
+class NegativeCache:
+    """빈 결과만 기억하는 작은 캐시 (키 → 만료 시각, 개수 기준 LRU)
+
+    휴장일이나 없는 종목을 반복해서 물어봐도 업스트림에 다시 가지 않도록.
+    """
+
+    def __init__(self, max_entries: int = NEGATIVE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[tuple, float]" = OrderedDict()
+        self._hits = 0
+        self._adds = 0
+
+    def is_empty(self, key: tuple) -> bool:
+        """최근에 빈 결과였던 요청인지"""
+        with self._lock:
+            expires_at = self._data.get(key)
+            if expires_at is None:
+                return False
+            if time.time() >= expires_at:
+                del self._data[key]
+                return False
+            self._data.move_to_end(key)
+            self._hits += 1
+            return True
+
+    def add(self, key: tuple, ttl: float):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = time.time() + ttl
+            self._adds += 1
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def discard(self, key: tuple):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "adds": self._adds,
+            }
+
+
+def _sizeof(value: Any) -> int:
+    """캐시 항목의 메모리 크기 (바이트)"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    return len(repr(value))
+
+
+def _copy(value: Any) -> Any:
+    # 호출자가 DataFrame을 수정해도 캐시 원본은 그대로 유지
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    return value
+
+
+class CacheBackend(ABC):
+    """캐시 백엔드 공통 인터페이스
+
+    키는 cache_key()가 만든 튜플, 값은 DataFrame.
+    메서드를 하나라도 빠뜨린 백엔드는 요청 도중이 아니라 만들 때 TypeError.
+    """
+
+    @abstractmethod
+    def get(self, key: tuple) -> Optional[Any]:
+        """유효한 값 (없거나 만료되면 None)"""
+
+    @abstractmethod
+    def peek(self, key: tuple) -> Optional[tuple[Any, float, bool]]:
+        """만료 여부와 상관없이 (값, 저장 후 경과 초, 아직 유효한지)"""
+
+    @abstractmethod
+    def set(self, key: tuple, value: Any, ttl: float):
+        """값 저장 (ttl초 뒤 만료)"""
+
+    @abstractmethod
+    def clear(self):
+        """모든 항목 삭제"""
+
+    @abstractmethod
+    def status(self) -> dict:
+        """상태 (백엔드 종류, 적중/실패 수 등)"""
+
+
+class TTLCache(CacheBackend):
+    """바이트 크기 기준 LRU + 항목별 TTL 캐시 (스레드 안전)"""
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key → (value, size, expires_at, stored_at)
+        self._data: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._stale_hits = 0
+        self._evictions = 0
+
+    def get(self, key: tuple) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or time.time() >= entry[2]:
+                # 없음 또는 만료 (만료 항목은 peek용으로 LRU까지 남겨둠)
+                self._misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+        return _copy(entry[0])
+
+    def peek(self, key: tuple) -> Optional[tuple[Any, float, bool]]:
+        """만료 여부와 상관없이 저장된 값을 꺼냄
+
+        Returns:
+            (값, 저장 후 경과 초, 아직 유효한지) 또는 None
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, _, expires_at, stored_at = entry
+            now = time.time()
+            fresh = now < expires_at
+            self._data.move_to_end(key)
+            if fresh:
+                self._hits += 1
+            else:
+                self._stale_hits += 1
+        return _copy(value), now - stored_at, fresh
+
+    def set(self, key: tuple, value: Any, ttl: float):
+        value = _copy(value)
+        size = _sizeof(value)
+        if size > self.max_bytes:
+            logger.debug(f"캐시 항목이 너무 큼 ({size} bytes) — 저장 생략: {key[:2]}")
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            now = time.time()
+            self._data[key] = (value, size, now + ttl, now)
+            self._bytes += size
+            # 용량 초과 → 가장 오래 안 쓴 항목부터 제거
+            while self._bytes > self.max_bytes and self._data:
+                _, (_, old_size, _, _) = self._data.popitem(last=False)
+                self._bytes -= old_size
+                self._evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "stale_hits": self._stale_hits,
+                "evictions": self._evictions,
+            }
+
+
+def _create_backend(url: str) -> CacheBackend:
+    """KRX_CACHE_URL에 맞는 백엔드 생성 (공유 캐시 연결 실패 시 메모리 캐시)"""
+    if url.startswith("redis://"):
+        try:
+            try:
+                from .redis_cache import RedisCache
+            except ImportError:
+                from redis_cache import RedisCache
+            backend = RedisCache(url)
+            backend.ping()
+            logger.info(f"공유 캐시 사용: {backend.display_url}")
+            return backend
+        except Exception as e:
+            logger.warning(f"공유 캐시 연결 실패 — 메모리 캐시 사용: {e}")
+    elif url:
+        logger.warning(f"지원하지 않는 KRX_CACHE_URL — 메모리 캐시 사용: {url.split('://')[0]}://")
+    return TTLCache(CACHE_MAX_BYTES)
+
+
+# 전역 싱글톤 (KRXAuth, KRXDirectFetcher가 공유)
+_cache: Optional[CacheBackend] = None
+_negative: Optional[NegativeCache] = None
+
+
+def get_krx_cache() -> CacheBackend:
+    """KRX 캐시 싱글톤 (KRX_CACHE_URL에 따라 메모리 또는 공유 캐시)"""
+    global _cache
+    if _cache is None:
+        _cache = _create_backend(os.environ.get("KRX_CACHE_URL", "").strip())
+    return _cache
+
+
+def get_negative_cache() -> NegativeCache:
+    """빈 결과 캐시 싱글톤 (KRXAuth, KRXDirectFetcher, 네이버 스크래퍼가 공유)"""
+    global _negative
+    if _negative is None:
+        _negative = NegativeCache(NEGATIVE_MAX_ENTRIES)
+    return _negative
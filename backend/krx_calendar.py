@@ -0,0 +1,420 @@
+"""
+KRX 거래일 달력 — 휴장일을 미리 알고 있는 로컬 달력
+====================================================
+지금까지는 "주말만 건너뛰기"로 기본 날짜를 정했기 때문에
+설날/추석 같은 휴장일에는 KRX에 빈 요청을 보내고 나서야 실패를 알았어요.
+
+이 모듈은 (초등학생 설명):
+  1. 휴장일 표(2016~2027)를 코드에 내장해두고 (표가 없는 해는 양력 공휴일만 — 경고)
+  2. 평일 - 휴장일 = 거래일 목록을 정렬된 배열로 만들어두고
+  3. "다음 거래일", "직전 거래일", "이 기간의 거래일"을 이진 탐색으로 바로 답해요
+  4. 하루 한 번 KRX 실제 일별 시세로 올해 거래일을 확인해서 표를 고쳐요
+
+  마치 학교 달력에 방학/공휴일을 미리 표시해두는 것처럼!
+
+장 운영시간:
+  - 평상시 09:00 ~ 15:30
+  - 연초 첫 거래일 10:00 개장
+  - 수능일 10:00 ~ 16:30 (1시간씩 늦춤)
+  - 18:00 이후면 당일 데이터 확정으로 간주 (시간외/통계 반영 완료)
+
+사용법:
+  cal = get_calendar()
+  cal.latest_trading_day()          # 오늘 또는 직전 거래일 "20260312"
+  cal.prev_trading_day("20260302")  # "20260227"
+  cal.trading_days("20260101", "20260131")
+  cal.session_hours("20261119")     # (10:00, 16:30)
+"""
+
+import bisect
+import logging
+import threading
+import time
+from datetime import date, datetime, time as dtime, timedelta, timezone
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# 한국 표준시
+KST = timezone(timedelta(hours=9))
+
+# 정규장 시간 (KST)
+MARKET_OPEN = dtime(9, 0)
+MARKET_CLOSE = dtime(15, 30)
+
+# 연초 첫 거래일 개장 시간
+FIRST_DAY_OPEN = dtime(10, 0)
+
+# 수능일 (개장/폐장 1시간 늦춤)
+CSAT_DAYS = {"20241114", "20251113", "20261119"}
+CSAT_OPEN = dtime(10, 0)
+CSAT_CLOSE = dtime(16, 30)
+
+# 이 시각 이후면 당일 데이터가 확정된 것으로 봄
+DATA_FINAL_TIME = dtime(18, 0)
+
+# KRX 휴장일 (주말 제외, 연말 휴장일 포함 — 12/31이 주말이면 직전 평일)
+# 설/추석/부처님오신날(음력), 선거일, 대체·임시공휴일까지 — 백필 기본 범위(2016~)를 덮음
+HOLIDAYS = {
+    2016: {
+        "0101", "0208", "0209", "0210", "0301", "0413", "0505", "0506",
+        "0606", "0815", "0914", "0915", "0916", "1003", "1230",
+    },
+    2017: {
+        "0127", "0130", "0301", "0501", "0503", "0505", "0509", "0606",
+        "0815", "1002", "1003", "1004", "1005", "1006", "1009", "1225",
+        "1229",
+    },
+    2018: {
+        "0101", "0215", "0216", "0301", "0501", "0507", "0522", "0606",
+        "0613", "0815", "0924", "0925", "0926", "1003", "1009", "1225",
+        "1231",
+    },
+    2019: {
+        "0101", "0204", "0205", "0206", "0301", "0501", "0506", "0606",
+        "0815", "0912", "0913", "1003", "1009", "1225", "1231",
+    },
+    2020: {
+        "0101", "0124", "0127", "0415", "0430", "0501", "0505", "0817",
+        "0930", "1001", "1002", "1009", "1225", "1231",
+    },
+    2021: {
+        "0101", "0211", "0212", "0301", "0505", "0519", "0816", "0920",
+        "0921", "0922", "1004", "1011", "1231",
+    },
+    2022: {
+        "0131", "0201", "0202", "0301", "0309", "0505", "0601", "0606",
+        "0815", "0909", "0912", "1003", "1010", "1230",
+    },
+    2023: {
+        "0123", "0124", "0301", "0501", "0505", "0529", "0606", "0815",
+        "0928", "0929", "1002", "1003", "1009", "1225", "1229",
+    },
+    2024: {
+        "0101", "0209", "0212", "0301", "0410", "0501", "0506", "0515",
+        "0606", "0815", "0916", "0917", "0918", "1001", "1003", "1009",
+        "1225", "1231",
+    },
+    2025: {
+        "0101", "0127", "0128", "0129", "0130", "0303", "0501", "0505",
+        "0506", "0603", "0606", "0815", "1003", "1006", "1007", "1008",
+        "1009", "1225", "1231",
+    },
+    2026: {
+        "0101", "0216", "0217", "0218", "0302", "0501", "0505", "0525",
+        "0603", "0817", "0924", "0925", "1005", "1009", "1225", "1231",
+    },
+    2027: {
+        "0101", "0205", "0208", "0301", "0505", "0513", "0816", "0914",
+        "0915", "0916", "1004", "1011", "1227", "1231",
+    },
+}
+
+# 휴장일 표가 없는 해에 쓰는 양력 고정 휴장일 (음력 명절은 KRX 갱신으로 보정)
+FIXED_HOLIDAYS = {"0101", "0301", "0501", "0505", "0606", "0815", "1003", "1009", "1225", "1231"}
+
+# 달력이 다루는 첫 해, 그리고 올해보다 몇 해 앞까지 미리 만들어둘지
+# (표가 없는 미래 연도는 양력 공휴일로 채우고, 해가 바뀌면 자동으로 늘림)
+FIRST_YEAR = 2000
+YEARS_AHEAD = 2
+
+# KRX 확인용 기준 종목 (상장 기간이 길고 매일 거래되는 종목)
+REFERENCE_ISIN = "KR7005930003"  # 삼성전자
+
+# KRX 갱신 실패 후 재시도까지 대기 (초)
+REFRESH_RETRY = 600
+
+DateLike = Union[str, date, datetime]
+
+
+def _kst(now: datetime) -> datetime:
+    """시간대가 있는 datetime은 KST로 변환 (없으면 KST로 간주)"""
+    return now.astimezone(KST) if now.tzinfo else now
+
+
+def _to_str(value: DateLike) -> str:
+    """"20260312", "2026-03-12", date, datetime → "20260312" """
+    if isinstance(value, datetime):
+        return _kst(value).strftime("%Y%m%d")
+    if isinstance(value, date):
+        return value.strftime("%Y%m%d")
+    return "".join(ch for ch in str(value) if ch.isdigit())[:8]
+
+
+def _to_date(yyyymmdd: str) -> date:
+    return datetime.strptime(yyyymmdd, "%Y%m%d").date()
+
+
+def _today() -> str:
+    return datetime.now(KST).strftime("%Y%m%d")
+
+
+def _fallback_holidays(year: int) -> set[str]:
+    """휴장일 표가 없는 해: 양력 고정 휴장일 + 연말 휴장일(12/31이 주말이면 직전 평일)"""
+    holidays = set(FIXED_HOLIDAYS)
+    last = date(year, 12, 31)
+    while last.weekday() >= 5:
+        last -= timedelta(days=1)
+    holidays.add(last.strftime("%m%d"))
+    return holidays
+
+
+def _year_ranges(years: list[int]) -> str:
+    """[2000, 2001, 2002, 2028] → "2000~2002, 2028" """
+    ranges = []
+    for year in sorted(years):
+        if ranges and ranges[-1][1] == year - 1:
+            ranges[-1][1] = year
+        else:
+            ranges.append([year, year])
+    return ", ".join(str(a) if a == b else f"{a}~{b}" for a, b in ranges)
+
+
+def _year_trading_days(year: int, holidays: set[str]) -> list[str]:
+    days = []
+    d = date(year, 1, 1)
+    while d.year == year:
+        if d.weekday() < 5 and d.strftime("%m%d") not in holidays:
+            days.append(d.strftime("%Y%m%d"))
+        d += timedelta(days=1)
+    return days
+
+
+class KRXCalendar:
+    """거래일 정렬 배열 + 이진 탐색 (스레드 안전, 갱신 시 배열 통째로 교체)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # 연도 → 휴장일(MMDD) 집합
+        self._holidays: dict[int, set[str]] = {}
+        self._verified_years: set[int] = set()
+        self._add_years(FIRST_YEAR, self._wanted_last_year())
+        self._days: list[str] = self._build()
+        self._refreshed_for = ""
+        self._refreshing = False
+        self._last_failure = 0.0
+
+    @staticmethod
+    def _wanted_last_year() -> int:
+        return max(max(HOLIDAYS), datetime.now(KST).year + YEARS_AHEAD)
+
+    def _add_years(self, first: int, last: int):
+        """first~last 연도의 휴장일 채우기 (표가 없는 해는 양력 공휴일만 — 경고)"""
+        fallback = []
+        for year in range(first, last + 1):
+            if year in HOLIDAYS:
+                self._holidays[year] = set(HOLIDAYS[year])
+            else:
+                self._holidays[year] = _fallback_holidays(year)
+                fallback.append(year)
+        if fallback:
+            logger.warning(
+                f"거래일 달력: {_year_ranges(fallback)}년은 휴장일 표가 없어 양력 공휴일만 적용 "
+                f"(설/추석/선거일 등은 빠짐 — HOLIDAYS에 추가 필요)"
+            )
+
+    def _extend(self):
+        """해가 바뀌어 YEARS_AHEAD만큼의 앞날이 모자라면 달력을 늘림"""
+        last = self._wanted_last_year()
+        with self._lock:
+            current = max(self._holidays)
+            if last <= current:
+                return
+            self._add_years(current + 1, last)
+            self._days = self._build()
+
+    def _build(self) -> list[str]:
+        days: list[str] = []
+        for year in sorted(self._holidays):
+            days.extend(_year_trading_days(year, self._holidays[year]))
+        return days
+
+    # ── KRX로 올해 거래일 확인 ──
+
+    def _maybe_refresh(self):
+        """하루 한 번 백그라운드에서 KRX 실제 거래일로 보정"""
+        today = _today()
+        if self._refreshed_for != today:
+            self._extend()
+        with self._lock:
+            if self._refreshed_for == today or self._refreshing:
+                return
+            if time.time() - self._last_failure < REFRESH_RETRY:
+                return
+            self._refreshing = True
+        threading.Thread(
+            target=self.refresh, name="krx-calendar-refresh", daemon=True
+        ).start()
+
+    def refresh(self) -> bool:
+        """KRX 기준 종목 일별 시세의 거래일로 올해(연초면 작년 포함) 휴장일 보정"""
+        # krx_auth → krx_cache → krx_calendar 순환 import 방지
+        try:
+            from .krx_auth import get_krx_auth
+        except ImportError:
+            from krx_auth import get_krx_auth
+
+        today = _to_date(_today())
+        start = date(today.year - (1 if today.month == 1 else 0), 1, 1)
+        end = today - timedelta(days=1)
+        ok = False
+        try:
+            if start <= end:
+                df = get_krx_auth().fetch(
+                    "stock_daily", isuCd=REFERENCE_ISIN, isuCd2=REFERENCE_ISIN,
+                    strtDd=_to_str(start), endDd=_to_str(end),
+                )
+                if not df.empty and "TRD_DD" in df.columns:
+                    traded = {_to_str(v) for v in df["TRD_DD"]}
+                    self._apply(start, end, traded)
+                    ok = True
+        except Exception as e:
+            logger.warning(f"거래일 달력 갱신 실패: {e}")
+
+        with self._lock:
+            self._refreshing = False
+            if ok:
+                self._refreshed_for = _to_str(today)
+            else:
+                self._last_failure = time.time()
+        return ok
+
+    def _apply(self, start: date, end: date, traded: set[str]):
+        """[start, end] 구간의 평일 중 실제로 거래가 없던 날을 휴장일로 반영"""
+        holidays = {year: set(days) for year, days in self._holidays.items()}
+        changed = []
+        d = start
+        while d <= end:
+            if d.weekday() < 5:
+                key, mmdd = _to_str(d), d.strftime("%m%d")
+                closed = key not in traded
+                year_holidays = holidays.setdefault(d.year, set())
+                if closed and mmdd not in year_holidays:
+                    year_holidays.add(mmdd)
+                    changed.append(key)
+                elif not closed and mmdd in year_holidays:
+                    year_holidays.discard(mmdd)
+                    changed.append(key)
+            d += timedelta(days=1)
+
+        with self._lock:
+            self._holidays = holidays
+            self._verified_years.update(range(start.year, end.year + 1))
+            if changed:
+                self._days = self._build()
+        if changed:
+            logger.info(f"거래일 달력 보정 ({len(changed)}일): {', '.join(changed[:10])}")
+
+    # ── 거래일 조회 (O(log n)) ──
+
+    def is_trading_day(self, value: DateLike) -> bool:
+        self._maybe_refresh()
+        key = _to_str(value)
+        days = self._days
+        i = bisect.bisect_left(days, key)
+        return i < len(days) and days[i] == key
+
+    def next_trading_day(self, value: DateLike) -> Optional[str]:
+        """value 다음(당일 제외) 거래일"""
+        self._maybe_refresh()
+        days = self._days
+        i = bisect.bisect_right(days, _to_str(value))
+        return days[i] if i < len(days) else None
+
+    def prev_trading_day(self, value: DateLike) -> Optional[str]:
+        """value 이전(당일 제외) 거래일"""
+        self._maybe_refresh()
+        days = self._days
+        i = bisect.bisect_left(days, _to_str(value))
+        return days[i - 1] if i > 0 else None
+
+    def nearest_trading_day(self, value: DateLike, prev: bool = True) -> Optional[str]:
+        """value가 거래일이면 그대로, 아니면 직전(prev=True) 또는 다음 거래일"""
+        if self.is_trading_day(value):
+            return _to_str(value)
+        return self.prev_trading_day(value) if prev else self.next_trading_day(value)
+
+    def trading_days(self, start: DateLike, end: DateLike) -> list[str]:
+        """[start, end] 구간의 거래일 목록"""
+        self._maybe_refresh()
+        days = self._days
+        lo = bisect.bisect_left(days, _to_str(start))
+        hi = bisect.bisect_right(days, _to_str(end))
+        return days[lo:hi]
+
+    def previous_trading_days(self, n: int, end: Optional[DateLike] = None) -> list[str]:
+        """end(기본 오늘)까지의 최근 n 거래일 (오래된 순)"""
+        self._maybe_refresh()
+        days = self._days
+        hi = bisect.bisect_right(days, _to_str(end or _today()))
+        return days[max(0, hi - n):hi]
+
+    def latest_trading_day(self, days_ago: int = 0) -> str:
+        """오늘로부터 days_ago일 전 날짜 기준, 그날 또는 직전 거래일 (기본 날짜용)"""
+        d = datetime.now(KST).date() - timedelta(days=days_ago)
+        return self.nearest_trading_day(d) or _to_str(d)
+
+    # ── 장 운영시간 ──
+
+    def session_hours(self, value: DateLike) -> Optional[tuple[dtime, dtime]]:
+        """해당 날짜의 정규장 (개장, 폐장) 시각. 휴장일이면 None"""
+        key = _to_str(value)
+        if not self.is_trading_day(key):
+            return None
+        if key in CSAT_DAYS:
+            return CSAT_OPEN, CSAT_CLOSE
+        prev = self.prev_trading_day(key)
+        if prev is None or prev[:4] != key[:4]:
+            return FIRST_DAY_OPEN, MARKET_CLOSE
+        return MARKET_OPEN, MARKET_CLOSE
+
+    def is_market_open(self, now: Optional[datetime] = None) -> bool:
+        """지금 정규장이 열려 있는지 (휴장일/특수 개장시간 반영)"""
+        now = now or datetime.now(KST)
+        hours = self.session_hours(now)
+        if hours is None:
+            return False
+        return hours[0] <= _kst(now).time() < hours[1]
+
+    def is_finalized(self, value: DateLike, now: Optional[datetime] = None) -> bool:
+        """해당 날짜 데이터가 확정되었는지
+
+        지난 날짜는 확정, 오늘은 거래일이면 18:00 이후(휴장일이면 바로) 확정.
+        """
+        key = _to_str(value)
+        if len(key) != 8:
+            return False
+        now = now or datetime.now(KST)
+        today = _to_str(now)
+        if key < today:
+            return True
+        if key > today:
+            return False
+        if not self.is_trading_day(key):
+            return True
+        return _kst(now).time() >= DATA_FINAL_TIME
+
+    def status(self) -> dict:
+        days = self._days
+        return {
+            "first_day": days[0] if days else None,
+            "last_day": days[-1] if days else None,
+            "trading_days": len(days),
+            "bundled_years": sorted(HOLIDAYS),
+            "fallback_years": _year_ranges([y for y in self._holidays if y not in HOLIDAYS]),
+            "verified_years": sorted(self._verified_years),
+            "refreshed_for": self._refreshed_for or None,
+            "latest_trading_day": self.latest_trading_day(),
+        }
+
+
+# 전역 싱글톤
+_calendar: Optional[KRXCalendar] = None
+
+
+def get_calendar() -> KRXCalendar:
+    """KRX 거래일 달력 싱글톤"""
+    global _calendar
+    if _calendar is None:
+        _calendar = KRXCalendar()
+    return _calendar
@@ -12,21 +12,67 @@ KRX Direct Fetcher — outerLoader 우회를 통한 KRX 직접 데이터 수집
 
 흐름:
   1. outerLoader 페이지 방문 → JSESSIONID 쿠키 획득
+     (세션 여러 개를 풀로 두고 가장 한가한 세션으로 요청)
   2. GenerateOTP로 일회용 비밀번호 생성 (MDC_OUT bld 사용)
   3. download_csv로 CSV 데이터 다운로드
-  4. pandas로 파싱하여 DataFrame 반환
+  4. CSV 바이트를 Arrow로 바로 파싱하여 DataFrame 반환
 """
 
 import requests
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import csv
 import io
-import time
+import os
 import logging
-import threading
 from typing import Optional
 
+try:
+    from .adaptive_concurrency import get_adaptive_concurrency
+    from .krx_cache import cache_key, get_krx_cache, get_negative_cache, negative_ttl_for, ttl_for
+    from .krx_schema import get_schema_registry
+    from .rate_limiter import limited_request
+    from .session_pool import SessionPool
+    from .single_flight import SingleFlight
+except ImportError:
+    from adaptive_concurrency import get_adaptive_concurrency
+    from krx_cache import cache_key, get_krx_cache, get_negative_cache, negative_ttl_for, ttl_for
+    from krx_schema import get_schema_registry
+    from rate_limiter import limited_request
+    from session_pool import SessionPool
+    from single_flight import SingleFlight
+
 logger = logging.getLogger(__name__)
 
+# 동시에 쓸 outerLoader 세션 수 (로그인이 없으니 서로 튕기지 않음)
+DIRECT_SESSIONS = int(os.environ.get("KRX_DIRECT_SESSIONS", "2"))
+
+# CSV 파싱 엔진: "arrow"(바이트 → Arrow 멀티스레드 파서) 또는 "pandas"(예전 방식)
+CSV_ENGINE = os.environ.get("KRX_CSV_ENGINE", "arrow").lower()
+
+# KRX CSV 인코딩 (cp949는 euc-kr의 상위 집합)
+CSV_ENCODING = "cp949"
+
+
+def _read_csv_arrow(content: bytes) -> pa.Table:
+    """KRX CSV 바이트 → 모든 컬럼이 글자인 Arrow 표
+
+    str로 한꺼번에 풀고 StringIO로 다시 감싸지 않고, 바이트를 그대로 넘겨
+    Arrow가 블록 단위로 인코딩을 바꾸면서 여러 스레드로 읽어요.
+    (따옴표 안 쉼표 "1,234"도 파서가 처리하고, 쉼표 제거는 krx_schema가 Arrow 안에서)
+    """
+    header = content.split(b"\n", 1)[0].decode(CSV_ENCODING).strip("\r\ufeff")
+    names = next(csv.reader([header]))
+    return pa_csv.read_csv(
+        pa.BufferReader(content),
+        read_options=pa_csv.ReadOptions(encoding=CSV_ENCODING, use_threads=True),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={name: pa.string() for name in names},
+            strings_can_be_null=False,
+        ),
+    )
+
 
 # ============================================================================
 # MDC_OUT bld 매핑 (outerLoader에서 로그인 없이 접근 가능한 데이터)
@@ -42,6 +88,10 @@ KRX_OUT_ENDPOINTS = {
         "desc": "전체 종목 시세 (종가, 등락률, 거래량 등)",
         "default_params": {"mktId": "STK", "share": "1", "money": "1"},
         "date_param": "trdDd",
+        "schema": {
+            "종목코드": "string", "종목명": "string", "시장구분": "category", "소속부": "category",
+            "종가": "int", "등락률": "float", "거래량": "int", "시가총액": "int",
+        },
     },
     # === 개별 종목 월간 시세 ===
     "stock_monthly": {
@@ -125,66 +175,76 @@ class KRXDirectFetcher:
     GENERATE_OTP = "/comm/fileDn/GenerateOTP/generate.cmd"
     DOWNLOAD_CSV = "/comm/fileDn/download_csv/download.cmd"
 
-    def __init__(self):
-        self._lock = threading.Lock()
-        self._session: Optional[requests.Session] = None
-        self._session_created_at: float = 0
-        self._session_max_age: float = 300  # 5분마다 세션 갱신
-
-    def _ensure_session(self) -> requests.Session:
-        """outerLoader를 통해 유효한 세션을 확보 (필요시 갱신)"""
-        now = time.time()
-        if (
-            self._session is not None
-            and (now - self._session_created_at) < self._session_max_age
-        ):
-            return self._session
-
-        with self._lock:
-            # Double-check 패턴 (다른 스레드가 이미 갱신했을 수 있음)
-            if (
-                self._session is not None
-                and (time.time() - self._session_created_at) < self._session_max_age
-            ):
-                return self._session
-
-            s = requests.Session()
-            s.headers.update(
-                {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/120.0.0.0 Safari/537.36",
-                }
-            )
+    def __init__(self, sessions: int = DIRECT_SESSIONS):
+        # outerLoader 세션 풀 (5분마다 갱신, 만료 1분 전에 백그라운드 교체)
+        self.pool = SessionPool(
+            "krx_direct",
+            [(f"outerLoader #{i + 1}", self._build_session) for i in range(max(1, sessions))],
+            max_age=300,
+            refresh_age=240,
+            retry_sec=30,
+        )
+        # 동시에 들어온 같은 요청은 OTP+CSV 다운로드를 한 번만
+        self._flight = SingleFlight("krx_direct")
+
+    def _build_session(self) -> Optional[tuple[requests.Session, None]]:
+        """풀에 넣을 새 세션 (outerLoader를 제대로 방문한 경우만)"""
+        s, ok = self._new_session()
+        return (s, None) if ok else None
+
+    def _new_session(self) -> tuple[requests.Session, bool]:
+        """outerLoader를 방문해서 JSESSIONID 쿠키를 받은 새 세션
 
-            # outerLoader 방문 → JSESSIONID 쿠키 획득
-            try:
-                r = s.get(
-                    f"{self.BASE_URL}{self.OUTER_LOADER}",
-                    params={"screenId": "MDCSTAT015", "locale": "ko_KR"},
-                    timeout=15,
+        Returns:
+            (세션, JSESSIONID를 제대로 받았는지)
+        """
+        s = requests.Session()
+        s.headers.update(
+            {
+                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                "AppleWebKit/537.36 (KHTML, like Gecko) "
+                "Chrome/120.0.0.0 Safari/537.36",
+            }
+        )
+
+        # outerLoader 방문 → JSESSIONID 쿠키 획득
+        try:
+            r = limited_request(
+                s, "GET",
+                f"{self.BASE_URL}{self.OUTER_LOADER}",
+                params={"screenId": "MDCSTAT015", "locale": "ko_KR"},
+                timeout=15,
+            )
+            if r.status_code == 200:
+                cookies = dict(s.cookies)
+                logger.info(
+                    f"KRX outerLoader 세션 생성 완료 "
+                    f"(JSESSIONID: {cookies.get('JSESSIONID', 'N/A')[:20]}...)"
                 )
-                if r.status_code == 200:
-                    self._session = s
-                    self._session_created_at = time.time()
-                    cookies = dict(s.cookies)
-                    logger.info(
-                        f"KRX outerLoader 세션 생성 완료 "
-                        f"(JSESSIONID: {cookies.get('JSESSIONID', 'N/A')[:20]}...)"
-                    )
-                else:
-                    logger.warning(
-                        f"outerLoader 접근 실패: status={r.status_code}"
-                    )
-                    # 세션 없어도 OTP 시도는 가능
-                    self._session = s
-                    self._session_created_at = time.time()
-            except Exception as e:
-                logger.error(f"outerLoader 세션 생성 실패: {e}")
-                self._session = s
-                self._session_created_at = time.time()
-
-            return self._session
+                return s, True
+            logger.warning(
+                f"outerLoader 접근 실패: status={r.status_code}"
+            )
+        except Exception as e:
+            logger.error(f"outerLoader 세션 생성 실패: {e}")
+        return s, False
+
+    def _session_of(self, lease) -> requests.Session:
+        """빌린 세션 (풀이 세션을 못 만들었으면 그 자리에서 만든 임시 세션 —
+        세션 없어도 OTP 시도는 가능)"""
+        return lease.session if lease else self._new_session()[0]
+
+    def _generate_otp(self, s: requests.Session, data: dict) -> requests.Response:
+        return limited_request(
+            s, "POST",
+            f"{self.BASE_URL}{self.GENERATE_OTP}",
+            data=data,
+            headers={
+                "Referer": f"{self.BASE_URL}{self.OUTER_LOADER}",
+                "X-Requested-With": "XMLHttpRequest",
+            },
+            timeout=15,
+        )
 
     def fetch(self, endpoint_key: str, **params) -> pd.DataFrame:
         """
@@ -203,7 +263,31 @@ class KRXDirectFetcher:
             logger.error(f"알 수 없는 KRX 엔드포인트: {endpoint_key}")
             return pd.DataFrame()
 
-        s = self._ensure_session()
+        # 같은 요청이 최근에 있었으면 캐시에서 바로 반환
+        merged = dict(endpoint["default_params"])
+        merged.update(params)
+        cache = get_krx_cache()
+        key = cache_key("krx_direct", endpoint_key, merged)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+        if get_negative_cache().is_empty(key):
+            return pd.DataFrame()  # 최근에 빈 결과였던 요청 (휴장일 등)
+
+        df = self._flight.do(key, self._download, endpoint_key, endpoint, merged, key)
+        return df.copy()
+
+    def _download(
+        self, endpoint_key: str, endpoint: dict, merged: dict, key: tuple
+    ) -> pd.DataFrame:
+        """OTP 생성 → CSV 다운로드 → 파싱 (single-flight leader만 실행)"""
+        with self.pool.checkout() as lease:
+            return self._download_with(lease, endpoint_key, endpoint, merged, key)
+
+    def _download_with(
+        self, lease, endpoint_key: str, endpoint: dict, merged: dict, key: tuple
+    ) -> pd.DataFrame:
+        s = self._session_of(lease)
 
         # 파라미터 구성
         data = {
@@ -212,40 +296,23 @@ class KRXDirectFetcher:
             "name": "fileDown",
             "url": endpoint["bld"],
         }
-        # 기본 파라미터 적용
-        data.update(endpoint["default_params"])
-        # 사용자 파라미터 적용 (기본값 덮어쓰기)
-        data.update(params)
+        # 기본 파라미터 + 사용자 파라미터 (기본값 덮어쓰기)
+        data.update(merged)
 
         try:
             # Step 1: OTP 생성
-            r_otp = s.post(
-                f"{self.BASE_URL}{self.GENERATE_OTP}",
-                data=data,
-                headers={
-                    "Referer": f"{self.BASE_URL}{self.OUTER_LOADER}",
-                    "X-Requested-With": "XMLHttpRequest",
-                },
-                timeout=15,
-            )
+            r_otp = self._generate_otp(s, data)
 
             if "LOGOUT" in r_otp.text or len(r_otp.text) < 10:
                 logger.warning(
                     f"KRX OTP 생성 실패 ({endpoint_key}): "
-                    f"LOGOUT 또는 빈 응답 (세션 재생성 시도)"
-                )
-                # 세션 만료 → 재생성
-                self._session_created_at = 0
-                s = self._ensure_session()
-                r_otp = s.post(
-                    f"{self.BASE_URL}{self.GENERATE_OTP}",
-                    data=data,
-                    headers={
-                        "Referer": f"{self.BASE_URL}{self.OUTER_LOADER}",
-                        "X-Requested-With": "XMLHttpRequest",
-                    },
-                    timeout=15,
+                    f"LOGOUT 또는 빈 응답 (다른 세션으로 재시도)"
                 )
+                get_adaptive_concurrency().backoff(self.BASE_URL, "session kicked")
+                # 이 세션은 빼고 (뒤에서 교체) 다른 세션으로
+                self.pool.reissue(lease)
+                s = self._session_of(lease)
+                r_otp = self._generate_otp(s, data)
                 if "LOGOUT" in r_otp.text or len(r_otp.text) < 10:
                     logger.error(f"KRX OTP 재시도도 실패 ({endpoint_key})")
                     return pd.DataFrame()
@@ -254,7 +321,8 @@ class KRXDirectFetcher:
             logger.debug(f"KRX OTP 생성 성공 ({endpoint_key}): {len(otp)} chars")
 
             # Step 2: CSV 다운로드
-            r_csv = s.post(
+            r_csv = limited_request(
+                s, "POST",
                 f"{self.BASE_URL}{self.DOWNLOAD_CSV}",
                 data={"code": otp},
                 headers={
@@ -270,35 +338,43 @@ class KRXDirectFetcher:
                 )
                 return pd.DataFrame()
 
-            # Step 3: CSV → DataFrame 파싱
-            # KRX CSV는 euc-kr 인코딩 사용
-            try:
-                text = r_csv.content.decode("euc-kr")
-            except UnicodeDecodeError:
-                text = r_csv.content.decode("cp949", errors="replace")
-
-            df = pd.read_csv(io.StringIO(text))
-
-            # 숫자 컬럼의 쉼표 제거 및 숫자 변환
-            for col in df.columns:
-                if df[col].dtype == object:
-                    # 따옴표로 감싸진 숫자 처리
-                    cleaned = df[col].str.strip('"').str.replace(",", "", regex=False)
-                    try:
-                        df[col] = pd.to_numeric(cleaned)
-                    except (ValueError, TypeError):
-                        pass
+            # Step 3: CSV → DataFrame 파싱 (스키마대로 타입 변환)
+            df = self._parse_csv(endpoint_key, r_csv.content, endpoint.get("schema"))
 
             logger.info(
                 f"KRX 직접 수집 성공 ({endpoint_key}): "
                 f"{len(df)}행 x {len(df.columns)}열"
             )
+            if not df.empty:
+                get_krx_cache().set(key, df, ttl_for(merged))
+            else:
+                # 정상 응답인데 행이 없음 (휴장일 등) → 잠시 기억
+                get_negative_cache().add(key, negative_ttl_for(merged))
             return df
 
         except Exception as e:
             logger.error(f"KRX 직접 수집 실패 ({endpoint_key}): {e}", exc_info=True)
             return pd.DataFrame()
 
+    @staticmethod
+    def _parse_csv(source: str, content: bytes, schema: Optional[dict] = None) -> pd.DataFrame:
+        """KRX CSV(euc-kr) → DataFrame
+
+        모든 칸을 글자로 읽은 뒤(종목코드 앞자리 0 유지) krx_schema로 한 번에 타입 변환.
+        Arrow 빠른 길이 실패하면(인코딩 오류 등) 예전처럼 문자열로 풀어서 pandas로 읽음.
+        """
+        if CSV_ENGINE == "arrow":
+            try:
+                return get_schema_registry().apply_arrow(source, _read_csv_arrow(content), schema)
+            except (pa.ArrowInvalid, UnicodeDecodeError, ValueError) as e:
+                logger.warning(f"Arrow CSV 파싱 실패 ({source}) — pandas로 다시 읽음: {e}")
+        try:
+            text = content.decode("euc-kr")
+        except UnicodeDecodeError:
+            text = content.decode("cp949", errors="replace")
+        df = pd.read_csv(io.StringIO(text), dtype=str, keep_default_na=False)
+        return get_schema_registry().apply(source, df, schema)
+
     def fetch_raw_csv(self, bld: str, **params) -> pd.DataFrame:
         """
         임의의 MDC_OUT bld 경로로 직접 CSV를 다운로드합니다.
@@ -308,7 +384,11 @@ class KRXDirectFetcher:
             bld: KRX bld 경로 (예: "dbms/MDC_OUT/STAT/standard/MDCSTAT02401_OUT")
             **params: POST 파라미터
         """
-        s = self._ensure_session()
+        with self.pool.checkout() as lease:
+            return self._raw_csv_with(lease, bld, params)
+
+    def _raw_csv_with(self, lease, bld: str, params: dict) -> pd.DataFrame:
+        s = self._session_of(lease)
 
         data = {
             "locale": "ko_KR",
@@ -319,20 +399,15 @@ class KRXDirectFetcher:
         data.update(params)
 
         try:
-            r_otp = s.post(
-                f"{self.BASE_URL}{self.GENERATE_OTP}",
-                data=data,
-                headers={
-                    "Referer": f"{self.BASE_URL}{self.OUTER_LOADER}",
-                    "X-Requested-With": "XMLHttpRequest",
-                },
-                timeout=15,
-            )
+            r_otp = self._generate_otp(s, data)
 
             if "LOGOUT" in r_otp.text or len(r_otp.text) < 10:
+                get_adaptive_concurrency().backoff(self.BASE_URL, "session kicked")
+                self.pool.invalidate(lease)
                 return pd.DataFrame()
 
-            r_csv = s.post(
+            r_csv = limited_request(
+                s, "POST",
                 f"{self.BASE_URL}{self.DOWNLOAD_CSV}",
                 data={"code": r_otp.text.strip()},
                 headers={"Referer": f"{self.BASE_URL}{self.OUTER_LOADER}"},
@@ -342,20 +417,7 @@ class KRXDirectFetcher:
             if len(r_csv.content) == 0:
                 return pd.DataFrame()
 
-            try:
-                text = r_csv.content.decode("euc-kr")
-            except UnicodeDecodeError:
-                text = r_csv.content.decode("cp949", errors="replace")
-
-            df = pd.read_csv(io.StringIO(text))
-            for col in df.columns:
-                if df[col].dtype == object:
-                    cleaned = df[col].str.strip('"').str.replace(",", "", regex=False)
-                    try:
-                        df[col] = pd.to_numeric(cleaned)
-                    except (ValueError, TypeError):
-                        pass
-            return df
+            return self._parse_csv(bld, r_csv.content)
 
         except Exception as e:
             logger.error(f"KRX raw CSV 수집 실패 ({bld}): {e}")
@@ -382,10 +444,11 @@ def krx_direct_status() -> dict:
     f = get_krx_fetcher()
     return {
         "enabled": True,
-        "session_active": f._session is not None,
-        "session_age_sec": (
-            int(time.time() - f._session_created_at) if f._session else None
-        ),
+        "session_active": f.pool.is_live(),
+        "session_pool": f.pool.status(),
+        "single_flight": f._flight.status(),
+        "negative_cache": get_negative_cache().status(),
+        "schema": get_schema_registry().status(),
         "available_endpoints": list(KRX_OUT_ENDPOINTS.keys()),
         "method": "outerLoader + OTP + CSV",
     }
@@ -0,0 +1,222 @@
+"""
+재무지표 일괄 수집 — PER / PBR / EPS / BPS / 배당수익률
+=======================================================
+/api/stocks/fundamental 에서 종목을 지정하지 않으면 시가총액 상위 N개 종목의
+네이버 종목 페이지를 하나씩 긁어왔어요 (종목당 HTML 1장 + read_html).
+상위 100개면 1분 가까이 걸렸습니다.
+
+재무지표 엔진은 (초등학생 설명):
+  1. KRX foreign_holding 표 한 장에 시장 전체의 PER/PBR/EPS/BPS/배당수익률이
+     다 들어 있으니, 그 표를 한 번 받아서 (캐시/스냅샷 공유)
+  2. 필요한 종목만 골라서 돌려주고
+  3. 표에 없는 종목(또는 KRX 조회 실패)만 네이버에서 동시에 긁어옵니다
+     - 호스트별 속도 제한(rate_limiter)은 naver_finance가 지켜줌
+     - 긁어온 결과는 거래일 단위로 기억 (같은 날 다시 긁지 않음)
+
+사용법:
+  engine = get_fundamentals()
+  rows, source = engine.top("KOSPI", 100)     # 시가총액 상위 100개
+  rows, source = engine.lookup(["005930"])    # 특정 종목
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import pandas as pd
+
+try:
+    from .krx_auth import get_krx_auth
+    from .krx_calendar import get_calendar
+    from .krx_symbols import get_symbol_master, normalize_codes
+    from . import naver_finance as nf
+except ImportError:
+    from krx_auth import get_krx_auth
+    from krx_calendar import get_calendar
+    from krx_symbols import get_symbol_master, normalize_codes
+    import naver_finance as nf
+
+logger = logging.getLogger(__name__)
+
+# 시장 이름 → KRX mktId
+MARKET_IDS = {"KOSPI": "STK", "KOSDAQ": "KSQ"}
+
+# KRX 컬럼 → 응답 필드
+FIELDS = {
+    "PER": "PER",
+    "PBR": "PBR",
+    "EPS": "EPS",
+    "BPS": "BPS",
+    "DVD_YLD": "배당수익률",
+}
+
+# 네이버 대체 경로의 동시 요청 수 (실제 속도는 호스트별 제한기가 조절)
+NAVER_CONCURRENCY = int(os.environ.get("KRX_FUNDAMENTAL_CONCURRENCY", "8"))
+
+
+def _krx_frame(endpoint_key: str, mkt_id: str) -> tuple[pd.DataFrame, Optional[str]]:
+    """최근 거래일 전종목 표 (오늘 데이터가 아직 없으면 직전 거래일)"""
+    auth = get_krx_auth()
+    day = get_calendar().latest_trading_day()
+    df = auth.fetch(endpoint_key, trdDd=day, mktId=mkt_id)
+    if df.empty:
+        day = get_calendar().prev_trading_day(day)
+        df = auth.fetch(endpoint_key, trdDd=day, mktId=mkt_id)
+    if df.empty or "ISU_SRT_CD" not in df.columns:
+        return pd.DataFrame(), None
+    df = df.set_index(normalize_codes(df["ISU_SRT_CD"]))
+    return df[~df.index.duplicated()], day
+
+
+class FundamentalsEngine:
+    """KRX 스냅샷 우선, 네이버 동시 수집 대체 (거래일 단위 캐시)"""
+
+    def __init__(self, concurrency: int = NAVER_CONCURRENCY):
+        self.concurrency = max(1, concurrency)
+        self._lock = threading.Lock()
+        # 네이버에서 긁어온 종목별 결과 (거래일이 바뀌면 비움)
+        self._naver_day: Optional[str] = None
+        self._naver: dict[str, dict] = {}
+        self._stats = {"krx_rows": 0, "naver_scraped": 0, "naver_cached": 0}
+
+    # ── KRX 스냅샷 ──
+
+    def market_frame(self, market: str) -> tuple[pd.DataFrame, Optional[str]]:
+        """시장 전체 재무지표 (인덱스: 종목코드, 컬럼: 종목명 + FIELDS)"""
+        mkt_id = MARKET_IDS.get(market)
+        if not mkt_id:
+            return pd.DataFrame(), None
+        df, day = _krx_frame("foreign_holding", mkt_id)
+        if df.empty:
+            return df, None
+        out = pd.DataFrame(index=df.index)
+        out["종목명"] = df["ISU_ABBRV"] if "ISU_ABBRV" in df.columns else None
+        for col, field in FIELDS.items():
+            if col in df.columns:
+                # "-" 같은 값은 None (JSON null)
+                values = pd.to_numeric(df[col], errors="coerce")
+                out[field] = values.astype(object).where(values.notna(), None)
+        return out, day
+
+    # ── 네이버 대체 ──
+
+    def _scrape(self, code: str) -> dict:
+        info = nf.get_financial_info(code)
+        return dict(info) if info else {}
+
+    def naver(self, codes: list[str]) -> dict[str, dict]:
+        """네이버 종목 페이지를 동시에 긁기 (같은 거래일에 긁은 종목은 재사용)"""
+        day = get_calendar().latest_trading_day()
+        with self._lock:
+            if self._naver_day != day:
+                self._naver_day = day
+                self._naver.clear()
+            found = {c: self._naver[c] for c in codes if c in self._naver}
+        missing = [c for c in codes if c not in found]
+
+        if missing:
+            with ThreadPoolExecutor(
+                max_workers=min(self.concurrency, len(missing)), thread_name_prefix="fundamental"
+            ) as pool:
+                scraped = dict(zip(missing, pool.map(self._scrape, missing)))
+            with self._lock:
+                for code, info in scraped.items():
+                    if info:
+                        self._naver[code] = info
+                self._stats["naver_scraped"] += len(missing)
+            found.update(scraped)
+
+        with self._lock:
+            self._stats["naver_cached"] += len(codes) - len(missing)
+        return found
+
+    # ── 조회 ──
+
+    def lookup(self, codes: list[str], market: Optional[str] = None) -> tuple[list[dict], str]:
+        """종목들의 재무지표 (요청 순서 유지, 정보가 없는 종목은 제외)
+
+        Returns:
+            (행 리스트, 출처 "krx_auth" / "naver" / "krx_auth+naver")
+        """
+        symbols = get_symbol_master()
+        markets = {}
+        for code in codes:
+            mkt = market or (symbols.get(code) or {}).get("market")
+            markets[code] = mkt if mkt in MARKET_IDS else None
+
+        rows: dict[str, dict] = {}
+        sources = set()
+        for mkt in sorted({m for m in markets.values() if m}):
+            try:
+                frame, day = self.market_frame(mkt)
+            except Exception as e:
+                logger.warning(f"KRX 재무지표 조회 실패 ({mkt}): {e}")
+                continue
+            if frame.empty:
+                continue
+            wanted = [c for c, m in markets.items() if m == mkt and c in frame.index]
+            for code, rec in zip(wanted, frame.loc[wanted].to_dict(orient="records")):
+                rows[code] = {**rec, "종목코드": code, "시장": mkt, "기준일": day}
+            if wanted:
+                sources.add("krx_auth")
+            with self._lock:
+                self._stats["krx_rows"] += len(wanted)
+
+        missing = [c for c in codes if c not in rows]
+        if missing:
+            scraped = self.naver(missing)
+            for code in missing:
+                info = scraped.get(code)
+                if info:
+                    rows[code] = {
+                        **info,
+                        "종목코드": code,
+                        "종목명": symbols.name_of(code),
+                        "시장": markets[code] or market,
+                    }
+                    sources.add("naver")
+
+        return [rows[c] for c in codes if c in rows], "+".join(sorted(sources)) or "naver"
+
+    def top_codes(self, market: str, top_n: int) -> list[str]:
+        """시가총액 상위 종목코드 (KRX 전종목 시세 → 실패 시 네이버 시가총액 페이지)"""
+        mkt_id = MARKET_IDS.get(market)
+        if mkt_id:
+            try:
+                df, _ = _krx_frame("all_stock_price", mkt_id)
+                if not df.empty and "MKTCAP" in df.columns:
+                    cap = pd.to_numeric(df["MKTCAP"], errors="coerce")
+                    return cap.nlargest(top_n).index.tolist()
+            except Exception as e:
+                logger.warning(f"KRX 시가총액 순위 조회 실패 ({market}): {e}")
+        stock_df = nf.get_stock_list(market, pages=max(1, (top_n - 1) // 50 + 1))
+        if stock_df.empty:
+            return []
+        return stock_df["종목코드"].head(top_n).tolist()
+
+    def top(self, market: str, top_n: int) -> tuple[list[dict], str]:
+        """시가총액 상위 top_n 종목의 재무지표"""
+        return self.lookup(self.top_codes(market, top_n), market=market)
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "concurrency": self.concurrency,
+                "naver_day": self._naver_day,
+                "naver_cached_tickers": len(self._naver),
+                **self._stats,
+            }
+
+
+# 전역 싱글톤
+_engine: Optional[FundamentalsEngine] = None
+
+
+def get_fundamentals() -> FundamentalsEngine:
+    """재무지표 엔진 싱글톤"""
+    global _engine
+    if _engine is None:
+        _engine = FundamentalsEngine()
+    return _engine
@@ -19,6 +19,8 @@ from typing import Optional
 
 from fastmcp import FastMCP
 from krx_auth import get_krx_auth, KRX_AUTH_ENDPOINTS
+from krx_calendar import get_calendar
+from krx_schema import json_records
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -30,7 +32,7 @@ mcp = FastMCP(
 
 
 def _today() -> str:
-    return datetime.date.today().strftime("%Y%m%d")
+    return get_calendar().latest_trading_day()
 
 def _week_ago() -> str:
     return (datetime.date.today() - datetime.timedelta(days=7)).strftime("%Y%m%d")
@@ -42,7 +44,7 @@ def _df_to_result(df) -> dict:
     return {
         "rows": len(df),
         "columns": list(df.columns),
-        "data": df.head(100).to_dict(orient="records"),
+        "data": json_records(df.head(100)),
         "truncated": len(df) > 100,
     }
 
@@ -67,7 +69,7 @@ def _make_single(name: str, config: dict):
             params["isuCd"] = isuCd
         if prodId is not None:
             params["prodId"] = prodId
-        df = await asyncio.to_thread(auth.fetch, name, **params)
+        df = await auth.fetch_async(name, **params)
         return _df_to_result(df)
     tool_fn.__name__ = name
     tool_fn.__doc__ = config["desc"] + "\n\ndate: YYYYMMDD (미입력시 오늘). mktId: STK(코스피)/KSQ(코스닥). prodId: 파생상품ID."
@@ -104,7 +106,7 @@ def _make_range(name: str, config: dict):
             params["invstTpCd"] = invstTpCd
         if idxCd is not None:
             params["idxCd"] = idxCd
-        df = await asyncio.to_thread(auth.fetch, name, **params)
+        df = await auth.fetch_async(name, **params)
         return _df_to_result(df)
     tool_fn.__name__ = name
     tool_fn.__doc__ = (
@@ -156,7 +158,7 @@ async def custom_query(bld: str, params_json: Optional[str] = None) -> dict:
             extra = json.loads(params_json)
         except json.JSONDecodeError:
             return {"error": "params_json이 유효한 JSON이 아닙니다"}
-    result = await asyncio.to_thread(auth.fetch_json, bld, **extra)
+    result = await auth.fetch_json_async(bld, **extra)
     if not result:
         return {"error": "데이터 없음"}
     return result
@@ -11,17 +11,20 @@ LLM이 자연어를 정확한 API 호출로 변환할 때 이 지도를 참조
   4. 결과 데이터 + 차트 설정을 프론트엔드에 전달합니다
 """
 
+import asyncio
 import json
 import logging
 import os
 import re
 import time
-from datetime import datetime, timedelta
 from typing import Any, Optional
 
 import httpx
 
 from .krx_auth import get_krx_auth, KRX_AUTH_ENDPOINTS
+from .krx_calendar import get_calendar
+from .krx_schema import json_records
+from .krx_symbols import get_symbol_master
 
 logger = logging.getLogger(__name__)
 
@@ -240,7 +243,7 @@ SYSTEM_PROMPT = """당신은 KRX(한국거래소) 데이터 API 전문가입니
 1. 오늘 날짜: {today}
 2. 기간 미지정 시: 단일날짜는 오늘, 기간은 최근 30일
 3. 시장 미지정 시: KOSPI(STK) 기본
-4. 종목명이 나오면 반드시 stock_aliases에서 isuCd 코드 변환
+4. 종목명이 나오면 stock_aliases에서 isuCd 코드 변환 (목록에 없으면 종목명이나 6자리 종목코드를 그대로 isuCd에 넣기)
 5. 여러 데이터를 결합해야 하면 endpoints 배열에 여러 개 추가
 6. chart.type은 데이터 특성에 맞게 선택:
    - 순위/비교 → bar
@@ -252,13 +255,21 @@ SYSTEM_PROMPT = """당신은 KRX(한국거래소) 데이터 API 전문가입니
 
 
 def _today() -> str:
-    d = datetime.now()
-    wd = d.weekday()
-    if wd == 5:
-        d -= timedelta(days=1)
-    elif wd == 6:
-        d -= timedelta(days=2)
-    return d.strftime("%Y%m%d")
+    return get_calendar().latest_trading_day()
+
+
+def _resolve_isin(value: Any) -> Any:
+    """isuCd 값(종목명/종목코드/ISIN) → ISIN. 종목 마스터에 없으면 stock_aliases, 그래도 없으면 그대로
+
+    async execute_nl_query에서 부르므로 마스터 생성을 기다리지 않음
+    (아직 없으면 백그라운드에서 만들기 시작하고 이번 요청은 stock_aliases로 처리)
+    """
+    symbols = get_symbol_master()
+    code = symbols.resolve(value, wait=False)
+    if code is None:
+        alias = KRX_ONTOLOGY["stock_aliases"].get(str(value).strip())
+        return alias or value
+    return symbols.isin_of(code, wait=False)
 
 
 async def natural_language_to_api(query: str) -> dict[str, Any]:
@@ -349,11 +360,12 @@ async def execute_nl_query(query: str) -> dict[str, Any]:
     plan = await natural_language_to_api(query)
     logger.info("[NL] Plan for '%s': %s endpoints", query, len(plan.get("endpoints", [])))
 
-    # 2단계: 계획에 따라 실제 데이터 가져오기
+    # 2단계: 계획에 따라 실제 데이터 가져오기 (여러 엔드포인트를 동시에 요청)
     auth = get_krx_auth()
     all_data = []
     all_columns = set()
     endpoints_called = []
+    calls = []
 
     for ep in plan.get("endpoints", []):
         ep_name = ep["name"]
@@ -373,6 +385,8 @@ async def execute_nl_query(query: str) -> dict[str, Any]:
                 call_params["endDd"] = v or _today()
             elif k == "market":
                 call_params["mktId"] = v
+            elif k in ("isuCd", "isuCd2"):
+                call_params[k] = _resolve_isin(v)
             else:
                 call_params[k] = v
 
@@ -380,17 +394,22 @@ async def execute_nl_query(query: str) -> dict[str, Any]:
         cfg = KRX_AUTH_ENDPOINTS.get(ep_name, {})
         if cfg.get("date_param") and cfg["date_param"] not in call_params:
             call_params[cfg["date_param"]] = _today()
+        calls.append((ep_name, call_params))
 
-        try:
-            df = auth.fetch(ep_name, **call_params)
-            if not df.empty:
-                records = df.to_dict(orient="records")
-                all_data.extend(records)
-                all_columns.update(df.columns.tolist())
-                endpoints_called.append(ep_name)
-                logger.info("[NL] %s returned %d rows", ep_name, len(records))
-        except Exception as e:
-            logger.warning("[NL] Failed to fetch %s: %s", ep_name, str(e))
+    results = await asyncio.gather(
+        *(auth.fetch_async(ep_name, **call_params) for ep_name, call_params in calls),
+        return_exceptions=True,
+    )
+    for (ep_name, _), df in zip(calls, results):
+        if isinstance(df, Exception):
+            logger.warning("[NL] Failed to fetch %s: %s", ep_name, str(df))
+            continue
+        if not df.empty:
+            records = json_records(df)
+            all_data.extend(records)
+            all_columns.update(df.columns.tolist())
+            endpoints_called.append(ep_name)
+            logger.info("[NL] %s returned %d rows", ep_name, len(records))
 
     # 3단계: 결합 전략 적용
     combine = plan.get("combine_strategy", "none")
@@ -430,4 +449,5 @@ def get_ontology_summary() -> dict[str, Any]:
         "point_in_time_count": len(KRX_ONTOLOGY["time_types"]["point_in_time"]["endpoints"]),
         "date_range_count": len(KRX_ONTOLOGY["time_types"]["date_range"]["endpoints"]),
         "stock_aliases_count": len(KRX_ONTOLOGY["stock_aliases"]),
+        "symbol_master": get_symbol_master().status(),
     }
@@ -0,0 +1,309 @@
+"""
+KRX 기간 조회 캐시 — 빠진 날짜만 골라서 받아오기 (gap-filling)
+================================================================
+stock_daily, investor_trend 같은 기간(strtDd~endDd) 엔드포인트는
+차트를 하루만 옮겨도 1년치(약 250행)를 통째로 다시 받아옵니다.
+
+이 모듈은 (초등학생 설명):
+  1. 받아온 행을 날짜별로 쪼개서 기억해두고 (종목/지수/시장별로 따로)
+  2. 새 요청이 오면 "이미 아는 날짜"와 "모르는 날짜"를 비교해서
+  3. 모르는 구간(gap)만 KRX에 물어보고
+  4. 기억해둔 행과 새로 받은 행을 이어 붙여서 돌려줍니다
+
+  마치 일기장에 빠진 날짜만 채워 넣는 것처럼!
+
+규칙:
+  - 확정되지 않은 날짜(18:00 전의 오늘, 미래)는 기억하지 않음 (매번 새로 받음)
+  - 거래일이 하루도 없는 gap(연휴 등)은 KRX에 묻지 않고 빈 구간으로 기록
+  - 가까운 gap 여러 개는 하나의 요청으로 합침 (요청 횟수 최소화)
+  - 응답 행에 날짜 컬럼이 없으면 (일별 데이터가 아니면) 이 캐시를 쓰지 않음
+
+사용법:
+  items = fetch_range("stock_daily", ep, params, fetch_items)
+  # fetch_items(params) → 행 리스트 (실패 시 None)
+  items = await fetch_range_async("stock_daily", ep, params, fetch_items_async)
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Awaitable, Callable, Optional
+
+try:
+    from .krx_calendar import KST, get_calendar
+except ImportError:
+    from krx_calendar import KST, get_calendar
+
+logger = logging.getLogger(__name__)
+
+# gap 사이 간격이 이 일수 이하면 한 번의 요청으로 합침
+GAP_MERGE_DAYS = 7
+
+# 기억할 최대 시계열 수 (엔드포인트 + 종목/지수/시장 조합)
+MAX_SERIES = int(os.environ.get("KRX_RANGE_CACHE_SERIES", "256"))
+
+# 구간을 나타내는 파라미터 (시계열 식별에서 제외)
+RANGE_PARAMS = ("strtDd", "endDd")
+
+
+def _to_date(yyyymmdd: str) -> date:
+    return datetime.strptime(yyyymmdd, "%Y%m%d").date()
+
+
+def _to_str(d: date) -> str:
+    return d.strftime("%Y%m%d")
+
+
+def _row_day(value) -> str:
+    """KRX 날짜 값("2026/03/12", "2026-03-12", 20260312) → "20260312" """
+    return "".join(ch for ch in str(value) if ch.isdigit())[:8]
+
+
+def _subtract(start: date, end: date, covered: list[tuple[date, date]]) -> list[tuple[date, date]]:
+    """[start, end]에서 covered 구간들을 뺀 나머지 구간 목록"""
+    gaps = []
+    cursor = start
+    for c_start, c_end in covered:
+        if c_end < cursor:
+            continue
+        if c_start > end:
+            break
+        if c_start > cursor:
+            gaps.append((cursor, min(end, c_start - timedelta(days=1))))
+        cursor = max(cursor, c_end + timedelta(days=1))
+        if cursor > end:
+            break
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def _merge(intervals: list[tuple[date, date]], slack_days: int = 0) -> list[tuple[date, date]]:
+    """겹치거나 slack_days 이내로 붙어 있는 구간을 합침"""
+    merged: list[tuple[date, date]] = []
+    for s, e in sorted(intervals):
+        if merged and (s - merged[-1][1]).days <= slack_days + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], e))
+        else:
+            merged.append((s, e))
+    return merged
+
+
+class _Series:
+    """하나의 시계열 (예: stock_daily + 삼성전자)"""
+
+    __slots__ = ("rows", "covered")
+
+    def __init__(self):
+        self.rows: dict[str, list[dict]] = {}       # "YYYYMMDD" → 그날의 행들
+        self.covered: list[tuple[date, date]] = []  # 이미 받아온 구간 (정렬, 병합됨)
+
+
+class RangeCache:
+    """날짜별 행 저장 + 빠진 구간 계산 (스레드 안전)"""
+
+    def __init__(self, max_series: int = MAX_SERIES):
+        self.max_series = max_series
+        self._lock = threading.Lock()
+        self._series: "OrderedDict[tuple, _Series]" = OrderedDict()
+        # 날짜 컬럼이 없어서 기간 캐시를 쓸 수 없는 엔드포인트
+        self._unsupported: set[str] = set()
+        self._gap_requests = 0
+        self._rows_served = 0
+
+    @staticmethod
+    def series_key(endpoint_key: str, params: dict) -> tuple:
+        ident = tuple(sorted(
+            (k, str(v)) for k, v in params.items() if k not in RANGE_PARAMS
+        ))
+        return (endpoint_key, ident)
+
+    def supports(self, endpoint_key: str) -> bool:
+        return endpoint_key not in self._unsupported
+
+    def mark_unsupported(self, endpoint_key: str):
+        with self._lock:
+            self._unsupported.add(endpoint_key)
+            for key in [k for k in self._series if k[0] == endpoint_key]:
+                del self._series[key]
+        logger.warning(f"기간 캐시 비활성화 ({endpoint_key}): 응답에 날짜 컬럼 없음")
+
+    def gaps(self, key: tuple, start: date, end: date) -> list[tuple[date, date]]:
+        """아직 받아오지 않은 구간 (가까운 gap은 합쳐서 반환)"""
+        with self._lock:
+            series = self._series.get(key)
+            covered = list(series.covered) if series else []
+        return _merge(_subtract(start, end, covered), slack_days=GAP_MERGE_DAYS)
+
+    def add(self, key: tuple, start: date, end: date, items: list[dict], date_field: str):
+        """받아온 구간의 행을 날짜별로 저장. 확정되지 않은 날짜는 저장하지 않음"""
+        today = datetime.now(KST).date()
+        last_final = today if get_calendar().is_finalized(_to_str(today)) else today - timedelta(days=1)
+        final_end = min(end, last_final)
+
+        by_day: dict[str, list[dict]] = {}
+        for row in items:
+            day = _row_day(row.get(date_field, ""))
+            if len(day) == 8:
+                by_day.setdefault(day, []).append(row)
+
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = _Series()
+                self._series[key] = series
+            self._series.move_to_end(key)
+
+            if start <= final_end:
+                lo, hi = _to_str(start), _to_str(final_end)
+                # 다시 받은 구간은 새 값으로 교체
+                for day in [d for d in series.rows if lo <= d <= hi]:
+                    del series.rows[day]
+                for day, rows in by_day.items():
+                    if lo <= day <= hi:
+                        series.rows[day] = rows
+                series.covered = _merge(series.covered + [(start, final_end)])
+
+            while len(self._series) > self.max_series:
+                self._series.popitem(last=False)
+
+    def rows(self, key: tuple, start: date, end: date) -> list[dict]:
+        """저장된 행 중 [start, end] 구간 (최신 날짜부터 — KRX 응답 순서)"""
+        lo, hi = _to_str(start), _to_str(end)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                return []
+            days = sorted((d for d in series.rows if lo <= d <= hi), reverse=True)
+            return [row for d in days for row in series.rows[d]]
+
+    def record(self, gap_requests: int, rows_served: int):
+        with self._lock:
+            self._gap_requests += gap_requests
+            self._rows_served += rows_served
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "series": len(self._series),
+                "max_series": self.max_series,
+                "gap_requests": self._gap_requests,
+                "rows_served": self._rows_served,
+                "unsupported_endpoints": sorted(self._unsupported),
+            }
+
+
+def _range_steps(endpoint_key: str, endpoint: dict, params: dict):
+    """fetch_range/fetch_range_async 공용 진행 로직 (제너레이터)
+
+    받아야 할 gap 파라미터를 yield 하고, 호출자가 send()로 돌려준 행으로
+    캐시를 채웁니다. 최종 결과는 StopIteration.value로 반환합니다.
+    """
+    cache = get_range_cache()
+    date_field = endpoint.get("row_date_field")
+    if not date_field or not cache.supports(endpoint_key):
+        return None
+    try:
+        start = _to_date(str(params["strtDd"]))
+        end = _to_date(str(params["endDd"]))
+    except (KeyError, ValueError):
+        return None
+    if start > end:
+        return None
+
+    key = cache.series_key(endpoint_key, params)
+    gaps = cache.gaps(key, start, end)
+
+    fresh: list[dict] = []
+    today = _to_str(datetime.now(KST).date())
+    calendar = get_calendar()
+    skipped = 0
+    for gap_start, gap_end in gaps:
+        if not calendar.trading_days(gap_start, gap_end):
+            # 휴장일만 있는 구간 → 요청 없이 빈 구간으로 기록
+            cache.add(key, gap_start, gap_end, [], date_field)
+            skipped += 1
+            continue
+        gap_params = dict(params)
+        gap_params["strtDd"] = _to_str(gap_start)
+        gap_params["endDd"] = _to_str(gap_end)
+        items = yield gap_params
+        if items is None:
+            return None  # 수집 실패 → 호출자가 전체 구간으로 재시도
+        if items and date_field not in items[0]:
+            cache.mark_unsupported(endpoint_key)
+            return None
+        cache.add(key, gap_start, gap_end, items, date_field)
+        # 확정 전 행은 저장되지 않을 수 있으므로 이번 응답에서 직접 사용
+        fresh.extend(r for r in items if _row_day(r.get(date_field, "")) >= today)
+
+    cached_rows = cache.rows(key, start, end)
+    if fresh:
+        # 방금 받은 날짜(오늘)가 이미 캐시에도 있으면 새 값만 사용
+        fresh_days = {_row_day(r.get(date_field, "")) for r in fresh}
+        cached_rows = [r for r in cached_rows if _row_day(r.get(date_field, "")) not in fresh_days]
+    cache.record(len(gaps) - skipped, len(cached_rows))
+    if gaps:
+        logger.info(
+            f"기간 캐시 ({endpoint_key}): gap {len(gaps) - skipped}개 수집"
+            f" (휴장 구간 {skipped}개 생략), "
+            f"캐시 {len(cached_rows)}행 재사용"
+        )
+    fresh.sort(key=lambda r: _row_day(r.get(date_field, "")), reverse=True)
+    return fresh + cached_rows
+
+
+def fetch_range(
+    endpoint_key: str,
+    endpoint: dict,
+    params: dict,
+    fetch_items: Callable[[dict], Optional[list[dict]]],
+) -> Optional[list[dict]]:
+    """기간 엔드포인트를 gap만 받아서 조회
+
+    Args:
+        endpoint_key: KRX_AUTH_ENDPOINTS 키
+        endpoint: 엔드포인트 설정 (row_date_field 필요)
+        params: 병합된 요청 파라미터 (strtDd, endDd 포함)
+        fetch_items: params → 응답 행 리스트 (실패 시 None)
+
+    Returns:
+        stitched 행 리스트. 기간 캐시를 쓸 수 없으면 None (호출자가 원래 방식으로 조회)
+    """
+    steps = _range_steps(endpoint_key, endpoint, params)
+    try:
+        gap_params = next(steps)
+        while True:
+            gap_params = steps.send(fetch_items(gap_params))
+    except StopIteration as done:
+        return done.value
+
+
+async def fetch_range_async(
+    endpoint_key: str,
+    endpoint: dict,
+    params: dict,
+    fetch_items: Callable[[dict], Awaitable[Optional[list[dict]]]],
+) -> Optional[list[dict]]:
+    """fetch_range의 asyncio 버전 (fetch_items가 코루틴 함수)"""
+    steps = _range_steps(endpoint_key, endpoint, params)
+    try:
+        gap_params = next(steps)
+        while True:
+            gap_params = steps.send(await fetch_items(gap_params))
+    except StopIteration as done:
+        return done.value
+
+
+# 전역 싱글톤
+_range_cache: Optional[RangeCache] = None
+
+
+def get_range_cache() -> RangeCache:
+    """기간 조회 캐시 싱글톤"""
+    global _range_cache
+    if _range_cache is None:
+        _range_cache = RangeCache(MAX_SERIES)
+    return _range_cache
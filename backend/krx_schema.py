@@ -0,0 +1,431 @@
+"""
+KRX 응답 스키마 — 컬럼 타입을 미리 정해두고 한 번에 변환
+========================================================
+KRXAuth.fetch, KRXDirectFetcher.fetch, fetch_raw_csv는 문자열 컬럼을
+하나씩 돌면서 "쉼표 빼고 숫자로 바꿔보고, 안 되면 그냥 두기"를 했어요.
+  - 종목명 같은 글자 컬럼도 매번 쉼표를 지우고 변환을 시도했다가 실패하고
+  - "005930" 같은 종목코드는 숫자 5930이 되어버리고
+  - 값 하나만 "-"여도 그 컬럼 전체가 글자로 남았습니다
+
+SchemaRegistry는 (초등학생 설명):
+  - 컬럼 이름만 보고 "이건 숫자, 이건 날짜, 이건 이름"을 먼저 정해요
+    (KRX 필드 이름 규칙: ..._PRC/_VOL → 정수, ..._RT → 실수, ..._CD → 코드 ...)
+  - 엔드포인트 설정의 "schema"로 규칙을 덮어쓸 수 있어요
+  - 숫자 컬럼들은 전부 이어붙여서 쉼표 제거 + 숫자 변환을 "딱 한 번"에 하고
+  - 정수는 int32로 줄이고, 시장/업종 이름은 category로 저장 (메모리 절약)
+  - 규칙에 없는 컬럼, 선언했는데 안 온 컬럼, 숫자라더니 글자가 온 컬럼은
+    "스키마 변화(drift)"로 기록해 status에서 보여줘요
+
+타입:
+  int      — 정수 (값에 소수점이 있으면 float64, "-"/빈칸이 있으면 NaN이라 float64)
+  float    — 실수 (float64 그대로 — 시가총액 같은 큰 값의 정밀도 유지)
+  category — 종류가 적은 이름 (시장구분, 업종명, 발행사 ...)
+  date     — KRX 날짜 문자열 그대로 ("2026/03/12") — 형식만 검사
+  string   — 글자 그대로 (종목코드/종목명)
+
+  날짜를 datetime으로 바꾸지 않는 이유: 캘린더, 기간 캐시, JSON 응답이
+  모두 KRX 날짜 문자열을 그대로 쓰고 있어요.
+
+사용법:
+  registry = get_schema_registry()
+  df = registry.apply("elw_price", pd.DataFrame(items), ep.get("schema"))
+  df = registry.apply_arrow("all_stock_price", table, ep.get("schema"))   # 글자로 읽은 Arrow 표
+  df = registry.apply_arrow("elw_price", records_to_arrow(items), ep.get("schema"))
+  registry.status()     # 엔드포인트별 스키마 변화
+"""
+
+import hashlib
+import io
+import logging
+import re
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+logger = logging.getLogger(__name__)
+
+# 숫자 컬럼에서 "값 없음"으로 보는 표시 (변환 실패로 세지 않음)
+PLACEHOLDERS = ("", "-")
+
+# 이름이 정확히 같은 필드 (규칙보다 먼저)
+FIELD_TYPES = {
+    # 코드/이름
+    "ISU_SRT_CD": "string",
+    "ISU_CD": "string",
+    "ISU_ABBRV": "string",
+    "ISU_NM": "string",
+    "ISU_ENG_NM": "string",
+    "IDX_NM": "string",
+    # 종류가 적은 이름
+    "MKT_ID": "category",
+    "MKT_NM": "category",
+    "SECT_TP_NM": "category",
+    "IDX_IND_NM": "category",
+    "FLUC_TP_CD": "category",
+    "ISUR_NM": "category",
+    "ULY_NM": "category",
+    "RGHT_TP_NM": "category",
+    "INVST_TP_NM": "category",
+    # 재무지표
+    "EPS": "int",
+    "BPS": "int",
+    "DPS": "int",
+    "PER": "float",
+    "PBR": "float",
+    "NAV": "float",
+    "MKTCAP": "int",
+    # KRX 다운로드 CSV (한글 헤더)
+    "종목코드": "string",
+    "단축코드": "string",
+    "표준코드": "string",
+    "종목명": "string",
+    "종목약명": "string",
+    "지수명": "string",
+    "시장구분": "category",
+    "소속부": "category",
+    "업종명": "category",
+    "투자자구분": "category",
+    "일자": "date",
+    "상장일": "date",
+    "기준일": "date",
+    "만기일": "date",
+}
+
+# 이름 끝부분 규칙 (위에서부터 처음 맞는 것)
+SUFFIX_RULES = [
+    (re.compile(r"(^|_)DD$|일자$"), "date"),
+    (re.compile(r"_TP_NM$|_TP_CD$"), "category"),
+    (re.compile(r"_(CD|NM|ABBRV)$|코드$|명$"), "string"),
+    (re.compile(r"(_RT|_RATE|RTO|_YLD|_IDX|_WT|_BETA|VOLTY)$|(률|율|비중)$"), "float"),
+    (re.compile(
+        r"(PRC|_VOL|TRDVOL|_VAL|TRDVAL|_SHRS|_QTY|_AMT|_CNT|_CMPR|CAP)$"
+        r"|(가|량|대금|총액|주식수|금액|대비)$"
+    ), "int"),
+]
+
+# 변환 코드(타입 정하는 방법)를 바꾸면 올리기 — 규칙 표(FIELD_TYPES/SUFFIX_RULES)만
+# 바꾼 경우는 아래 지문이 알아서 바뀜
+SCHEMA_VERSION = 2
+
+
+def _rules_fingerprint() -> str:
+    rules = (sorted(FIELD_TYPES.items()), [(rule.pattern, kind) for rule, kind in SUFFIX_RULES])
+    return hashlib.sha1(repr(rules).encode("utf-8")).hexdigest()[:8]
+
+
+# 변환된 DataFrame의 형식 — 스냅샷 저장소 경로와 공유 캐시 키에 들어감
+# (형식이 바뀌면 새 위치를 쓰므로, 종목코드가 정수였던 옛 스냅샷을 다시 읽지 않음)
+FORMAT_VERSION = f"v{SCHEMA_VERSION}-{_rules_fingerprint()}"
+
+# KRX 날짜 문자열 ("2026/03/12", "20260312", "2026-03-12")
+_DATE_RE = re.compile(r"^\d{4}[/.\-]?\d{2}[/.\-]?\d{2}$")
+
+_INT32 = np.iinfo(np.int32)
+
+# 숫자 값들을 한 줄씩 이어붙일 때 쓰는 구분자 (값 안에 나올 일 없는 문자)
+_SEP = "\x1f"
+
+
+def column_type(name: str, declared: Optional[dict] = None) -> Optional[str]:
+    """컬럼 하나의 타입 (선언 → 정확한 이름 → 이름 규칙, 모르면 None)"""
+    if declared and name in declared:
+        return declared[name]
+    kind = FIELD_TYPES.get(name)
+    if kind:
+        return kind
+    for pattern, kind in SUFFIX_RULES:
+        if pattern.search(name):
+            return kind
+    return None
+
+
+def _parse_numbers(raw: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """숫자 문자열 배열 → (float64 값, 변환 실패 표시)
+
+    값들을 한 줄에 하나씩 이어붙여 pandas CSV 파서(C)로 한 번에 읽어요
+    (쉼표 구분자/따옴표도 파서가 처리). 글자가 섞여 있으면 칸마다 정리 +
+    to_numeric으로 다시 읽고 어느 칸이 글자인지 표시합니다.
+    "-"와 빈칸은 NaN이지만 실패로 세지 않음.
+    """
+    try:
+        values = pd.read_csv(
+            io.StringIO("\n".join(raw)), header=None, sep=_SEP, thousands=",",
+            na_values=list(PLACEHOLDERS), keep_default_na=False, skip_blank_lines=False,
+            dtype="float64",
+        )[0].to_numpy()
+        if len(values) == len(raw):
+            return values, np.zeros(len(raw), dtype=bool)
+    except (TypeError, ValueError):
+        pass
+    text = np.array(
+        [v.replace(",", "").strip().strip('"') if isinstance(v, str) else "" for v in raw],
+        dtype=object,
+    )
+    values = np.asarray(pd.to_numeric(text, errors="coerce"), dtype="float64")
+    bad = np.isnan(values) & ~np.isin(text, PLACEHOLDERS)
+    return values, bad
+
+
+def _is_integral(values: np.ndarray) -> bool:
+    """NaN("-"/빈칸)도 소수도 없으면 정수 컬럼"""
+    return not np.isnan(values).any() and bool((values == np.floor(values)).all())
+
+
+def _bad_dates(series: pd.Series) -> int:
+    """날짜 형식이 아닌 칸 수 (같은 날짜가 반복되니 서로 다른 값만 검사)"""
+    wrong = [
+        v for v in series.unique()
+        if isinstance(v, str) and v.strip() not in PLACEHOLDERS and not _DATE_RE.match(v.strip())
+    ]
+    return int(series.isin(wrong).sum()) if wrong else 0
+
+
+def _downcast_int(values: np.ndarray) -> np.ndarray:
+    """정수 컬럼을 int32로 (범위를 넘으면 int64 그대로)"""
+    ints = values.astype("int64")
+    if len(ints) and (ints.min() < _INT32.min or ints.max() > _INT32.max):
+        return ints
+    return ints.astype("int32")
+
+
+def records_to_arrow(items: list) -> pa.Table:
+    """getJsonData.cmd 행 리스트(dict) → 컬럼마다 글자 배열인 Arrow 표
+
+    행 dict 수천 개로 DataFrame을 만들지 않고, 컬럼별 값 리스트를 바로 Arrow
+    배열로 옮겨요. 모든 행의 키가 같다고 보고(KRX 응답), 키 개수가 다른 행이
+    있을 때만 전체 키를 모읍니다. 값이 글자가 아니면 ArrowTypeError/ArrowInvalid.
+    """
+    keys = list(items[0])
+    if any(len(row) != len(keys) for row in items):
+        keys = list(dict.fromkeys(k for row in items for k in row))
+    return pa.table({k: pa.array([row.get(k) for row in items], type=pa.string()) for k in keys})
+
+
+def _arrow_clean(cols: list) -> list[tuple[pa.ChunkedArray, pa.ChunkedArray]]:
+    """숫자 후보 컬럼들을 이어붙여 쉼표 제거/공백 정리/"값 없음"→null을 한 번에
+
+    Returns:
+        컬럼마다 (정리된 글자, "-"/빈칸을 null로 바꾼 글자) — 원래 길이대로 잘라서
+    """
+    combined = pa.chunked_array([chunk for col in cols for chunk in col.chunks], type=pa.string())
+    cleaned = pc.utf8_trim_whitespace(pc.replace_substring(combined, ",", ""))
+    nulled = pc.if_else(
+        pc.is_in(cleaned, value_set=pa.array(PLACEHOLDERS)), pa.scalar(None, pa.string()), cleaned
+    )
+    parts, offset = [], 0
+    for col in cols:
+        parts.append((cleaned.slice(offset, len(col)), nulled.slice(offset, len(col))))
+        offset += len(col)
+    return parts
+
+
+def _arrow_numbers(name: str, kind: Optional[str], cleaned: pa.ChunkedArray,
+                   nulled: pa.ChunkedArray, mismatch: dict):
+    """정리된 Arrow 글자 컬럼 → 숫자 컬럼 (바꿀 수 없으면 None)"""
+    if kind is None and pc.any(pc.equal(cleaned, "-")).as_py():
+        return None  # 규칙에 없는 컬럼은 예전처럼 "-"가 있으면 글자로 둠
+    targets = (pa.float64(),) if kind == "float" else (pa.int64(), pa.float64())
+    for target in targets:
+        try:
+            out = pc.cast(nulled, target)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            continue
+        if kind == "int" and target == pa.int64() and out.null_count == 0 and len(out):
+            bounds = pc.min_max(out).as_py()
+            if _INT32.min <= bounds["min"] and bounds["max"] <= _INT32.max:
+                out = pc.cast(out, pa.int32())
+        return out
+    if kind is not None:
+        parsed = pd.to_numeric(nulled.to_pandas(), errors="coerce")
+        mismatch[name] = int(parsed.isna().sum()) - nulled.null_count
+    return None
+
+
+def _arrow_bad_dates(col: pa.ChunkedArray) -> int:
+    text = pc.utf8_trim_whitespace(col)
+    ok = pc.or_(pc.match_substring_regex(text, _DATE_RE.pattern), pc.is_in(text, value_set=pa.array(PLACEHOLDERS)))
+    return len(col) - int(pc.sum(ok).as_py() or 0)
+
+
+def json_records(df: pd.DataFrame) -> list[dict]:
+    """변환된 DataFrame → 행 리스트 ("-"/빈칸에서 나온 NaN은 JSON null로)
+
+    숫자 컬럼의 "-"는 NaN이 되는데, JSONResponse는 NaN을 거부하므로
+    응답으로 내보내는 곳에서는 to_dict 대신 이것을 씁니다.
+    """
+    if df.empty:
+        return []
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+
+class SchemaRegistry:
+    """컬럼 타입 결정 + 한 번에 변환 + 엔드포인트별 스키마 변화 기록"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._drift: dict[str, dict] = {}
+        self._stats = {"frames": 0, "rows": 0, "drift_events": 0, "convert_sec": 0.0}
+
+    def resolve(self, columns, declared: Optional[dict] = None) -> dict[str, Optional[str]]:
+        """컬럼 이름들 → {컬럼: 타입 또는 None(규칙에 없음)}"""
+        return {col: column_type(str(col), declared) for col in columns}
+
+    def apply(self, endpoint_key: str, df: pd.DataFrame, declared: Optional[dict] = None) -> pd.DataFrame:
+        """선언된 타입으로 DataFrame 전체를 한 번에 변환 (원본을 바꿈)"""
+        if df.empty:
+            return df
+        started = time.perf_counter()
+        types = self.resolve(df.columns, declared)
+
+        # 숫자 문자열 컬럼은 모아서 한 번에 변환
+        numeric = [
+            col for col, kind in types.items()
+            if kind in ("int", "float") and df[col].dtype == object
+        ]
+        mismatch: dict[str, int] = {}
+        if numeric:
+            self._convert_numbers(df, numeric, types, mismatch)
+        unknown = [col for col, kind in types.items() if kind is None and df[col].dtype == object]
+        if unknown:
+            self._infer_numbers(df, unknown)
+
+        for col, kind in types.items():
+            if kind == "category":
+                df[col] = df[col].astype("category")
+            elif kind == "date" and df[col].dtype == object:
+                bad = _bad_dates(df[col])
+                if bad:
+                    mismatch[str(col)] = bad
+
+        undeclared = sorted(str(col) for col, kind in types.items() if kind is None)
+        missing = sorted(set(declared or ()) - set(map(str, df.columns)))
+        self._record(endpoint_key, len(df), time.perf_counter() - started, undeclared, missing, mismatch)
+        return df
+
+    def apply_arrow(self, source: str, table: pa.Table, declared: Optional[dict] = None) -> pd.DataFrame:
+        """모든 컬럼을 글자로 읽은 Arrow 표 → 타입을 맞춘 DataFrame
+
+        숫자/카테고리 변환을 Arrow 안에서 끝내고, 글자 컬럼은 Arrow 버퍼를 그대로 쓰는
+        string[pyarrow]로 넘겨요 (파이썬 문자열 객체를 만들지 않음).
+        """
+        started = time.perf_counter()
+        names = [str(name) for name in table.column_names]
+        types = [column_type(name, declared) for name in names]
+        mismatch: dict[str, int] = {}
+        columns = list(table.columns)
+
+        # 숫자 후보(선언된 숫자 + 규칙에 없는 것)는 모아서 한 번에 정리 후 컬럼별 캐스팅
+        numeric = [
+            i for i, (kind, col) in enumerate(zip(types, columns))
+            if kind in ("int", "float", None) and pa.types.is_string(col.type)
+        ]
+        if numeric:
+            cleaned = _arrow_clean([columns[i] for i in numeric])
+            for i, (text, nulled) in zip(numeric, cleaned):
+                numbers = _arrow_numbers(names[i], types[i], text, nulled, mismatch)
+                if numbers is not None:
+                    columns[i] = numbers
+
+        for i, (name, kind, col) in enumerate(zip(names, types, columns)):
+            if not pa.types.is_string(col.type):
+                continue
+            if kind == "category":
+                columns[i] = pc.dictionary_encode(col)
+                continue
+            if kind == "date":
+                bad = _arrow_bad_dates(col)
+                if bad:
+                    mismatch[name] = bad
+            if col.null_count:
+                columns[i] = pc.fill_null(col, "")  # JSON에서 pd.NA가 나오지 않도록
+        df = pa.Table.from_arrays(columns, names=names).to_pandas(
+            types_mapper={pa.string(): pd.StringDtype("pyarrow")}.get, split_blocks=True,
+        )
+        undeclared = sorted(name for name, kind in zip(names, types) if kind is None)
+        missing = sorted(set(declared or ()) - set(names))
+        self._record(source, len(df), time.perf_counter() - started, undeclared, missing, mismatch)
+        return df
+
+    @staticmethod
+    def _convert_numbers(df: pd.DataFrame, columns: list, types: dict, mismatch: dict):
+        """선언된 숫자 컬럼들을 이어붙여 한 번에 변환"""
+        n = len(df)
+        raw = np.concatenate([df[col].to_numpy(dtype=object) for col in columns])
+        values, bad = _parse_numbers(raw)
+        for i, col in enumerate(columns):
+            part = slice(i * n, (i + 1) * n)
+            bad_count = int(bad[part].sum())
+            if bad_count:
+                mismatch[str(col)] = bad_count  # 숫자라더니 글자가 옴 → 원래 값 유지
+                continue
+            col_values = values[part]
+            if types[col] == "int" and _is_integral(col_values):
+                df[col] = _downcast_int(col_values)
+            else:
+                df[col] = col_values
+
+    @staticmethod
+    def _infer_numbers(df: pd.DataFrame, columns: list):
+        """규칙에 없는 컬럼: 예전처럼 전부 숫자로 바뀔 때만 변환"""
+        for col in columns:
+            cleaned = df[col].str.replace(",", "", regex=False).str.strip('"')
+            try:
+                df[col] = pd.to_numeric(cleaned)
+            except (ValueError, TypeError):
+                pass
+
+    def _record(self, endpoint_key: str, rows: int, elapsed: float,
+                undeclared: list, missing: list, mismatch: dict):
+        signature = (tuple(undeclared), tuple(missing), tuple(sorted(mismatch)))
+        with self._lock:
+            self._stats["frames"] += 1
+            self._stats["rows"] += rows
+            self._stats["convert_sec"] += elapsed
+            prev = self._drift.get(endpoint_key)
+            changed = prev is None or prev["signature"] != signature
+            if changed and any(signature):
+                self._stats["drift_events"] += 1
+            self._drift[endpoint_key] = {
+                "signature": signature,
+                "undeclared": undeclared,
+                "missing": missing,
+                "mismatch": mismatch,
+                "rows": rows,
+                "checked_at": time.time(),
+            }
+        if changed and any(signature):
+            logger.warning(
+                f"KRX 스키마 변화 ({endpoint_key}): 규칙 없음 {undeclared}, "
+                f"빠짐 {missing}, 타입 불일치 {mismatch}"
+            )
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "frames": self._stats["frames"],
+                "rows": self._stats["rows"],
+                "convert_sec": round(self._stats["convert_sec"], 3),
+                "drift_events": self._stats["drift_events"],
+                "drift": {
+                    key: {k: v for k, v in d.items() if k != "signature"}
+                    for key, d in sorted(self._drift.items())
+                    if any(d["signature"])
+                },
+            }
+
+
+# 전역 싱글톤
+_registry: Optional[SchemaRegistry] = None
+
+
+def get_schema_registry() -> SchemaRegistry:
+    """KRX 스키마 레지스트리 싱글톤"""
+    global _registry
+    if _registry is None:
+        _registry = SchemaRegistry()
+    return _registry
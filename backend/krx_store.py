@@ -0,0 +1,222 @@
+"""
+KRX 스냅샷 저장소 — 확정된 거래일 데이터를 디스크에 보관
+=========================================================
+이미 끝난 거래일의 전종목 시세/시가총액/외국인 보유 같은 데이터는
+다시는 바뀌지 않아요. 그래서 한 번 받아온 결과를 Parquet 파일로
+저장해두고, 같은 날짜를 다시 물어보면 KRX에 가지 않고 바로 꺼내줍니다.
+
+  마치 지난 신문을 스크랩북에 붙여두는 것처럼 —
+  어제 신문 내용은 바뀌지 않으니 다시 살 필요가 없어요!
+
+저장 구조 (Hive 파티션 방식):
+  {KRX_STORE_DIR}/{format}/{endpoint}/trdDd={YYYYMMDD}/mktId={STK}/{params}.parquet
+
+  - format: krx_schema.FORMAT_VERSION (컬럼 타입 규칙이 바뀌면 새 디렉터리 —
+    옛 형식 스냅샷은 읽지 않고 다시 받음, 필요 없으면 옛 디렉터리는 지워도 됨)
+  - endpoint: KRX_AUTH_ENDPOINTS 키 (예: all_stock_price)
+  - trdDd, mktId: 파티션 디렉터리
+  - 나머지 파라미터(share, money, inqCond 등)는 파일명 해시로 구분
+
+사용법:
+  store = get_snapshot_store()
+  df = store.get("all_stock_price", {"trdDd": "20260312", "mktId": "STK"})
+  store.put("all_stock_price", {"trdDd": "20260312", "mktId": "STK"}, df)
+"""
+
+import hashlib
+import logging
+import os
+import re
+import uuid
+from typing import Optional
+
+import pandas as pd
+
+try:
+    from .krx_calendar import get_calendar
+    from .krx_schema import FORMAT_VERSION
+except ImportError:
+    from krx_calendar import get_calendar
+    from krx_schema import FORMAT_VERSION
+
+logger = logging.getLogger(__name__)
+
+# 저장 위치 (기본: backend/.krx_store)
+STORE_DIR = os.environ.get(
+    "KRX_STORE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".krx_store"),
+)
+
+# 디렉터리 파티션으로 쓰는 파라미터 (나머지는 파일명 해시)
+PARTITION_PARAMS = ("trdDd", "mktId")
+
+# 파티션 값이 없을 때 쓰는 자리표시자 (예: mktId가 없는 etf_price)
+EMPTY_PARTITION = "-"
+
+# 디렉터리 이름이 되는 값의 허용 모양 — "../x" 같은 값이 저장소 밖을 가리키지 못하게
+PARTITION_PATTERNS = {
+    "trdDd": re.compile(r"\d{8}"),
+    "mktId": re.compile(r"[A-Z0-9]{1,8}"),
+}
+_ENDPOINT_RE = re.compile(r"[A-Za-z0-9_]+")
+
+
+def _partition_error(params: dict) -> Optional[str]:
+    """파티션 값이 허용 모양이 아니면 그 이유 (없는 값은 EMPTY_PARTITION이라 통과)"""
+    for name, pattern in PARTITION_PATTERNS.items():
+        value = params.get(name)
+        if value in (None, ""):
+            continue
+        if not pattern.fullmatch(str(value)):
+            return f"{name} 형식 오류: {value!r}"
+    return None
+
+
+def _store_enabled() -> bool:
+    return os.environ.get("KRX_STORE_ENABLED", "1").lower() not in ("0", "false", "no")
+
+
+class SnapshotStore:
+    """확정된 거래일 스냅샷을 Parquet으로 저장/조회
+
+    - 저장 대상: date_param이 "trdDd"인 엔드포인트 중 확정된 날짜
+    - 오늘 날짜는 데이터 확정(18:00) 전까지 값이 바뀌므로 저장하지 않음
+    - 파일은 임시 파일에 쓴 뒤 os.replace로 교체 (반쯤 쓴 파일 방지)
+    """
+
+    def __init__(self, root: str = STORE_DIR, enabled: bool = True):
+        self.root = root
+        self.enabled = enabled
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+
+    # ── 저장 대상 판단 ──
+
+    @staticmethod
+    def is_finalized(trd_dd: str) -> bool:
+        """해당 거래일 데이터가 확정되었는지 (지난 날짜, 또는 18:00 이후 오늘)"""
+        if not trd_dd or len(trd_dd) != 8 or not trd_dd.isdigit():
+            return False
+        return get_calendar().is_finalized(trd_dd)
+
+    def accepts(self, endpoint: dict, params: dict) -> bool:
+        """이 요청 결과를 저장소에서 다룰 수 있는지"""
+        if not self.enabled or endpoint.get("date_param") != "trdDd":
+            return False
+        if _partition_error(params):
+            return False
+        return self.is_finalized(str(params.get("trdDd", "")))
+
+    # ── 경로 계산 ──
+
+    def _path(self, endpoint_key: str, params: dict) -> str:
+        """스냅샷 파일 경로 (엔드포인트/파티션 값이 허용 모양이 아니면 ValueError)"""
+        if not _ENDPOINT_RE.fullmatch(endpoint_key):
+            raise ValueError(f"엔드포인트 이름 형식 오류: {endpoint_key!r}")
+        error = _partition_error(params)
+        if error:
+            raise ValueError(error)
+        parts = [self.root, FORMAT_VERSION, endpoint_key]
+        for name in PARTITION_PARAMS:
+            value = params.get(name)
+            parts.append(f"{name}={value if value not in (None, '') else EMPTY_PARTITION}")
+
+        # 파티션 외 파라미터는 정렬 후 해시 → 같은 조합이면 같은 파일
+        rest = sorted(
+            (k, str(v)) for k, v in params.items()
+            if k not in PARTITION_PARAMS and k != "locale"
+        )
+        if rest:
+            digest = hashlib.sha1(
+                "&".join(f"{k}={v}" for k, v in rest).encode("utf-8")
+            ).hexdigest()[:16]
+            filename = f"{digest}.parquet"
+        else:
+            filename = "data.parquet"
+        path = os.path.join(*parts, filename)
+
+        # 심볼릭 링크까지 풀어서 저장소 안인지 한 번 더 확인
+        root = os.path.realpath(self.root)
+        if os.path.commonpath([root, os.path.realpath(path)]) != root:
+            raise ValueError(f"저장소 밖 경로: {path}")
+        return path
+
+    def _checked_path(self, endpoint_key: str, params: dict) -> Optional[str]:
+        try:
+            return self._path(endpoint_key, params)
+        except ValueError as e:
+            logger.warning(f"스냅샷 경로 거부 ({endpoint_key}): {e}")
+            return None
+
+    # ── 조회/저장 ──
+
+    def get(self, endpoint_key: str, params: dict) -> Optional[pd.DataFrame]:
+        """저장된 스냅샷을 읽음. 없거나 읽기 실패 시 None"""
+        path = self._checked_path(endpoint_key, params)
+        if path is None or not os.path.exists(path):
+            self._misses += 1
+            return None
+        try:
+            df = pd.read_parquet(path)
+        except Exception as e:
+            # 깨진 파일은 지우고 다시 받도록
+            logger.warning(f"스냅샷 읽기 실패 — 삭제 후 재수집 ({path}): {e}")
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self._misses += 1
+            return None
+        self._hits += 1
+        logger.debug(f"스냅샷 적중 ({endpoint_key}): {path}")
+        return df
+
+    def has(self, endpoint_key: str, params: dict) -> bool:
+        path = self._checked_path(endpoint_key, params)
+        return path is not None and os.path.exists(path)
+
+    def put(self, endpoint_key: str, params: dict, df: pd.DataFrame) -> bool:
+        """스냅샷 저장 (빈 DataFrame은 저장하지 않음)"""
+        if df is None or df.empty:
+            return False
+        path = self._checked_path(endpoint_key, params)
+        if path is None:
+            return False
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            df.to_parquet(tmp, index=False)
+            os.replace(tmp, path)
+        except Exception as e:
+            logger.warning(f"스냅샷 저장 실패 ({endpoint_key}): {e}")
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return False
+        self._writes += 1
+        logger.info(f"스냅샷 저장 ({endpoint_key}): {len(df)}행 → {path}")
+        return True
+
+    def status(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "root": self.root,
+            "format": FORMAT_VERSION,
+            "hits": self._hits,
+            "misses": self._misses,
+            "writes": self._writes,
+        }
+
+
+# 전역 싱글톤
+_store: Optional[SnapshotStore] = None
+
+
+def get_snapshot_store() -> SnapshotStore:
+    """스냅샷 저장소 싱글톤"""
+    global _store
+    if _store is None:
+        _store = SnapshotStore(STORE_DIR, enabled=_store_enabled())
+    return _store
@@ -0,0 +1,414 @@
+"""
+KRX 종목 마스터 — 종목코드 / ISIN / 종목명 / 시장 / 업종 한 번에 찾기
+=====================================================================
+종목 이름을 찾을 때마다 pykrx.get_market_ticker_name()을 한 종목씩
+부르면, 전종목 표(2,700행)를 만들 때 2,700번 조회가 일어납니다.
+
+종목 마스터는 (초등학생 설명):
+  1. 하루에 한 번 all_stock_price / etf_price / etn_price / elw_price 전종목 표를 받아서
+  2. "종목코드 → 이름", "ISIN → 종목코드", "이름 → 종목코드" 사전을 만들어두고
+  3. 이름이 필요하면 사전에서 바로 꺼내줍니다 (O(1))
+  4. 표 전체에 이름을 붙일 때는 한 번의 merge로 끝!
+
+  마치 반 아이들 이름표를 매번 물어보는 대신 출석부를 한 장 받아두는 것처럼!
+
+규칙:
+  - 날짜가 바뀌면 다음 조회 때 백그라운드에서 새로 만듦 (그동안은 이전 마스터 사용)
+  - 마스터를 만들지 못했거나 모르는 종목이면 pykrx로 개별 조회 (fallback)
+  - KRX 숫자 변환으로 "005930"이 5930이 되어도 6자리로 되돌려서 비교
+
+사용법:
+  symbols = get_symbol_master()
+  symbols.name_of("005930")            # "삼성전자"
+  symbols.isin_of("005930")            # "KR7005930003"
+  symbols.resolve("삼성전자")           # "005930"
+  symbols.resolve("삼성전자", wait=False)  # async 핸들러에서 (마스터가 없으면 기다리지 않고 None)
+  df = symbols.attach(df, code_col="종목코드", columns={"name": "종목명"})
+"""
+
+import bisect
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .krx_auth import get_krx_auth
+    from .krx_calendar import KST, get_calendar
+except ImportError:
+    from krx_auth import get_krx_auth
+    from krx_calendar import KST, get_calendar
+
+logger = logging.getLogger(__name__)
+
+# 마스터 구성에 쓰는 KRX 전종목 표
+#   (엔드포인트 키, mktId, 시장 이름, 종류)
+SOURCES = [
+    ("all_stock_price", "STK", "KOSPI", "stock"),
+    ("all_stock_price", "KSQ", "KOSDAQ", "stock"),
+    ("all_stock_price", "KNX", "KONEX", "stock"),
+    ("etf_price", None, "ETF", "etf"),
+    ("etn_price", None, "ETN", "etn"),
+    ("elw_price", None, "ELW", "elw"),   # 단축코드가 ISU_CD에 옴 (ISIN 없음)
+]
+
+# 업종(sector)은 업종분류 표에서 가져옴
+SECTOR_MARKETS = ("STK", "KSQ")
+
+# 최근 거래일을 찾을 때 거슬러 올라갈 최대 거래일 수
+LOOKBACK_DAYS = 5
+
+# 마스터 생성 실패 후 재시도까지 대기 (초)
+RETRY_INTERVAL = int(os.environ.get("KRX_SYMBOLS_RETRY_SEC", "600"))
+
+# 모르는 종목을 pykrx로 개별 조회할 최대 개수 (attach 한 번당)
+FALLBACK_LIMIT = 100
+
+COLUMNS = ["code", "isin", "name", "market", "kind", "sector"]
+
+
+def normalize_code(value) -> str:
+    """종목코드를 6자리 문자열로 (5930 → "005930", "A005930" → "005930")"""
+    if value is None:
+        return ""
+    if isinstance(value, (int, np.integer)):
+        return f"{int(value):06d}"
+    if isinstance(value, (float, np.floating)):
+        return "" if np.isnan(value) else f"{int(value):06d}"
+    text = str(value).strip()
+    if len(text) == 7 and text[0] == "A":
+        text = text[1:]
+    return text.zfill(6)
+
+
+def normalize_codes(series: pd.Series) -> pd.Series:
+    """종목코드 컬럼 전체를 한 번에 6자리 문자열로"""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype("Int64").astype(str).str.zfill(6)
+    text = series.astype(str).str.strip()
+    text = text.str.replace(r"^A(?=\w{6}$)", "", regex=True)
+    return text.str.zfill(6)
+
+
+def _name_key(name: str) -> str:
+    """이름 비교용 키 (대소문자, 공백 무시)"""
+    return "".join(str(name).split()).upper()
+
+
+def _candidate_days() -> list[str]:
+    """오늘(또는 직전 거래일)부터 거슬러 올라가는 거래일 목록 (최신 순)"""
+    return get_calendar().previous_trading_days(LOOKBACK_DAYS)[::-1]
+
+
+class _Index:
+    """한 시점의 종목 마스터 (만든 뒤에는 바뀌지 않음 → 잠금 없이 읽기)"""
+
+    def __init__(self, frame: pd.DataFrame, trd_dd: str):
+        self.trd_dd = trd_dd
+        self.built_at = time.time()
+        self.frame = frame.reset_index(drop=True)
+
+        codes = self.frame["code"].tolist()
+        self.by_code: dict[str, int] = {c: i for i, c in enumerate(codes)}
+        self.by_isin: dict[str, str] = {
+            isin: code for isin, code in zip(self.frame["isin"], codes) if isin
+        }
+        self.by_name: dict[str, str] = {}
+        for name, code in zip(self.frame["name"], codes):
+            self.by_name.setdefault(_name_key(name), code)
+
+        # 정렬 배열 (접두어 검색용)
+        self.sorted_codes = np.array(sorted(codes))
+        self.sorted_names = sorted(self.by_name)
+
+        # 벡터화 join용 (code를 인덱스로)
+        self.table = self.frame.set_index("code")
+
+
+class SymbolMaster:
+    """하루 한 번 갱신되는 종목 마스터 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index: Optional[_Index] = None
+        self._built_for = ""        # 마스터를 만든 '달력 날짜' (KST)
+        self._refreshing = False
+        self._last_failure = 0.0
+        self._fallback_lookups = 0
+
+    # ── 생성/갱신 ──
+
+    def _build(self) -> Optional[_Index]:
+        auth = get_krx_auth()
+        for trd_dd in _candidate_days():
+            frames = []
+            for endpoint_key, mkt_id, market, kind in SOURCES:
+                params = {"trdDd": trd_dd}
+                if mkt_id:
+                    params["mktId"] = mkt_id
+                df = auth.fetch(endpoint_key, **params)
+                if df.empty or "ISU_ABBRV" not in df.columns:
+                    continue
+                if "ISU_SRT_CD" in df.columns:
+                    codes = normalize_codes(df["ISU_SRT_CD"])
+                    isins = df["ISU_CD"].astype(str) if "ISU_CD" in df.columns else ""
+                elif "ISU_CD" in df.columns:
+                    codes, isins = normalize_codes(df["ISU_CD"]), ""
+                else:
+                    continue
+                part = pd.DataFrame({
+                    "code": codes,
+                    "isin": isins,
+                    "name": df["ISU_ABBRV"].astype(str).str.strip(),
+                    "market": market,
+                    "kind": kind,
+                })
+                frames.append(part)
+            if not frames:
+                continue  # 아직 데이터 없음 (장 시작 전 등) → 직전 거래일로
+
+            frame = pd.concat(frames, ignore_index=True)
+            frame = frame.drop_duplicates("code", keep="first")
+            frame["sector"] = frame["code"].map(self._sectors(auth, trd_dd)).fillna("")
+            logger.info(f"종목 마스터 생성 ({trd_dd}): {len(frame)}종목")
+            return _Index(frame[COLUMNS], trd_dd)
+        return None
+
+    @staticmethod
+    def _sectors(auth, trd_dd: str) -> pd.Series:
+        """종목코드 → 업종명 (업종분류 표, 실패해도 빈 값)"""
+        parts = []
+        for mkt_id in SECTOR_MARKETS:
+            df = auth.fetch("sector_price", trdDd=trd_dd, mktId=mkt_id)
+            if df.empty or "IDX_IND_NM" not in df.columns:
+                continue
+            parts.append(pd.Series(
+                df["IDX_IND_NM"].astype(str).values,
+                index=normalize_codes(df["ISU_SRT_CD"]).values,
+            ))
+        if not parts:
+            return pd.Series(dtype=object)
+        sectors = pd.concat(parts)
+        return sectors[~sectors.index.duplicated()]
+
+    def _refresh(self, today: str):
+        try:
+            index = self._build()
+        except Exception as e:
+            logger.warning(f"종목 마스터 생성 실패: {e}")
+            index = None
+        with self._lock:
+            self._refreshing = False
+            if index is not None:
+                self._index = index
+                self._built_for = today
+            else:
+                self._last_failure = time.time()
+
+    def _ensure(self, wait: bool = True) -> Optional[_Index]:
+        """오늘 마스터가 없으면 만듦
+
+        처음 한 번은 만들어질 때까지 기다리고, 이후 날짜가 바뀐 갱신은
+        백그라운드에서 진행하면서 이전 마스터를 계속 사용합니다.
+
+        Args:
+            wait: False면 처음 만들 때도 기다리지 않음 (이벤트 루프에서 부를 때 —
+                  KRX 전종목 표 수십 번 조회를 막지 않도록 백그라운드로 만들고 None)
+        """
+        today = datetime.now(KST).strftime("%Y%m%d")
+        with self._lock:
+            index = self._index
+            if self._built_for == today or self._refreshing:
+                return index
+            if time.time() - self._last_failure < RETRY_INTERVAL:
+                return index
+            self._refreshing = True
+
+        if index is None and wait:
+            self._refresh(today)
+            return self._index
+
+        threading.Thread(
+            target=self._refresh, args=(today,), name="krx-symbols-refresh", daemon=True
+        ).start()
+        return index
+
+    def refresh(self) -> bool:
+        """강제로 다시 생성 (성공 여부 반환)"""
+        today = datetime.now(KST).strftime("%Y%m%d")
+        with self._lock:
+            if self._refreshing:
+                return False
+            self._refreshing = True
+        self._refresh(today)
+        return self._built_for == today
+
+    # ── 개별 조회 ──
+
+    def get(self, code) -> Optional[dict]:
+        """종목코드 → {code, isin, name, market, kind, sector}"""
+        index = self._ensure()
+        if index is None:
+            return None
+        pos = index.by_code.get(normalize_code(code))
+        if pos is None:
+            return None
+        return index.frame.iloc[pos].to_dict()
+
+    def name_of(self, code, kind: str = "stock") -> str:
+        """종목코드 → 종목명 (모르면 pykrx로 조회)"""
+        code = normalize_code(code)
+        index = self._ensure()
+        if index is not None:
+            pos = index.by_code.get(code)
+            if pos is not None:
+                return index.frame.at[pos, "name"]
+        return self._fallback_name(code, kind)
+
+    def isin_of(self, code, wait: bool = True) -> str:
+        """종목코드 → ISIN (모르면 보통주 규칙 KR7{code}003으로 추정)"""
+        code = normalize_code(code)
+        index = self._ensure(wait)
+        if index is not None:
+            pos = index.by_code.get(code)
+            if pos is not None and index.frame.at[pos, "isin"]:
+                return index.frame.at[pos, "isin"]
+        return f"KR7{code}003"
+
+    def resolve(self, value, wait: bool = True) -> Optional[str]:
+        """종목코드 / ISIN / 종목명 중 무엇이든 → 6자리 종목코드
+
+        wait=False: 마스터가 아직 없으면 만들기를 기다리지 않음 (6자리 코드만 인식)
+        """
+        text = str(value).strip()
+        if not text:
+            return None
+        index = self._ensure(wait)
+        if index is None:
+            return normalize_code(text) if text.isdigit() else None
+        if len(text) == 12 and text[:2].isalpha():
+            return index.by_isin.get(text.upper())
+        code = normalize_code(text)
+        if code in index.by_code:
+            return code
+        return index.by_name.get(_name_key(text))
+
+    def search(self, prefix: str, limit: int = 20) -> list[dict]:
+        """종목명 또는 종목코드 접두어 검색 (정렬 배열 + 이진 탐색)"""
+        index = self._ensure()
+        if index is None or not prefix:
+            return []
+        key = _name_key(prefix)
+        codes: list[str] = []
+
+        lo = bisect.bisect_left(index.sorted_names, key)
+        for name in index.sorted_names[lo:]:
+            if not name.startswith(key) or len(codes) >= limit:
+                break
+            codes.append(index.by_name[name])
+
+        if prefix.isdigit() and len(codes) < limit:
+            lo = int(np.searchsorted(index.sorted_codes, prefix, side="left"))
+            for code in index.sorted_codes[lo:]:
+                if not code.startswith(prefix) or len(codes) >= limit:
+                    break
+                if code not in codes:
+                    codes.append(str(code))
+
+        return [index.frame.iloc[index.by_code[c]].to_dict() for c in codes]
+
+    # ── 표 단위 조회 ──
+
+    def attach(
+        self,
+        df: pd.DataFrame,
+        code_col: str = "종목코드",
+        columns: Optional[dict[str, str]] = None,
+        kind: str = "stock",
+    ) -> pd.DataFrame:
+        """df의 종목코드 컬럼으로 마스터 정보를 한 번에 붙임
+
+        Args:
+            df: 종목코드 컬럼이 있는 DataFrame
+            code_col: 종목코드 컬럼명
+            columns: {마스터 필드: 새 컬럼명} (기본 {"name": "종목명"})
+            kind: fallback 조회 시 종류 (stock/etf/etn/elw)
+
+        Returns:
+            컬럼이 추가된 새 DataFrame
+        """
+        columns = columns or {"name": "종목명"}
+        out = df.copy()
+        if out.empty or code_col not in out.columns:
+            return out
+
+        codes = normalize_codes(out[code_col])
+        index = self._ensure()
+        for field, target in columns.items():
+            if index is not None:
+                out[target] = codes.map(index.table[field]).values
+            else:
+                out[target] = None
+
+        # 마스터에 없는 종목 이름만 pykrx로 채움 (고유 코드 기준)
+        if "name" in columns:
+            target = columns["name"]
+            missing = out[target].isna()
+            if missing.any():
+                unique = codes[missing].unique()[:FALLBACK_LIMIT]
+                names = {c: self._fallback_name(c, kind) for c in unique}
+                out.loc[missing, target] = codes[missing].map(names).values
+        return out
+
+    def frame(self) -> pd.DataFrame:
+        """마스터 전체 표 (복사본)"""
+        index = self._ensure()
+        if index is None:
+            return pd.DataFrame(columns=COLUMNS)
+        return index.frame.copy()
+
+    # ── fallback ──
+
+    def _fallback_name(self, code: str, kind: str) -> str:
+        try:
+            from pykrx import stock
+            lookup = {
+                "etf": stock.get_etf_ticker_name,
+                "etn": stock.get_etn_ticker_name,
+                "elw": stock.get_elw_ticker_name,
+            }.get(kind, stock.get_market_ticker_name)
+            name = lookup(code)
+        except Exception as e:
+            logger.debug(f"pykrx 종목명 조회 실패 ({code}): {e}")
+            return ""
+        self._fallback_lookups += 1
+        return name if isinstance(name, str) else ""
+
+    def status(self) -> dict:
+        index = self._index
+        return {
+            "loaded": index is not None,
+            "trade_date": index.trd_dd if index else None,
+            "symbols": len(index.frame) if index else 0,
+            "by_kind": index.frame["kind"].value_counts().to_dict() if index else {},
+            "built_for": self._built_for or None,
+            "refreshing": self._refreshing,
+            "fallback_lookups": self._fallback_lookups,
+        }
+
+
+# 전역 싱글톤
+_master: Optional[SymbolMaster] = None
+
+
+def get_symbol_master() -> SymbolMaster:
+    """종목 마스터 싱글톤"""
+    global _master
+    if _master is None:
+        _master = SymbolMaster()
+    return _master
@@ -0,0 +1,252 @@
+"""
+KRX 캐시 워머 — 장 마감 후 전종목 데이터를 미리 받아두기
+========================================================
+16시 이후 첫 사용자는 all_stock_price, market_cap, foreign_holding 같은
+전종목 데이터를 KRX에서 처음 받아오느라 몇 초씩 기다려야 했어요.
+
+캐시 워머는 (초등학생 설명):
+  1. 거래일마다 정해진 시각(기본 16:00, 18:05 KST)에 깨어나서
+  2. 날짜 하나로 조회하는 엔드포인트(date_param == "trdDd")를
+     코스피(STK)·코스닥(KSQ) 모두 미리 받아두고
+  3. 인메모리 캐시와 스냅샷 저장소를 채워둡니다
+  → 사용자가 올 때는 이미 준비 완료!
+
+  - 16:00 실행: 장 마감 직후 값으로 캐시를 채움
+  - 18:05 실행: 데이터 확정(18:00) 후 최종 값으로 캐시 + 스냅샷 저장
+  - 동시 요청 수는 KRX_WARM_CONCURRENCY(기본 3)로 제한
+
+사용법:
+  warmer = get_cache_warmer()
+  warmer.start()          # main.py lifespan에서 호출
+  warmer.run_now()        # 수동 실행 (백그라운드)
+  warmer.status()
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, time as dtime
+from typing import Optional
+
+try:
+    from .krx_auth import get_krx_auth, KRX_AUTH_ENDPOINTS
+    from .krx_calendar import KST, get_calendar
+    from .krx_store import get_snapshot_store
+except ImportError:
+    from krx_auth import get_krx_auth, KRX_AUTH_ENDPOINTS
+    from krx_calendar import KST, get_calendar
+    from krx_store import get_snapshot_store
+
+logger = logging.getLogger(__name__)
+
+WARM_ENABLED = os.environ.get("KRX_WARM_ENABLED", "1").lower() not in ("0", "false", "no")
+
+# 실행 시각 (KST, 쉼표 구분)
+WARM_TIMES = [
+    dtime(*map(int, t.split(":")))
+    for t in os.environ.get("KRX_WARM_TIMES", "16:00,18:05").split(",")
+    if t.strip()
+]
+
+# 동시 요청 수
+WARM_CONCURRENCY = int(os.environ.get("KRX_WARM_CONCURRENCY", "3"))
+
+# 시장별로 나눠 받는 엔드포인트의 대상 시장
+WARM_MARKETS = ("STK", "KSQ")
+
+
+def warm_jobs() -> list[tuple[str, dict]]:
+    """워밍 대상 (엔드포인트 키, 파라미터) 목록 — trdDd는 실행 시 채움"""
+    jobs = []
+    for key, ep in KRX_AUTH_ENDPOINTS.items():
+        if ep.get("date_param") != "trdDd":
+            continue
+        if "mktId" in ep["default_params"]:
+            jobs.extend((key, {"mktId": mkt}) for mkt in WARM_MARKETS)
+        else:
+            jobs.append((key, {}))
+    return jobs
+
+
+class CacheWarmer:
+    """거래일 장 마감 후 정해진 시각에 point-in-time 엔드포인트를 미리 수집"""
+
+    def __init__(self, times: list[dtime] = WARM_TIMES, concurrency: int = WARM_CONCURRENCY):
+        self.times = sorted(times)
+        self.concurrency = max(1, concurrency)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._next_run: Optional[datetime] = None
+        self._progress: dict = {}
+        self._last_run: Optional[dict] = None
+        self._runs = 0
+
+    # ── 스케줄 ──
+
+    def next_run_after(self, now: datetime) -> Optional[datetime]:
+        """now 이후 첫 실행 시각 (거래일의 WARM_TIMES 중)"""
+        if not self.times:
+            return None
+        cal = get_calendar()
+        day = cal.nearest_trading_day(now, prev=False)
+        # 오늘 실행 시각이 모두 지났으면 다음 거래일 첫 실행 시각
+        for _ in range(2):
+            if day is None:
+                return None
+            for t in self.times:
+                at = datetime.combine(datetime.strptime(day, "%Y%m%d").date(), t, tzinfo=KST)
+                if at > now:
+                    return at
+            day = cal.next_trading_day(day)
+        return None
+
+    def start(self):
+        """스케줄러 스레드 시작 (이미 실행 중이면 무시)"""
+        if not WARM_ENABLED:
+            logger.info("캐시 워머 비활성화 (KRX_WARM_ENABLED=0)")
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="krx-cache-warmer", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            next_run = self.next_run_after(datetime.now(KST))
+            self._next_run = next_run
+            if next_run is None:
+                logger.warning("캐시 워머: 다음 실행 시각을 찾지 못함 — 종료")
+                return
+            logger.info(f"캐시 워머 다음 실행: {next_run:%Y-%m-%d %H:%M} KST")
+            # 시계가 바뀌어도 너무 늦지 않게 최대 10분 단위로 깨어나서 다시 확인
+            while not self._stop.is_set():
+                remaining = (next_run - datetime.now(KST)).total_seconds()
+                if remaining <= 0:
+                    break
+                self._stop.wait(min(remaining, 600))
+            if self._stop.is_set():
+                return
+            self.run(next_run.strftime("%Y%m%d"))
+
+    # ── 실행 ──
+
+    def run_now(self, trd_dd: Optional[str] = None) -> bool:
+        """수동 실행 (백그라운드). 이미 실행 중이면 False"""
+        with self._lock:
+            if self._running:
+                return False
+        threading.Thread(
+            target=self.run, args=(trd_dd,), name="krx-cache-warmer-manual", daemon=True
+        ).start()
+        return True
+
+    def run(self, trd_dd: Optional[str] = None) -> Optional[dict]:
+        """trd_dd(기본: 최근 거래일)의 워밍 대상을 모두 수집"""
+        trd_dd = trd_dd or get_calendar().latest_trading_day()
+        jobs = warm_jobs()
+        with self._lock:
+            if self._running:
+                return None
+            self._running = True
+            self._progress = {
+                "trade_date": trd_dd, "total": len(jobs), "done": 0,
+                "failed": 0, "empty": 0, "skipped": 0, "started_at": time.time(),
+            }
+
+        auth = get_krx_auth()
+        store = get_snapshot_store()
+        started = time.time()
+        timings: list[dict] = []
+        rows = 0
+
+        def warm(endpoint_key: str, params: dict) -> tuple[int, float]:
+            t0 = time.time()
+            df = auth.refresh(endpoint_key, **params)
+            return len(df), time.time() - t0
+
+        logger.info(f"캐시 워밍 시작 ({trd_dd}): {len(jobs)}건, 동시 {self.concurrency}")
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="krx-warm") as pool:
+            futures = {}
+            for endpoint_key, extra in jobs:
+                params = {"trdDd": trd_dd, **extra}
+                ep = KRX_AUTH_ENDPOINTS[endpoint_key]
+                merged = {**ep["default_params"], **params}
+                # 이미 확정 스냅샷이 있으면 다시 받을 필요 없음
+                if store.accepts(ep, merged) and store.has(endpoint_key, merged):
+                    self._bump("skipped")
+                    continue
+                futures[pool.submit(warm, endpoint_key, params)] = (endpoint_key, extra.get("mktId"))
+
+            for future in as_completed(futures):
+                endpoint_key, mkt = futures[future]
+                try:
+                    n, elapsed = future.result()
+                except Exception as e:
+                    logger.warning(f"캐시 워밍 실패 ({endpoint_key} {mkt or ''}): {e}")
+                    self._bump("failed")
+                    continue
+                rows += n
+                timings.append({
+                    "endpoint": endpoint_key, "market": mkt,
+                    "rows": n, "sec": round(elapsed, 2),
+                })
+                self._bump("done" if n else "empty")
+
+        result = {
+            **self._progress,
+            "finished_at": time.time(),
+            "duration_sec": round(time.time() - started, 1),
+            "rows": rows,
+            "slowest": sorted(timings, key=lambda t: t["sec"], reverse=True)[:10],
+            "empty_jobs": sorted(f"{t['endpoint']}:{t['market'] or '-'}" for t in timings if not t["rows"]),
+        }
+        with self._lock:
+            self._running = False
+            self._last_run = result
+            self._runs += 1
+        logger.info(
+            f"캐시 워밍 완료 ({trd_dd}): 성공 {result['done']}, 빈 응답 {result['empty']}, "
+            f"실패 {result['failed']}, "
+            f"생략 {result['skipped']}, {rows}행, {result['duration_sec']}초"
+        )
+        return result
+
+    def _bump(self, name: str):
+        with self._lock:
+            self._progress[name] += 1
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": WARM_ENABLED,
+                "scheduler_alive": bool(self._thread and self._thread.is_alive()),
+                "times": [t.strftime("%H:%M") for t in self.times],
+                "concurrency": self.concurrency,
+                "jobs": len(warm_jobs()),
+                "running": self._running,
+                "next_run": self._next_run.isoformat() if self._next_run else None,
+                "progress": dict(self._progress) if self._running else None,
+                "last_run": self._last_run,
+                "runs": self._runs,
+            }
+
+
+# 전역 싱글톤
+_warmer: Optional[CacheWarmer] = None
+
+
+def get_cache_warmer() -> CacheWarmer:
+    """캐시 워머 싱글톤"""
+    global _warmer
+    if _warmer is None:
+        _warmer = CacheWarmer()
+    return _warmer
@@ -9,7 +9,9 @@ KRX Data Explorer 백엔드 서버
 
 import datetime
 import logging
-import time
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from typing import Optional
 
@@ -20,15 +22,24 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
 from pykrx import stock, bond
+from pykrx.website import krx as pykrx_krx
 
 from proxy_rotator import init_proxy_rotation, get_proxy_status
 from krx_direct import get_krx_fetcher, krx_direct_status, KRX_OUT_ENDPOINTS
 from krx_auth import get_krx_auth, KRX_AUTH_ENDPOINTS
+from krx_symbols import get_symbol_master, normalize_codes
+from krx_calendar import get_calendar
+from krx_fundamentals import get_fundamentals
+from krx_warmer import get_cache_warmer
+from krx_backfill import BackfillJob, DEFAULT_MARKETS, get_backfill_manager
+from rate_limiter import get_rate_limiter
+from adaptive_concurrency import get_adaptive_concurrency
+from session_refresher import get_session_refresher
 import naver_finance as nf
 
 # ============================================================================
 # 주요 종목 리스트 (KRX ticker_list API 깨진 상태 대비용)
-# get_market_ticker_name()은 정상 작동하므로 이름 조회는 가능
+# 종목명 조회는 종목 마스터(krx_symbols)가 담당
 # ============================================================================
 
 MAJOR_TICKERS = {
@@ -50,6 +61,12 @@ MAJOR_TICKERS = {
     ],
 }
 
+# KRX 시장 ID (전종목 시세 스냅샷 조회용)
+KRX_MARKET_IDS = {"KOSPI": "STK", "KOSDAQ": "KSQ"}
+
+# all-markets 대체 경로(네이버 종목별 조회)의 동시 요청 수
+ALL_MARKETS_CONCURRENCY = int(os.environ.get("KRX_ALL_MARKETS_CONCURRENCY", "8"))
+
 
 # ============================================================================
 # 로깅 설정
@@ -74,10 +91,10 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"프록시 초기화 실패 (직접 연결 사용): {e}")
 
-    # KRX outerLoader 직접 수집기 초기화 (세션 미리 생성)
+    # KRX outerLoader 직접 수집기 초기화 (세션 하나 미리 생성, 나머지는 백그라운드)
     try:
         fetcher = get_krx_fetcher()
-        fetcher._ensure_session()
+        fetcher.pool.get()
         logger.info("KRX 직접 수집기 초기화 완료 (outerLoader 세션)")
     except Exception as e:
         logger.warning(f"KRX 직접 수집기 초기화 실패: {e}")
@@ -87,13 +104,29 @@ async def lifespan(app: FastAPI):
         auth = get_krx_auth()
         session = auth.get_authenticated_session()
         if session:
-            logger.info(f"KRX ID/PW 로그인 성공 (MBR_NO={auth._member_no})")
+            logger.info(f"KRX ID/PW 로그인 성공 (세션 풀 {auth.pool.size}개 계정)")
         else:
             logger.warning("KRX ID/PW 로그인 실패 — 인증 데이터 사용 불가")
     except Exception as e:
         logger.warning(f"KRX 로그인 초기화 실패: {e}")
 
+    # 종목 마스터 미리 생성 (첫 요청이 기다리지 않도록 백그라운드)
+    threading.Thread(
+        target=get_symbol_master().refresh, name="krx-symbols-init", daemon=True
+    ).start()
+
+    # KRX 세션을 만료 전에 백그라운드에서 교체 (요청이 로그인을 기다리지 않도록)
+    refresher = get_session_refresher()
+    refresher.register("krx_auth", get_krx_auth().pool)
+    refresher.register("krx_direct", get_krx_fetcher().pool)
+    refresher.start()
+
+    # 장 마감 후 캐시 워밍 스케줄러
+    get_cache_warmer().start()
+
     yield
+    get_cache_warmer().stop()
+    refresher.stop()
     logger.info("=== 백엔드 종료 ===")
 
 
@@ -124,14 +157,8 @@ def today_str() -> str:
 
 
 def business_day_str(days_ago: int = 0) -> str:
-    """최근 영업일 (주말/공휴일 건너뛰기는 간단히 처리)"""
-    d = datetime.date.today() - datetime.timedelta(days=days_ago)
-    # 토요일→금요일, 일요일→금요일
-    if d.weekday() == 5:
-        d -= datetime.timedelta(days=1)
-    elif d.weekday() == 6:
-        d -= datetime.timedelta(days=2)
-    return d.strftime("%Y%m%d")
+    """최근 영업일 — days_ago일 전 날짜가 휴장일(주말/공휴일)이면 직전 거래일"""
+    return get_calendar().latest_trading_day(days_ago)
 
 
 def df_to_records(df: pd.DataFrame) -> list[dict]:
@@ -160,13 +187,15 @@ def df_to_records(df: pd.DataFrame) -> list[dict]:
 
 
 def safe_pykrx_call(func, *args, **kwargs):
-    """PyKRX 호출을 안전하게 감싸기 (에러 시 빈 DataFrame 반환)"""
+    """PyKRX 호출을 안전하게 감싸기 (에러 시 빈 DataFrame 반환)
+
+    IP 차단 방지는 프록시 패치의 호스트별 속도 제한이 담당 (고정 sleep 없음)
+    """
     try:
         logger.info(f"PyKRX 호출: {func.__name__}(args={args}, kwargs={kwargs})")
         result = func(*args, **kwargs)
         if isinstance(result, pd.DataFrame):
             logger.info(f"PyKRX 결과: {func.__name__} -> {len(result)}행, cols={list(result.columns)}")
-        time.sleep(0.5)  # IP 차단 방지용 최소 딜레이
         return result
     except Exception as e:
         logger.error(f"PyKRX 호출 실패 ({func.__name__}): {e}", exc_info=True)
@@ -251,7 +280,7 @@ def get_stock_ohlcv(
     df = safe_pykrx_call(
         stock.get_market_ohlcv_by_date, start, end, ticker, freq=freq, adjusted=adjusted
     )
-    name = stock.get_market_ticker_name(ticker)
+    name = get_symbol_master().name_of(ticker)
 
     return {
         "ticker": ticker,
@@ -268,6 +297,75 @@ def get_stock_ohlcv(
 # 3. 전체 시장 데이터 (특정일 전 종목)
 # ─────────────────────────────────────────────────────────
 
+def _all_markets_from_snapshot(mkt: str, tickers: list[str]) -> Optional[list[dict]]:
+    """전종목 시세 스냅샷 한 번으로 주요 종목 행을 골라냄 (실패 시 None)"""
+    mkt_id = KRX_MARKET_IDS.get(mkt)
+    if not mkt_id or not tickers:
+        return None
+    auth = get_krx_auth()
+    day = business_day_str(0)
+    df = auth.fetch("all_stock_price", trdDd=day, mktId=mkt_id)
+    if df.empty:
+        # 장 시작 전 등 오늘 데이터가 아직 없으면 직전 거래일
+        day = get_calendar().prev_trading_day(day)
+        df = auth.fetch("all_stock_price", trdDd=day, mktId=mkt_id)
+    if df.empty or "ISU_SRT_CD" not in df.columns:
+        return None
+
+    df = df.set_index(normalize_codes(df["ISU_SRT_CD"]))
+    df = df[~df.index.duplicated()].reindex([t for t in tickers if t in df.index])
+    num = {
+        col: pd.to_numeric(df[col], errors="coerce").fillna(0)
+        for col in ("TDD_CLSPRC", "TDD_OPNPRC", "TDD_HGPRC", "TDD_LWPRC", "ACC_TRDVOL", "FLUC_RT")
+    }
+    base_date = f"{day[:4]}-{day[4:6]}-{day[6:]}"
+    return [
+        {
+            "종목코드": code,
+            "종목명": df.at[code, "ISU_ABBRV"],
+            "시장": mkt,
+            "종가": int(num["TDD_CLSPRC"][code]),
+            "시가": int(num["TDD_OPNPRC"][code]),
+            "고가": int(num["TDD_HGPRC"][code]),
+            "저가": int(num["TDD_LWPRC"][code]),
+            "거래량": int(num["ACC_TRDVOL"][code]),
+            "등락률": round(float(num["FLUC_RT"][code]), 2),
+            "기준일": base_date,
+        }
+        for code in df.index
+    ]
+
+
+def _all_markets_from_naver(mkt: str, tickers: list[str], start: str, end: str) -> list[dict]:
+    """종목별 네이버 OHLCV를 동시에 조회 (속도는 호스트별 제한기가 조절)"""
+
+    def one(t: str) -> Optional[dict]:
+        try:
+            df = nf.get_ohlcv(t, start, end)
+            if df.empty:
+                return None
+            last = df.iloc[-1]
+            change = last["등락률"]
+            return {
+                "종목코드": t,
+                "종목명": get_symbol_master().name_of(t),
+                "시장": mkt,
+                "종가": int(last["종가"]),
+                "시가": int(last["시가"]),
+                "고가": int(last["고가"]),
+                "저가": int(last["저가"]),
+                "거래량": int(last["거래량"]),
+                "등락률": round(float(change), 2) if pd.notna(change) else 0.0,
+                "기준일": df.index[-1].strftime("%Y-%m-%d"),
+            }
+        except Exception as e:
+            logger.warning(f"종목 {t} 조회 실패: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=ALL_MARKETS_CONCURRENCY, thread_name_prefix="all-markets") as pool:
+        return [row for row in pool.map(one, tickers) if row]
+
+
 @app.get("/api/stocks/all-markets")
 def get_all_markets(
     market: str = Query("ALL", description="KOSPI / KOSDAQ / ALL"),
@@ -275,47 +373,38 @@ def get_all_markets(
     days: int = Query(5, description="최근 N 거래일"),
 ):
     """
-    주요 종목 최근 OHLCV (네이버 소스 - 로그인 불필요!)
-    각 종목의 최근 종가/등락률/거래량을 가져옵니다.
+    주요 종목 최근 시세 (종가/등락률/거래량)
+
+    KRX 전종목 시세 스냅샷(시장당 요청 1번)에서 주요 종목만 골라냅니다.
+    KRX 조회가 안 되면 네이버에서 종목별로 동시에 조회합니다.
     """
     end = business_day_str(0)
     start = (datetime.date.today() - datetime.timedelta(days=days + 5)).strftime("%Y%m%d")
 
     markets_to_query = ["KOSPI", "KOSDAQ"] if market == "ALL" else [market]
     results = []
+    sources = set()
 
     for mkt in markets_to_query:
         tickers = MAJOR_TICKERS.get(mkt, [])[:top_n]
-        for t in tickers:
-            try:
-                name = stock.get_market_ticker_name(t)
-                df = stock.get_market_ohlcv_by_date(start, end, t, adjusted=True)
-                if df.empty:
-                    continue
-                last = df.iloc[-1]
-                results.append({
-                    "종목코드": t,
-                    "종목명": name,
-                    "시장": mkt,
-                    "종가": int(last["종가"]),
-                    "시가": int(last["시가"]),
-                    "고가": int(last["고가"]),
-                    "저가": int(last["저가"]),
-                    "거래량": int(last["거래량"]),
-                    "등락률": round(float(last["등락률"]), 2),
-                    "기준일": df.index[-1].strftime("%Y-%m-%d"),
-                })
-                time.sleep(0.3)  # IP 차단 방지
-            except Exception as e:
-                logger.warning(f"종목 {t} 조회 실패: {e}")
-                continue
+        try:
+            rows = _all_markets_from_snapshot(mkt, tickers)
+        except Exception as e:
+            logger.warning(f"전종목 스냅샷 조회 실패 ({mkt}): {e}")
+            rows = None
+        if rows is not None:
+            sources.add("krx_auth")
+        else:
+            rows = _all_markets_from_naver(mkt, tickers, start, end)
+            sources.add("naver")
+        results.extend(rows)
 
     # 거래량 기준 정렬
     results.sort(key=lambda x: x.get("거래량", 0), reverse=True)
 
     return {
         "market": market,
-        "source": "naver",
+        "source": "+".join(sorted(sources)) or "krx_auth",
         "count": len(results),
         "data": results[:top_n],
     }
@@ -361,40 +450,25 @@ def get_fundamental(
     top_n: int = Query(20),
 ):
     """
-    재무지표 (PER/PBR/EPS/BPS/배당수익률) — 네이버 금융에서 가져옴
+    재무지표 (PER/PBR/EPS/BPS/배당수익률)
     개별 종목 or 시가총액 상위 종목의 재무정보 일괄 수집
+
+    KRX 전종목 재무지표 표(foreign_holding) 한 장에서 골라내고,
+    없는 종목만 네이버 종목 페이지를 동시에 긁어옵니다 (거래일 단위 캐시).
     """
+    engine = get_fundamentals()
     if ticker:
         # 개별 종목
-        info = nf.get_financial_info(ticker)
-        name = stock.get_market_ticker_name(ticker)
-        if info:
-            info["종목코드"] = ticker
-            info["종목명"] = name
-        return {"source": "naver", "count": 1 if info else 0, "data": [info] if info else []}
+        rows, source = engine.lookup([ticker])
+        return {"source": source, "count": len(rows), "data": rows}
 
     # 시가총액 상위 종목의 재무정보 일괄 수집
-    # 먼저 시가총액 페이지에서 종목코드 추출
-    stock_df = nf.get_stock_list(market, pages=1)
-    if stock_df.empty:
-        return {"source": "naver", "count": 0, "data": []}
-
-    results = []
-    for _, row in stock_df.head(top_n).iterrows():
-        code = row["종목코드"]
-        name = row["종목명"]
-        info = nf.get_financial_info(code)
-        if info:
-            info["종목코드"] = code
-            info["종목명"] = name
-            info["시장"] = market
-            results.append(info)
-
+    rows, source = engine.top(market, top_n)
     return {
         "market": market,
-        "source": "naver",
-        "count": len(results),
-        "data": results,
+        "source": source,
+        "count": len(rows),
+        "data": rows,
     }
 
 
@@ -417,7 +491,7 @@ def get_investor_trading(
     2순위: pykrx
     3순위: 네이버 금융
     """
-    name = stock.get_market_ticker_name(ticker)
+    name = get_symbol_master().name_of(ticker)
     source = "krx_direct"
 
     # 1순위: KRX 직접 수집 (투자자별 전체시장)
@@ -469,7 +543,7 @@ def get_foreign_holding(
 
     df.index.name = "종목코드"
     df = df.reset_index()
-    df["종목명"] = df["종목코드"].apply(lambda t: stock.get_market_ticker_name(t))
+    df = get_symbol_master().attach(df, code_col="종목코드", columns={"name": "종목명"})
     df = df.head(top_n)
 
     return {
@@ -497,7 +571,7 @@ def get_shorting_balance(
     df = safe_pykrx_call(
         stock.get_shorting_balance_by_date, start, end, ticker
     )
-    name = stock.get_market_ticker_name(ticker)
+    name = get_symbol_master().name_of(ticker)
 
     return {
         "ticker": ticker,
@@ -703,7 +777,7 @@ def natural_language_query(req: NLQueryRequest):
                 data = get_market_cap()
                 result = {"success": True, "data": data["data"][:20], "count": data["count"]}
             elif intent == "fundamental":
-                data = get_fundamental()
+                data = get_fundamental(None, "KOSPI", 20)
                 result = {"success": True, "data": data["data"][:20], "count": data["count"]}
             elif intent == "foreign":
                 data = get_foreign_holding()
@@ -712,7 +786,7 @@ def natural_language_query(req: NLQueryRequest):
                 data = get_bond_yields()
                 result = {"success": True, "data": data["data"], "count": data["count"]}
             else:
-                data = get_all_markets()
+                data = get_all_markets("ALL", 50, 5)
                 result = {"success": True, "data": data["data"][:20], "count": data["count"]}
         except Exception as e:
             result = {"success": False, "error": str(e)}
@@ -744,7 +818,7 @@ def get_trading_volume(
     end = end or business_day_str(1)
     start = start or (datetime.date.today() - datetime.timedelta(days=90)).strftime("%Y%m%d")
     df = safe_pykrx_call(stock.get_market_trading_volume_by_date, start, end, ticker)
-    name = stock.get_market_ticker_name(ticker)
+    name = get_symbol_master().name_of(ticker)
     return {"ticker": ticker, "name": name, "count": len(df), "data": df_to_records(df)}
 
 
@@ -758,7 +832,7 @@ def get_trading_value(
     end = end or business_day_str(1)
     start = start or (datetime.date.today() - datetime.timedelta(days=90)).strftime("%Y%m%d")
     df = safe_pykrx_call(stock.get_market_trading_value_by_date, start, end, ticker)
-    name = stock.get_market_ticker_name(ticker)
+    name = get_symbol_master().name_of(ticker)
     return {"ticker": ticker, "name": name, "count": len(df), "data": df_to_records(df)}
 
 
@@ -780,7 +854,7 @@ def get_trading_by_investor(
     if df.empty:
         df = nf.get_investor_trading(ticker, pages=2)
         source = "naver"
-    name = stock.get_market_ticker_name(ticker)
+    name = get_symbol_master().name_of(ticker)
     return {"ticker": ticker, "name": name, "kind": kind, "source": source, "count": len(df), "data": df_to_records(df)}
 
 
@@ -814,7 +888,7 @@ def get_market_cap_by_date(
         # 네이버 일별시세로 폴백 (시가총액 직접 추이는 없지만 가격+거래량 제공)
         df = nf.get_daily_price(ticker, pages=5)
         source = "naver"
-    name = stock.get_market_ticker_name(ticker)
+    name = get_symbol_master().name_of(ticker)
     return {"ticker": ticker, "name": name, "source": source, "count": len(df), "data": df_to_records(df)}
 
 
@@ -861,7 +935,7 @@ def get_fundamental_by_date(
         if info:
             df = pd.DataFrame([info])
         source = "naver"
-    name = stock.get_market_ticker_name(ticker)
+    name = get_symbol_master().name_of(ticker)
     return {"ticker": ticker, "name": name, "source": source, "count": len(df), "data": df_to_records(df)}
 
 
@@ -988,7 +1062,7 @@ def get_net_purchases(
     end = end or business_day_str(1)
     start = start or (datetime.date.today() - datetime.timedelta(days=30)).strftime("%Y%m%d")
     df = safe_pykrx_call(stock.get_market_net_purchases_of_equities, start, end, ticker)
-    name = stock.get_market_ticker_name(ticker)
+    name = get_symbol_master().name_of(ticker)
     return {"ticker": ticker, "name": name, "count": len(df), "data": df_to_records(df)}
 
 
@@ -1099,10 +1173,10 @@ def get_etf_ticker_list_krx(
     tickers = safe_pykrx_call(stock.get_etf_ticker_list, date)
     if not isinstance(tickers, list):
         return {"count": 0, "data": []}
-    results = []
-    for t in tickers:
-        name = stock.get_etf_ticker_name(t)
-        results.append({"종목코드": t, "종목명": name})
+    df = get_symbol_master().attach(
+        pd.DataFrame({"종목코드": tickers}), columns={"name": "종목명"}, kind="etf"
+    )
+    results = df_to_records(df)
     return {"date": date, "count": len(results), "data": results}
 
 
@@ -1116,7 +1190,7 @@ def get_etf_ohlcv_krx(
     end = end or business_day_str(1)
     start = start or (datetime.date.today() - datetime.timedelta(days=90)).strftime("%Y%m%d")
     df = safe_pykrx_call(stock.get_etf_ohlcv_by_date, start, end, ticker)
-    name = stock.get_etf_ticker_name(ticker)
+    name = get_symbol_master().name_of(ticker, kind="etf")
     return {"ticker": ticker, "name": name, "count": len(df), "data": df_to_records(df)}
 
 
@@ -1182,7 +1256,7 @@ def get_etf_holdings(
     """ETF 구성 종목 (PDF: Portfolio Deposit File)"""
     date = date or business_day_str(1)
     df = safe_pykrx_call(stock.get_etf_portfolio_deposit_file, date, ticker)
-    name = stock.get_etf_ticker_name(ticker)
+    name = get_symbol_master().name_of(ticker, kind="etf")
     return {"ticker": ticker, "name": name, "date": date, "count": len(df), "data": df_to_records(df)}
 
 
@@ -1192,7 +1266,7 @@ def get_etf_isin(
 ):
     """ETF ISIN 코드 조회"""
     isin = safe_pykrx_call(stock.get_etf_isin, ticker)
-    name = stock.get_etf_ticker_name(ticker)
+    name = get_symbol_master().name_of(ticker, kind="etf")
     return {"ticker": ticker, "name": name, "isin": str(isin) if isin else None}
 
 
@@ -1222,10 +1296,10 @@ def get_etn_list(
     tickers = safe_pykrx_call(stock.get_etn_ticker_list, date)
     if not isinstance(tickers, list):
         return {"count": 0, "data": []}
-    results = []
-    for t in tickers:
-        name = stock.get_etn_ticker_name(t)
-        results.append({"종목코드": t, "종목명": name})
+    df = get_symbol_master().attach(
+        pd.DataFrame({"종목코드": tickers}), columns={"name": "종목명"}, kind="etn"
+    )
+    results = df_to_records(df)
     return {"date": date, "count": len(results), "data": results}
 
 
@@ -1238,10 +1312,10 @@ def get_elw_list(
     tickers = safe_pykrx_call(stock.get_elw_ticker_list, date)
     if not isinstance(tickers, list):
         return {"count": 0, "data": []}
-    results = []
-    for t in tickers:
-        name = stock.get_elw_ticker_name(t)
-        results.append({"종목코드": t, "종목명": name})
+    df = get_symbol_master().attach(
+        pd.DataFrame({"종목코드": tickers}), columns={"name": "종목명"}, kind="elw"
+    )
+    results = df_to_records(df)
     return {"date": date, "count": len(results), "data": results}
 
 
@@ -1274,7 +1348,7 @@ def get_shorting_volume(
     end = end or business_day_str(1)
     start = start or (datetime.date.today() - datetime.timedelta(days=30)).strftime("%Y%m%d")
     df = safe_pykrx_call(stock.get_shorting_volume_by_date, start, end, ticker)
-    name = stock.get_market_ticker_name(ticker)
+    name = get_symbol_master().name_of(ticker)
     return {"ticker": ticker, "name": name, "count": len(df), "data": df_to_records(df)}
 
 
@@ -1313,7 +1387,7 @@ def get_shorting_value(
     end = end or business_day_str(1)
     start = start or (datetime.date.today() - datetime.timedelta(days=30)).strftime("%Y%m%d")
     df = safe_pykrx_call(stock.get_shorting_value_by_date, start, end, ticker)
-    name = stock.get_market_ticker_name(ticker)
+    name = get_symbol_master().name_of(ticker)
     return {"ticker": ticker, "name": name, "count": len(df), "data": df_to_records(df)}
 
 
@@ -1359,7 +1433,7 @@ def get_shorting_by_investor(
         df = safe_pykrx_call(stock.get_shorting_investor_value_by_date, start, end, ticker)
     else:
         df = safe_pykrx_call(stock.get_shorting_investor_volume_by_date, start, end, ticker)
-    name = stock.get_market_ticker_name(ticker)
+    name = get_symbol_master().name_of(ticker)
     return {"ticker": ticker, "name": name, "kind": kind, "count": len(df), "data": df_to_records(df)}
 
 
@@ -1392,7 +1466,7 @@ def get_foreign_by_date(
     if df.empty:
         df = nf.get_foreign_holding(ticker, pages=3)
         source = "naver"
-    name = stock.get_market_ticker_name(ticker)
+    name = get_symbol_master().name_of(ticker)
     return {"ticker": ticker, "name": name, "source": source, "count": len(df), "data": df_to_records(df)}
 
 
@@ -1400,6 +1474,18 @@ def get_foreign_by_date(
 # 24. 선물 (파생상품)
 # ─────────────────────────────────────────────────────────
 
+def _future_names() -> dict[str, str]:
+    """선물 티커 → 이름 (파생상품 목록 표를 한 번만 받아서 사전으로)
+
+    pykrx get_future_ticker_name은 티커와 상관없이 매번 KRX에서 표 전체를 받아
+    DataFrame을 돌려주므로 종목마다 부르지 않음
+    """
+    df = safe_pykrx_call(pykrx_krx.get_future_ticker_and_name)
+    if not isinstance(df, pd.DataFrame) or df.empty or "name" not in df.columns:
+        return {}
+    return df["name"].astype(str).to_dict()
+
+
 @app.get("/api/futures/list")
 def get_future_list(
     date: Optional[str] = None,
@@ -1409,10 +1495,11 @@ def get_future_list(
     tickers = safe_pykrx_call(stock.get_future_ticker_list, date)
     if not isinstance(tickers, list):
         return {"count": 0, "data": []}
-    results = []
-    for t in tickers[:50]:  # 선물은 많으므로 50개 제한
-        name = stock.get_future_ticker_name(t)
-        results.append({"종목코드": t, "종목명": name})
+    names = _future_names()
+    results = [
+        {"종목코드": t, "종목명": names.get(t, "")}
+        for t in tickers[:50]  # 선물은 많으므로 50개 제한
+    ]
     return {"date": date, "count": len(results), "data": results}
 
 
@@ -1426,7 +1513,7 @@ def get_future_ohlcv(
     end = end or business_day_str(1)
     start = start or (datetime.date.today() - datetime.timedelta(days=90)).strftime("%Y%m%d")
     df = safe_pykrx_call(stock.get_future_ohlcv, start, end, ticker)
-    name = stock.get_future_ticker_name(ticker)
+    name = _future_names().get(ticker, "")
     return {"ticker": ticker, "name": name, "count": len(df), "data": df_to_records(df)}
 
 
@@ -1449,34 +1536,72 @@ def get_business_day_list(
     start: Optional[str] = None,
     end: Optional[str] = None,
 ):
-    """영업일 목록 조회"""
+    """영업일 목록 조회 (로컬 거래일 달력)"""
     end = end or business_day_str(0)
     start = start or (datetime.date.today() - datetime.timedelta(days=30)).strftime("%Y%m%d")
-    days = safe_pykrx_call(stock.get_business_days, start, end)
-    if not isinstance(days, list):
-        days = list(days) if days is not None else []
-    return {"start": start, "end": end, "count": len(days), "data": [str(d) for d in days]}
+    days = get_calendar().trading_days(start, end)
+    return {"start": start, "end": end, "count": len(days), "data": days}
 
 
 @app.get("/api/util/previous-business-days")
 def get_previous_bdays(
     n: int = Query(5, description="최근 N 영업일"),
 ):
-    """최근 N 영업일 조회"""
-    days = safe_pykrx_call(stock.get_previous_business_days, n=n)
-    if not isinstance(days, list):
-        days = list(days) if days is not None else []
-    return {"n": n, "count": len(days), "data": [str(d) for d in days]}
+    """최근 N 영업일 조회 (로컬 거래일 달력)"""
+    days = get_calendar().previous_trading_days(n)
+    return {"n": n, "count": len(days), "data": days}
 
 
 @app.get("/api/util/nearest-business-day")
 def get_nearest_bday(
     date: Optional[str] = None,
 ):
-    """가장 가까운 영업일 조회"""
+    """가장 가까운 영업일 조회 (해당일 또는 직전 거래일)"""
     date = date or datetime.date.today().strftime("%Y%m%d")
-    result = safe_pykrx_call(stock.get_nearest_business_day_in_a_week, date)
-    return {"input_date": date, "nearest_business_day": str(result) if result else None}
+    result = get_calendar().nearest_trading_day(date)
+    return {"input_date": date, "nearest_business_day": result}
+
+
+@app.get("/api/util/session-hours")
+def get_session_hours(
+    date: Optional[str] = None,
+):
+    """정규장 운영시간 (연초 첫 거래일/수능일 등 특수 개장시간 반영)"""
+    cal = get_calendar()
+    date = date or today_str()
+    hours = cal.session_hours(date)
+    return {
+        "date": date,
+        "is_trading_day": hours is not None,
+        "open": hours[0].strftime("%H:%M") if hours else None,
+        "close": hours[1].strftime("%H:%M") if hours else None,
+        "next_trading_day": cal.next_trading_day(date),
+        "prev_trading_day": cal.prev_trading_day(date),
+    }
+
+
+@app.get("/api/util/calendar-status")
+def get_calendar_status():
+    """거래일 달력 상태 (내장 휴장일 연도, KRX 확인 연도)"""
+    return get_calendar().status()
+
+
+@app.get("/api/util/rate-limits")
+def get_rate_limits():
+    """업스트림 호스트별 속도 제한 상태 (요청 수, 대기 시간, 429/503 보류)"""
+    return get_rate_limiter().status()
+
+
+@app.get("/api/util/concurrency")
+def get_concurrency_status():
+    """업스트림 호스트별 적응형 동시 요청 창 (AIMD — 현재 window, 진행 중, 축소 횟수)"""
+    return get_adaptive_concurrency().status()
+
+
+@app.get("/api/util/sessions")
+def get_session_status():
+    """KRX 세션 백그라운드 교체 상태 (세션 나이, 교체 시점, 교체/실패 횟수)"""
+    return get_session_refresher().status()
 
 
 # ─────────────────────────────────────────────────────────
@@ -1493,10 +1618,8 @@ def get_ticker_list_krx(
     tickers = safe_pykrx_call(stock.get_market_ticker_list, date, market=market)
     if not isinstance(tickers, list):
         return {"count": 0, "data": [], "note": "KRX API 불안정 — /api/stocks/list 사용 권장"}
-    results = []
-    for t in tickers:
-        name = stock.get_market_ticker_name(t)
-        results.append({"종목코드": t, "종목명": name})
+    df = get_symbol_master().attach(pd.DataFrame({"종목코드": tickers}), columns={"name": "종목명"})
+    results = df_to_records(df)
     return {"date": date, "market": market, "count": len(results), "data": results}
 
 
@@ -1537,7 +1660,7 @@ def get_naver_daily_price(
 ):
     """일별 시세 — 개별 종목 (네이버 금융 HTML)"""
     df = nf.get_daily_price(ticker, pages=pages)
-    name = stock.get_market_ticker_name(ticker)
+    name = get_symbol_master().name_of(ticker)
     return {"ticker": ticker, "name": name, "source": "naver", "count": len(df), "data": df_to_records(df)}
 
 
@@ -1548,7 +1671,7 @@ def get_naver_foreign_holding(
 ):
     """외국인 보유현황 추이 (네이버 금융)"""
     df = nf.get_foreign_holding(ticker, pages=pages)
-    name = stock.get_market_ticker_name(ticker)
+    name = get_symbol_master().name_of(ticker)
     return {"ticker": ticker, "name": name, "source": "naver", "count": len(df), "data": df_to_records(df)}
 
 
@@ -1559,7 +1682,7 @@ def get_naver_financial_statements(
 ):
     """재무제표 (네이버 금융 — 연간/분기 실적)"""
     df = nf.get_financial_statements(ticker, freq_typ=freq)
-    name = stock.get_market_ticker_name(ticker)
+    name = get_symbol_master().name_of(ticker)
     return {"ticker": ticker, "name": name, "freq": freq, "source": "naver", "count": len(df), "data": df_to_records(df)}
 
 
@@ -1659,6 +1782,84 @@ def get_krx_auth_status():
     return get_krx_auth().status()
 
 
+@app.get("/api/cache/warmer/status")
+def get_cache_warmer_status():
+    """캐시 워머 상태 (다음 실행 시각, 진행률, 마지막 실행 소요시간)"""
+    return get_cache_warmer().status()
+
+
+@app.post("/api/cache/warmer/run")
+def run_cache_warmer(
+    date: Optional[str] = None,
+):
+    """캐시 워밍 수동 실행 (백그라운드)"""
+    started = get_cache_warmer().run_now(date)
+    return {"started": started, "date": date or business_day_str(0)}
+
+
+class BackfillRequest(BaseModel):
+    endpoints: list[str]
+    start: str
+    end: Optional[str] = None
+    markets: list[str] = list(DEFAULT_MARKETS)
+    concurrency: Optional[int] = None
+
+
+@app.post("/api/admin/backfill")
+def start_backfill(req: BackfillRequest):
+    """과거 데이터 백필 시작 (백그라운드, 같은 요청이면 체크포인트에서 이어하기)"""
+    try:
+        job = BackfillJob(
+            req.endpoints, req.start, req.end or get_calendar().latest_trading_day(),
+            markets=req.markets,
+            **({"concurrency": req.concurrency} if req.concurrency else {}),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    job, started = get_backfill_manager().start(job)
+    return {"started": started, "job_id": job.job_id, "status": job.status()}
+
+
+@app.get("/api/admin/backfill")
+def list_backfills():
+    """백필 작업 목록 + 진행률/ETA"""
+    return get_backfill_manager().status()
+
+
+@app.get("/api/admin/backfill/{job_id}")
+def get_backfill(job_id: str):
+    """백필 작업 진행률 (처리 건수, 초당 처리 수, 남은 시간)"""
+    job = get_backfill_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"백필 작업 없음: {job_id}")
+    return job.status()
+
+
+@app.post("/api/admin/backfill/{job_id}/stop")
+def stop_backfill(job_id: str):
+    """백필 중단 (처리 중인 일만 마치고 멈춤 — 같은 요청으로 이어하기)"""
+    if not get_backfill_manager().stop(job_id):
+        raise HTTPException(status_code=404, detail=f"백필 작업 없음: {job_id}")
+    return {"stopping": True, "job_id": job_id}
+
+
+@app.get("/api/symbols/search")
+def search_symbols(
+    q: str = Query(..., description="종목명 또는 종목코드 앞부분 (예: 삼성, 0059)"),
+    limit: int = Query(20),
+):
+    """종목 마스터 검색 (종목코드/ISIN/종목명/시장/업종)"""
+    symbols = get_symbol_master()
+    data = symbols.search(q, limit=limit)
+    return {"query": q, "count": len(data), "data": data}
+
+
+@app.get("/api/symbols/status")
+def get_symbols_status():
+    """종목 마스터 상태 (기준 거래일, 종목 수)"""
+    return get_symbol_master().status()
+
+
 @app.get("/api/krx-auth/all-stock-price")
 def get_krx_auth_all_stock_price(
     date: Optional[str] = None,
@@ -1773,10 +1974,10 @@ def get_krx_auth_stock_daily(
     end = end or business_day_str(1)
     start = start or (datetime.date.today() - datetime.timedelta(days=30)).strftime("%Y%m%d")
     auth = get_krx_auth()
-    isu_cd = f"KR7{ticker}003"  # KRX 종목코드 변환
+    isu_cd = get_symbol_master().isin_of(ticker)  # 종목코드 → ISIN
     df = auth.fetch("stock_daily", isuCd=isu_cd, isuCd2=isu_cd,
                     strtDd=start, endDd=end)
-    name = stock.get_market_ticker_name(ticker)
+    name = get_symbol_master().name_of(ticker)
     return {"ticker": ticker, "name": name, "start": start, "end": end,
             "source": "krx_auth", "count": len(df), "data": df_to_records(df)}
 
@@ -1806,9 +2007,9 @@ def get_krx_auth_investor_by_stock(
     end = end or business_day_str(1)
     start = start or (datetime.date.today() - datetime.timedelta(days=30)).strftime("%Y%m%d")
     auth = get_krx_auth()
-    isu_cd = f"KR7{ticker}003"
+    isu_cd = get_symbol_master().isin_of(ticker)
     df = auth.fetch("investor_by_stock", isuCd=isu_cd, strtDd=start, endDd=end)
-    name = stock.get_market_ticker_name(ticker)
+    name = get_symbol_master().name_of(ticker)
     return {"ticker": ticker, "name": name, "start": start, "end": end,
             "source": "krx_auth", "count": len(df), "data": df_to_records(df)}
 
@@ -1975,7 +2176,7 @@ def get_krx_auth_short_selling_stock(
     end = end or business_day_str(1)
     start = start or (datetime.date.today() - datetime.timedelta(days=30)).strftime("%Y%m%d")
     auth = get_krx_auth()
-    isu_cd = f"KR7{ticker}003"
+    isu_cd = get_symbol_master().isin_of(ticker)
     df = auth.fetch("short_selling_stock", isuCd=isu_cd, strtDd=start, endDd=end)
     return {"ticker": ticker, "start": start, "end": end, "source": "krx_auth",
             "count": len(df), "data": df_to_records(df)}
@@ -1991,7 +2192,7 @@ def get_krx_auth_short_selling_stock_daily(
     end = end or business_day_str(1)
     start = start or (datetime.date.today() - datetime.timedelta(days=30)).strftime("%Y%m%d")
     auth = get_krx_auth()
-    isu_cd = f"KR7{ticker}003"
+    isu_cd = get_symbol_master().isin_of(ticker)
     df = auth.fetch("short_selling_stock_daily", isuCd=isu_cd, strtDd=start, endDd=end)
     return {"ticker": ticker, "start": start, "end": end, "source": "krx_auth",
             "count": len(df), "data": df_to_records(df)}
@@ -2033,7 +2234,7 @@ def get_krx_auth_short_selling_balance(
     end = end or business_day_str(1)
     start = start or (datetime.date.today() - datetime.timedelta(days=30)).strftime("%Y%m%d")
     auth = get_krx_auth()
-    isu_cd = f"KR7{ticker}003"
+    isu_cd = get_symbol_master().isin_of(ticker)
     df = auth.fetch("short_selling_balance", isuCd=isu_cd, strtDd=start, endDd=end)
     return {"ticker": ticker, "start": start, "end": end, "source": "krx_auth",
             "count": len(df), "data": df_to_records(df)}
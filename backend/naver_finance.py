@@ -13,15 +13,39 @@
 6. 주가 OHLCV (시가/고가/저가/종가/거래량)
 """
 
-import ast
+import functools
+import hashlib
+import inspect
 import logging
-import time
+import os
+import re
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from io import StringIO
-from typing import Optional
+from typing import Any, Callable, Optional
 
 import pandas as pd
 import requests
 
+try:
+    from .krx_cache import NEGATIVE_TODAY_TTL, get_negative_cache, negative_ttl_for
+    from .naver_html import (
+        DAILY_PRICE_TABLE, DATE_TABLE, SECTOR_TABLE, STOCK_TABLE, TableSelector,
+        extract_ratios, parse_document,
+    )
+    from .naver_sise import parse_sise_json
+    from .rate_limiter import limited_request
+    from .single_flight import SingleFlight
+except ImportError:
+    from krx_cache import NEGATIVE_TODAY_TTL, get_negative_cache, negative_ttl_for
+    from naver_html import (
+        DAILY_PRICE_TABLE, DATE_TABLE, SECTOR_TABLE, STOCK_TABLE, TableSelector,
+        extract_ratios, parse_document,
+    )
+    from naver_sise import parse_sise_json
+    from rate_limiter import limited_request
+    from single_flight import SingleFlight
+
 logger = logging.getLogger(__name__)
 
 # ============================================================================
@@ -37,18 +61,181 @@ HEADERS = {
     "Referer": "https://finance.naver.com/",
 }
 
-# 요청 간 최소 대기 시간 (초) — IP 차단 방지
-REQUEST_DELAY = 0.5
+# 동시에 들어온 같은 페이지 요청은 한 번만 전송
+_flight = SingleFlight("naver")
+
+# 여러 페이지를 받을 때 동시 요청 수 (실제 속도는 호스트별 제한기가 조절)
+PAGE_CONCURRENCY = int(os.environ.get("NAVER_PAGE_CONCURRENCY", "6"))
+
+# keep-alive 연결을 재사용하는 공용 세션 (스레드 간 공유)
+_http = requests.Session()
+_http.headers.update(HEADERS)
+_http.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=max(10, PAGE_CONCURRENCY * 2)))
+
+
+# 현재 스레드에서 요청 실패가 있었는지 (빈 결과 캐시 판단용)
+_request_state = threading.local()
 
 
 def _get(url: str, params: dict = None, timeout: int = 15) -> requests.Response:
-    """네이버 금융에 GET 요청 (User-Agent 헤더 필수)"""
-    resp = requests.get(url, headers=HEADERS, params=params, timeout=timeout)
+    """네이버 금융에 GET 요청 (User-Agent 헤더 필수)
+
+    같은 (url, params) 요청이 진행 중이면 그 응답을 함께 받습니다.
+    """
+    key = (url, tuple(sorted((k, str(v)) for k, v in (params or {}).items())))
+    try:
+        return _flight.do(key, _get_once, url, params, timeout)
+    except Exception:
+        _request_state.failed = True
+        raise
+
+
+def cache_empty(date_arg: Optional[str] = None):
+    """빈 결과(없는 종목, 휴장일 등)를 잠시 기억하는 데코레이터
+
+    요청이 정상적으로 끝났는데 결과가 비어 있을 때만 기억합니다.
+    (네트워크/HTTP 오류로 비어 있는 경우는 다음 호출에서 다시 시도)
+
+    Args:
+        date_arg: 기준일 인자 이름 — 지난 날짜면 더 오래 기억
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = ("naver", fn.__name__, tuple(sorted(
+                (k, str(v)) for k, v in bound.arguments.items()
+            )))
+            negative = get_negative_cache()
+            empty = fn.__annotations__.get("return", pd.DataFrame)
+            if negative.is_empty(key):
+                return empty()
+
+            _request_state.failed = False
+            result = fn(*args, **kwargs)
+            is_empty = result.empty if isinstance(result, pd.DataFrame) else not result
+            if is_empty and not _request_state.failed:
+                if date_arg:
+                    ttl = negative_ttl_for({"endDd": bound.arguments.get(date_arg)})
+                else:
+                    ttl = NEGATIVE_TODAY_TTL
+                negative.add(key, ttl)
+            return result
+
+        return wrapper
+    return decorator
+
+
+def _get_once(url: str, params: Optional[dict], timeout: int) -> requests.Response:
+    # IP 차단 방지 — 고정 sleep 대신 호스트별 속도 제한 (429/503이면 Retry-After만큼 보류)
+    resp = limited_request(_http, "GET", url, params=params, timeout=timeout)
     resp.raise_for_status()
-    time.sleep(REQUEST_DELAY)
     return resp
 
 
+def _page_signature(parsed) -> str:
+    """페이지 파싱 결과의 지문 (범위를 넘은 페이지는 마지막 페이지를 또 돌려줌)"""
+    if isinstance(parsed, pd.DataFrame):
+        data = pd.util.hash_pandas_object(parsed.astype(str), index=False).values.tobytes()
+    else:
+        data = repr(parsed).encode("utf-8")
+    return hashlib.md5(data).hexdigest()
+
+
+def _read_tables(resp: requests.Response, selector: TableSelector) -> list[pd.DataFrame]:
+    """페이지에서 selector가 가리키는 표만 DataFrame으로
+
+    표를 못 찾으면(페이지 모양이 바뀜) 예전처럼 pd.read_html로 페이지 전체를 읽음
+    (표가 하나도 없으면 ValueError).
+    """
+    frames = selector.extract(parse_document(resp))
+    if frames is None:
+        return pd.read_html(StringIO(resp.text), encoding="euc-kr")
+    return frames
+
+
+def _fetch_page(url: str, params: dict, parse: Callable[[requests.Response], Any]):
+    resp = _get(url, params=params)
+    try:
+        return parse(resp)
+    except ValueError:
+        return None  # read_html: 표 없음 → 빈 페이지
+
+
+def fetch_pages(
+    url: str,
+    pages: int,
+    page_params: Callable[[int], dict],
+    parse: Callable[[requests.Response], Any],
+    label: str,
+) -> list:
+    """1~pages 페이지를 동시에 받아서 도착하는 대로 파싱 (페이지 순서로 반환)
+
+    - 동시 요청은 PAGE_CONCURRENCY개까지, 속도는 호스트별 제한기가 조절
+    - 빈 페이지나 앞 페이지와 똑같은 페이지가 나오면 그 뒤 페이지는 요청하지 않음
+
+    Args:
+        page_params: 페이지 번호 → 요청 파라미터
+        parse: 응답 → 파싱 결과 (DataFrame/리스트). 비어 있으면 마지막 페이지로 판단
+        label: 로그용 이름
+
+    Returns:
+        비어 있지 않은 페이지들의 파싱 결과 (페이지 순서)
+    """
+    results: dict[int, Any] = {}
+    signatures: dict[str, int] = {}
+    last = pages
+    next_page = 1
+    failed = False
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(PAGE_CONCURRENCY, pages)), thread_name_prefix="naver-page"
+    ) as pool:
+        running = {}
+
+        def submit():
+            nonlocal next_page
+            while next_page <= last and len(running) < PAGE_CONCURRENCY:
+                future = pool.submit(_fetch_page, url, page_params(next_page), parse)
+                running[future] = next_page
+                next_page += 1
+
+        submit()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                page = running.pop(future)
+                if page > last:
+                    continue
+                try:
+                    parsed = future.result()
+                except Exception as e:
+                    logger.warning(f"{label} 페이지 {page} 실패: {e}")
+                    failed = True
+                    continue
+                if parsed is None or len(parsed) == 0:
+                    last = min(last, page - 1)
+                    continue
+                sig = _page_signature(parsed)
+                other = signatures.get(sig)
+                if other is not None:
+                    # 같은 내용이면 뒤 페이지는 범위를 넘은 것 → 거기서 끝
+                    last = min(last, max(page, other) - 1)
+                    results.pop(max(page, other), None)
+                    page = min(page, other)
+                signatures[sig] = page
+                results[page] = parsed
+            submit()
+
+    if failed:
+        # 워커 스레드의 실패를 호출 스레드에도 알림 (빈 결과 캐시 방지)
+        _request_state.failed = True
+    return [results[p] for p in sorted(results) if p <= last]
+
+
 # ============================================================================
 # 1. 시가총액 순위 (전 종목)
 # ============================================================================
@@ -67,21 +254,16 @@ def get_market_cap_ranking(
     sosok = 0 if market == "KOSPI" else 1
     url = "https://finance.naver.com/sise/sise_market_sum.naver"
 
-    all_rows = []
-    for page in range(1, pages + 1):
-        try:
-            resp = _get(url, params={"sosok": sosok, "page": page})
-            # HTML 테이블 파싱
-            tables = pd.read_html(StringIO(resp.text), encoding="euc-kr")
-            for df in tables:
-                if "종목명" in df.columns:
-                    # 빈 행 제거
-                    df = df.dropna(subset=["종목명"])
-                    all_rows.append(df)
-        except Exception as e:
-            logger.warning(f"시가총액 페이지 {page} 실패: {e}")
-            continue
+    def parse(resp) -> pd.DataFrame:
+        # 종목 표만 파싱
+        tables = _read_tables(resp, STOCK_TABLE)
+        # 빈 행 제거
+        frames = [df.dropna(subset=["종목명"]) for df in tables if "종목명" in df.columns]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
 
+    all_rows = fetch_pages(
+        url, pages, lambda page: {"sosok": sosok, "page": page}, parse, "시가총액"
+    )
     if not all_rows:
         return pd.DataFrame()
 
@@ -103,6 +285,7 @@ def get_market_cap_ranking(
 # 2. 재무정보 (PER, PBR, EPS, BPS 등)
 # ============================================================================
 
+@cache_empty()
 def get_financial_info(ticker: str) -> dict:
     """
     네이버 금융 → 종목 '기업정보' 탭에서 재무지표 가져오기
@@ -114,51 +297,10 @@ def get_financial_info(ticker: str) -> dict:
 
     try:
         resp = _get(url)
-        tables = pd.read_html(StringIO(resp.text), encoding="euc-kr")
-
-        result = {}
-
-        # 투자지표 테이블 찾기 (PER, EPS 등이 있는 테이블)
-        for df in tables:
-            cols = [str(c) for c in df.columns]
-            text = " ".join(cols + [str(v) for v in df.values.flatten()])
-
-            if "PER" in text and "EPS" in text:
-                # 테이블에서 값 추출
-                for _, row in df.iterrows():
-                    row_str = [str(v) for v in row.values]
-                    for i, val in enumerate(row_str):
-                        if "PER" in val and i + 1 < len(row_str):
-                            try:
-                                result["PER"] = float(row_str[i + 1].replace(",", "").replace("배", ""))
-                            except (ValueError, IndexError):
-                                pass
-                        if "PBR" in val and i + 1 < len(row_str):
-                            try:
-                                result["PBR"] = float(row_str[i + 1].replace(",", "").replace("배", ""))
-                            except (ValueError, IndexError):
-                                pass
-                        if "EPS" in val and "BPS" not in val and i + 1 < len(row_str):
-                            try:
-                                result["EPS"] = float(row_str[i + 1].replace(",", "").replace("원", ""))
-                            except (ValueError, IndexError):
-                                pass
-                        if "BPS" in val and i + 1 < len(row_str):
-                            try:
-                                result["BPS"] = float(row_str[i + 1].replace(",", "").replace("원", ""))
-                            except (ValueError, IndexError):
-                                pass
-
-            if "배당수익률" in text:
-                for _, row in df.iterrows():
-                    row_str = [str(v) for v in row.values]
-                    for i, val in enumerate(row_str):
-                        if "배당수익률" in val and i + 1 < len(row_str):
-                            try:
-                                result["배당수익률"] = float(row_str[i + 1].replace(",", "").replace("%", ""))
-                            except (ValueError, IndexError):
-                                pass
-
+        # 오른쪽 투자정보 칸(em#_per 등)만 읽음 — 없으면 예전처럼 모든 표를 훑음
+        result = extract_ratios(parse_document(resp))
+        if result is None:
+            result = _scan_ratio_tables(pd.read_html(StringIO(resp.text), encoding="euc-kr"))
         return result
 
     except Exception as e:
@@ -166,6 +308,55 @@ def get_financial_info(ticker: str) -> dict:
         return {}
 
 
+def _scan_ratio_tables(tables: list[pd.DataFrame]) -> dict:
+    """모든 표에서 PER/PBR/EPS/BPS/배당수익률 글자 옆 칸의 숫자 찾기 (페이지 모양이 바뀌었을 때)"""
+    result = {}
+
+    # 투자지표 테이블 찾기 (PER, EPS 등이 있는 테이블)
+    for df in tables:
+        cols = [str(c) for c in df.columns]
+        text = " ".join(cols + [str(v) for v in df.values.flatten()])
+
+        if "PER" in text and "EPS" in text:
+            # 테이블에서 값 추출
+            for _, row in df.iterrows():
+                row_str = [str(v) for v in row.values]
+                for i, val in enumerate(row_str):
+                    if "PER" in val and i + 1 < len(row_str):
+                        try:
+                            result["PER"] = float(row_str[i + 1].replace(",", "").replace("배", ""))
+                        except (ValueError, IndexError):
+                            pass
+                    if "PBR" in val and i + 1 < len(row_str):
+                        try:
+                            result["PBR"] = float(row_str[i + 1].replace(",", "").replace("배", ""))
+                        except (ValueError, IndexError):
+                            pass
+                    if "EPS" in val and "BPS" not in val and i + 1 < len(row_str):
+                        try:
+                            result["EPS"] = float(row_str[i + 1].replace(",", "").replace("원", ""))
+                        except (ValueError, IndexError):
+                            pass
+                    if "BPS" in val and i + 1 < len(row_str):
+                        try:
+                            result["BPS"] = float(row_str[i + 1].replace(",", "").replace("원", ""))
+                        except (ValueError, IndexError):
+                            pass
+
+        if "배당수익률" in text:
+            for _, row in df.iterrows():
+                row_str = [str(v) for v in row.values]
+                for i, val in enumerate(row_str):
+                    if "배당수익률" in val and i + 1 < len(row_str):
+                        try:
+                            result["배당수익률"] = float(row_str[i + 1].replace(",", "").replace("%", ""))
+                        except (ValueError, IndexError):
+                            pass
+
+    return result
+
+
+@cache_empty()
 def get_financial_statements(
     ticker: str,
     fin_typ: int = 0,
@@ -199,6 +390,7 @@ def get_financial_statements(
 # 3. 투자자별 매매동향 (외국인/기관)
 # ============================================================================
 
+@cache_empty()
 def get_investor_trading(
     ticker: str,
     pages: int = 1,
@@ -208,32 +400,31 @@ def get_investor_trading(
     (외국인과 큰 기관들이 이 종목을 사는지 파는지 알려줌)
     """
     url = "https://finance.naver.com/item/frgn.naver"
-    all_rows = []
-
-    for page in range(1, pages + 1):
-        try:
-            resp = _get(url, params={"code": ticker, "page": page})
-            tables = pd.read_html(StringIO(resp.text), encoding="euc-kr")
-            for df in tables:
-                # MultiIndex 컬럼 → 단일 레벨로 변환
-                if isinstance(df.columns, pd.MultiIndex):
-                    df.columns = ["_".join(str(c) for c in col).strip("_") for col in df.columns]
-                # 빈 행 제거
-                df = df.dropna(how="all")
-                # 날짜 컬럼이 있는 테이블만 (실제 데이터 테이블)
-                col_str = " ".join(str(c) for c in df.columns)
-                if ("날짜" in col_str or "일자" in col_str) and len(df) > 2:
-                    all_rows.append(df)
-        except Exception as e:
-            logger.warning(f"투자자 매매동향 페이지 {page} 실패: {e}")
-            continue
-
+    all_rows = fetch_pages(
+        url, pages, lambda page: {"code": ticker, "page": page}, _parse_frgn_page, "투자자 매매동향"
+    )
     if not all_rows:
         return pd.DataFrame()
 
     return pd.concat(all_rows, ignore_index=True)
 
 
+def _parse_frgn_page(resp) -> pd.DataFrame:
+    """외국인·기관 매매동향 페이지 → 날짜별 데이터 표"""
+    frames = []
+    for df in _read_tables(resp, DATE_TABLE):
+        # MultiIndex 컬럼 → 단일 레벨로 변환
+        if isinstance(df.columns, pd.MultiIndex):
+            df.columns = ["_".join(str(c) for c in col).strip("_") for col in df.columns]
+        # 빈 행 제거
+        df = df.dropna(how="all")
+        # 날짜 컬럼이 있는 테이블만 (실제 데이터 테이블)
+        col_str = " ".join(str(c) for c in df.columns)
+        if ("날짜" in col_str or "일자" in col_str) and len(df) > 2:
+            frames.append(df)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
 # ============================================================================
 # 4. ETF 전체 목록 (JSON API — 가장 깨끗한 엔드포인트!)
 # ============================================================================
@@ -310,6 +501,7 @@ def get_realtime_index(
 # 6. 주가 OHLCV (네이버 차트 API)
 # ============================================================================
 
+@cache_empty(date_arg="end")
 def get_ohlcv(
     ticker: str,
     start: str = "20260101",
@@ -333,35 +525,17 @@ def get_ohlcv(
 
     try:
         resp = _get(url, params=params)
-        # 응답이 JavaScript 배열 형태 (순수 JSON이 아님)
-        # [["20240102",66100,66300,65600,65800,10456789, ...], ...]
-        text = resp.text.strip()
-        data = ast.literal_eval(text)
-
-        if not data:
+        # 응답이 JavaScript 배열 형태 (순수 JSON이 아님) → 열별 NumPy 배열로 바로 파싱
+        # [['날짜', '시가', ...], ["20240102",66100,66300,65600,65800,10456789,52.1], ...]
+        columns = parse_sise_json(resp.content)
+        if not columns:
             return pd.DataFrame()
 
-        # 첫 행이 헤더일 수 있음
-        if isinstance(data[0][0], str) and not data[0][0].isdigit():
-            data = data[1:]
-
-        df = pd.DataFrame(data)
         # 컬럼: 날짜, 시가, 고가, 저가, 종가, 거래량, 외국인소진율
-        col_names = ["날짜", "시가", "고가", "저가", "종가", "거래량"]
-        if len(df.columns) >= 6:
-            df.columns = col_names + list(df.columns[6:])
-
-        # 날짜 정리
-        df["날짜"] = df["날짜"].astype(str).str.strip().str.replace("'", "")
-        df["날짜"] = pd.to_datetime(df["날짜"], format="%Y%m%d", errors="coerce")
+        df = pd.DataFrame(columns)
         df = df.dropna(subset=["날짜"])
         df = df.set_index("날짜")
 
-        # 숫자 변환
-        for col in ["시가", "고가", "저가", "종가", "거래량"]:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors="coerce")
-
         # 등락률 계산
         df["등락률"] = df["종가"].pct_change() * 100
 
@@ -384,30 +558,25 @@ def get_stock_list(
     네이버 금융 시가총액 페이지에서 종목코드 + 이름 추출
     (KOSPI 약 950개, KOSDAQ 약 1700개 종목)
     """
-    import re
-
     sosok = 0 if market == "KOSPI" else 1
     url = "https://finance.naver.com/sise/sise_market_sum.naver"
 
+    def parse(resp) -> list[tuple[str, str]]:
+        # HTML에서 종목코드 추출 (code=XXXXXX 패턴)
+        codes = re.findall(r'code=(\d{6})', resp.text)
+        # 종목명 추출 (class="tltle" 뒤의 텍스트)
+        names = re.findall(r'class="tltle"[^>]*>([^<]+)<', resp.text)
+        return list(zip(codes, (n.strip() for n in names)))
+
     results = []
-    for page in range(1, pages + 1):
-        try:
-            resp = _get(url, params={"sosok": sosok, "page": page})
-            # HTML에서 종목코드 추출 (code=XXXXXX 패턴)
-            codes = re.findall(r'code=(\d{6})', resp.text)
-            # 종목명 추출 (class="tltle" 뒤의 텍스트)
-            names = re.findall(r'class="tltle"[^>]*>([^<]+)<', resp.text)
-
-            for code, name in zip(codes, names):
-                if code not in [r["종목코드"] for r in results]:
-                    results.append({
-                        "종목코드": code,
-                        "종목명": name.strip(),
-                        "시장": market,
-                    })
-        except Exception as e:
-            logger.warning(f"종목목록 페이지 {page} 실패: {e}")
-            continue
+    seen = set()
+    for page_rows in fetch_pages(
+        url, pages, lambda page: {"sosok": sosok, "page": page}, parse, "종목목록"
+    ):
+        for code, name in page_rows:
+            if code not in seen:
+                seen.add(code)
+                results.append({"종목코드": code, "종목명": name, "시장": market})
 
     return pd.DataFrame(results)
 
@@ -435,7 +604,7 @@ def get_price_change_ranking(
 
     try:
         resp = _get(url, params={"sosok": sosok})
-        tables = pd.read_html(StringIO(resp.text), encoding="euc-kr")
+        tables = _read_tables(resp, STOCK_TABLE)
         for df in tables:
             if "종목명" in df.columns and len(df) > 3:
                 df = df.dropna(subset=["종목명"])
@@ -460,7 +629,7 @@ def get_sector_list() -> pd.DataFrame:
 
     try:
         resp = _get(url, params=params)
-        tables = pd.read_html(StringIO(resp.text), encoding="euc-kr")
+        tables = _read_tables(resp, SECTOR_TABLE)
         for df in tables:
             if len(df) > 5:
                 df = df.dropna(how="all")
@@ -507,6 +676,7 @@ def get_investor_trend_daily(
 # 11. 일별 시세 (시가/고가/저가/종가/거래량 - HTML 테이블)
 # ============================================================================
 
+@cache_empty()
 def get_daily_price(
     ticker: str,
     pages: int = 3,
@@ -516,20 +686,15 @@ def get_daily_price(
     (최근 며칠간의 주가 데이터를 테이블로 가져옴)
     """
     url = "https://finance.naver.com/item/sise_day.naver"
-    all_rows = []
-
-    for page in range(1, pages + 1):
-        try:
-            resp = _get(url, params={"code": ticker, "page": page})
-            tables = pd.read_html(StringIO(resp.text), encoding="euc-kr")
-            for df in tables:
-                if "날짜" in df.columns:
-                    df = df.dropna(subset=["날짜"])
-                    all_rows.append(df)
-        except Exception as e:
-            logger.warning(f"일별시세 페이지 {page} 실패: {e}")
-            continue
 
+    def parse(resp) -> pd.DataFrame:
+        tables = _read_tables(resp, DAILY_PRICE_TABLE)
+        frames = [df.dropna(subset=["날짜"]) for df in tables if "날짜" in df.columns]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    all_rows = fetch_pages(
+        url, pages, lambda page: {"code": ticker, "page": page}, parse, "일별시세"
+    )
     if not all_rows:
         return pd.DataFrame()
 
@@ -545,6 +710,7 @@ def get_daily_price(
 # 12. 외국인 보유현황 추이 (개별 종목)
 # ============================================================================
 
+@cache_empty()
 def get_foreign_holding(
     ticker: str,
     pages: int = 2,
@@ -554,24 +720,9 @@ def get_foreign_holding(
     (외국인이 이 회사 주식을 얼마나 갖고 있는지의 변화)
     """
     url = "https://finance.naver.com/item/frgn.naver"
-    all_rows = []
-
-    for page in range(1, pages + 1):
-        try:
-            resp = _get(url, params={"code": ticker, "page": page})
-            tables = pd.read_html(StringIO(resp.text), encoding="euc-kr")
-            for df in tables:
-                # MultiIndex 컬럼 → 단일 레벨
-                if isinstance(df.columns, pd.MultiIndex):
-                    df.columns = ["_".join(str(c) for c in col).strip("_") for col in df.columns]
-                df = df.dropna(how="all")
-                col_str = " ".join(str(c) for c in df.columns)
-                if ("날짜" in col_str or "일자" in col_str) and len(df) > 2:
-                    all_rows.append(df)
-        except Exception as e:
-            logger.warning(f"외국인 보유현황 페이지 {page} 실패: {e}")
-            continue
-
+    all_rows = fetch_pages(
+        url, pages, lambda page: {"code": ticker, "page": page}, _parse_frgn_page, "외국인 보유현황"
+    )
     if not all_rows:
         return pd.DataFrame()
     return pd.concat(all_rows, ignore_index=True)
@@ -581,6 +732,7 @@ def get_foreign_holding(
 # 13. 업종별 종목 목록 (특정 업종의 종목들)
 # ============================================================================
 
+@cache_empty()
 def get_sector_stocks(no: str) -> pd.DataFrame:
     """
     네이버 금융 → 특정 업종에 속한 종목 목록
@@ -590,7 +742,7 @@ def get_sector_stocks(no: str) -> pd.DataFrame:
 
     try:
         resp = _get(url, params={"type": "upjong", "no": no})
-        tables = pd.read_html(StringIO(resp.text), encoding="euc-kr")
+        tables = _read_tables(resp, STOCK_TABLE)
         for df in tables:
             if "종목명" in df.columns and len(df) > 1:
                 df = df.dropna(subset=["종목명"])
@@ -0,0 +1,263 @@
+"""
+네이버 금융 HTML 표 추출 — pd.read_html 대신 필요한 표만 lxml로
+================================================================
+pd.read_html은 페이지의 모든 <table>(메뉴, 광고, 페이지 번호 표까지)을
+하나하나 DataFrame으로 만들고, 우리는 그중 하나만 쓰고 나머지는 버렸어요.
+페이지 수백 장을 긁을 때는 이 파싱이 CPU를 가장 많이 썼습니다.
+
+TableSelector는 (초등학생 설명):
+  - 찾을 표의 위치(XPath)를 모듈을 읽을 때 한 번만 외워두고
+  - 페이지에서 그 표만 골라요 (메뉴/광고 표는 쳐다보지도 않음)
+  - 제목 줄(th)과 데이터 줄(td)의 글자만 뽑아서
+  - read_html과 똑같은 규칙으로 열 이름과 숫자 타입을 정해요
+    (colspan/rowspan 펼치기, 쉼표 빼고 숫자 변환, 2줄 제목은 MultiIndex)
+  → 표를 못 찾으면 None — 호출하는 쪽이 예전처럼 pd.read_html로 처리
+
+사용법:
+  doc = parse_document(resp)
+  frames = STOCK_TABLE.extract(doc)   # 찾은 표마다 DataFrame (못 찾으면 None)
+  ratios = extract_ratios(doc)        # 종목 메인 페이지 PER/EPS/PBR/BPS/배당수익률
+"""
+
+import logging
+import re
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+# read_html과 같은 셀 공백 정리 (줄바꿈, 2칸 이상 공백 → 한 칸)
+_WHITESPACE = re.compile(r"[\r\n]+|\s{2,}")
+
+# pd.read_html이 결측으로 보는 글자 (pandas 기본 na_values)
+_NA_VALUES = frozenset({
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND",
+    "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+})
+
+# libxml2가 모르는 확장 한글(똠, 햏 등)까지 읽도록 EUC-KR은 CP949로
+_LXML_ENCODINGS = {"euc-kr": "cp949", "euc_kr": "cp949", "ks_c_5601-1987": "cp949"}
+
+# 표 안의 줄/칸 (중첩 표의 줄은 건너뜀)
+_HEAD_ROWS = etree.XPath("./thead/tr")
+_BODY_ROWS = etree.XPath("./tbody/tr | ./tr")
+_FOOT_ROWS = etree.XPath("./tfoot/tr")
+_CELLS = etree.XPath("./td | ./th")
+_TEXT = etree.XPath("string()")
+_BREAKS = etree.XPath(".//br")
+# read_html(displayed_only=True)처럼 <style>과 display:none 요소는 빼고 읽음
+_STYLED = etree.XPath(".//style | .//*[@style]")
+
+
+def _header_is(condition: str) -> str:
+    """제목 칸(th)이 condition을 만족하는 표를 찾는 XPath"""
+    return f"//table[(./thead/tr | ./tbody/tr | ./tr)/th[{condition}]]"
+
+
+def parse_document(resp):
+    """requests 응답 → lxml 문서 (본문이 비어 있으면 None)
+
+    resp.text로 한 번 디코딩하지 않고, 바이트를 응답 인코딩 그대로 libxml2에 넘김.
+    """
+    if not resp.content or not resp.content.strip():
+        return None
+    encoding = resp.encoding
+    if encoding:
+        encoding = _LXML_ENCODINGS.get(encoding.lower(), encoding)
+    try:
+        return etree.fromstring(resp.content, parser=etree.HTMLParser(encoding=encoding))
+    except (etree.XMLSyntaxError, LookupError) as e:
+        logger.debug(f"lxml 파싱 실패 → read_html로 처리: {e}")
+        return None
+
+
+def _cell_text(cell) -> str:
+    return _WHITESPACE.sub(" ", _TEXT(cell).strip())
+
+
+def _expand_spans(rows) -> list[list[str]]:
+    """<tr> 목록 → 글자 줄 목록 (colspan/rowspan 칸은 read_html처럼 복사)"""
+    texts_rows = []
+    remainder: list[tuple[int, str, int]] = []  # (열 위치, 글자, 남은 줄 수)
+    for tr in rows:
+        texts = []
+        next_remainder = []
+        index = 0
+        for cell in _CELLS(tr):
+            # 윗줄에서 rowspan으로 내려온 칸을 먼저 채움
+            while remainder and remainder[0][0] <= index:
+                prev_i, prev_text, prev_rows = remainder.pop(0)
+                texts.append(prev_text)
+                if prev_rows > 1:
+                    next_remainder.append((prev_i, prev_text, prev_rows - 1))
+                index += 1
+            text = _cell_text(cell)
+            rowspan = cell.get("rowspan")
+            colspan = cell.get("colspan")
+            if rowspan is None and colspan is None:
+                texts.append(text)
+                index += 1
+                continue
+            rowspan = int(rowspan or 1)
+            for _ in range(int(colspan or 1)):
+                texts.append(text)
+                if rowspan > 1:
+                    next_remainder.append((index, text, rowspan - 1))
+                index += 1
+        for prev_i, prev_text, prev_rows in remainder:
+            texts.append(prev_text)
+            if prev_rows > 1:
+                next_remainder.append((prev_i, prev_text, prev_rows - 1))
+        texts_rows.append(texts)
+        remainder = next_remainder
+    # 마지막 줄 아래로 rowspan이 남은 경우
+    while remainder:
+        texts_rows.append([text for _, text, _ in remainder])
+        remainder = [(i, text, n - 1) for i, text, n in remainder if n > 1]
+    return texts_rows
+
+
+def table_to_frame(table) -> pd.DataFrame:
+    """<table> 요소 하나 → DataFrame (pd.read_html이 그 표로 만드는 것과 같은 결과)"""
+    for element in _STYLED(table):
+        if element.tag == "style" or "display:none" in element.get("style", "").replace(" ", ""):
+            element.drop_tree()
+    for br in _BREAKS(table):
+        br.tail = "\n" + (br.tail or "")
+
+    head = _HEAD_ROWS(table)
+    body = _BODY_ROWS(table)
+    if not head:
+        # <thead>가 없으면 위쪽의 th로만 된 줄이 제목
+        while body and all(cell.tag == "th" for cell in _CELLS(body[0])):
+            head.append(body.pop(0))
+
+    header_rows = _expand_spans(head)
+    rows = header_rows + _expand_spans(body) + _expand_spans(_FOOT_ROWS(table))
+    if not rows:
+        return pd.DataFrame()
+    width = max(len(row) for row in rows)
+    rows = [row + [""] * (width - len(row)) for row in rows]
+
+    n_head = len(header_rows)
+    if n_head > 1:
+        # 글자가 하나도 없는 제목 줄은 빼고 MultiIndex
+        header_rows = [row for row in rows[:n_head] if any(row)]
+    columns = _column_names(rows[:n_head] if n_head == 1 else header_rows, width)
+    values = list(zip(*rows[n_head:])) or [()] * width
+    return pd.DataFrame(
+        {i: _typed_column(cells) for i, cells in enumerate(values)}
+    ).set_axis(columns, axis=1)
+
+
+def _column_names(header_rows: list[list[str]], width: int):
+    """제목 줄 → 열 이름 (read_html처럼 빈 칸은 Unnamed, 1줄 제목의 중복은 .1 .2)"""
+    if not header_rows:
+        return pd.RangeIndex(width)
+    if len(header_rows) == 1:
+        names, seen = [], {}
+        for i, text in enumerate(header_rows[0]):
+            name = text or f"Unnamed: {i}"
+            if name in seen:
+                seen[name] += 1
+                name = f"{name}.{seen[name]}"
+            else:
+                seen[name] = 0
+            names.append(name)
+        return pd.Index(names, dtype=object)
+    return pd.MultiIndex.from_tuples([
+        tuple(text or f"Unnamed: {i}_level_{level}" for level, text in enumerate(col))
+        for i, col in enumerate(zip(*header_rows))
+    ])
+
+
+def _typed_column(cells) -> np.ndarray:
+    """셀 글자들 → 숫자 열(쉼표 제거) 또는 글자 열 (read_html 기본 결측 표기는 NaN)
+
+    결측이 없고 모두 정수면 int64, 아니면 float64, 숫자가 아닌 칸이 있으면 글자 그대로.
+    """
+    if not cells:
+        return np.array([], dtype=object)
+    values = [None if cell in _NA_VALUES else cell.replace(",", "") for cell in cells]
+    has_na = None in values
+    numbers = np.array(["nan" if v is None else v for v in values] if has_na else values)
+    if not has_na:
+        try:
+            return numbers.astype(np.int64)
+        except (ValueError, OverflowError):
+            pass
+    try:
+        return numbers.astype(np.float64)
+    except ValueError:
+        return np.array([np.nan if cell in _NA_VALUES else cell for cell in cells], dtype=object)
+
+
+class TableSelector:
+    """페이지에서 찾을 표 (XPath는 만들 때 한 번만 컴파일)"""
+
+    def __init__(self, name: str, xpath: str):
+        self.name = name
+        self._find = etree.XPath(xpath)
+
+    def extract(self, doc) -> Optional[list[pd.DataFrame]]:
+        """찾은 표마다 DataFrame (문서가 없거나 표를 못 찾으면 None)"""
+        if doc is None:
+            return None
+        tables = self._find(doc)
+        if not tables:
+            logger.debug(f"네이버 표 선택자 불일치 ({self.name}) → read_html로 처리")
+            return None
+        return [table_to_frame(table) for table in tables]
+
+
+# ── 페이지별 대상 표 ──
+
+# 시가총액/등락률/업종 상세 페이지의 종목 표 (제목 칸 "종목명")
+STOCK_TABLE = TableSelector("종목 표", _header_is("normalize-space(.)='종목명'"))
+
+# 외국인·기관 매매동향 표 (제목 칸에 "날짜"/"일자")
+DATE_TABLE = TableSelector("날짜별 표", _header_is("contains(., '날짜') or contains(., '일자')"))
+
+# 일별시세 표 (제목 칸 "날짜")
+DAILY_PRICE_TABLE = TableSelector("일별시세 표", _header_is("normalize-space(.)='날짜'"))
+
+# 업종별 시세 표 (제목 칸 "업종명")
+SECTOR_TABLE = TableSelector("업종 표", _header_is("normalize-space(.)='업종명'"))
+
+
+# ── 종목 메인 페이지 투자지표 ──
+
+# 오른쪽 "투자정보" 칸의 <em id="_per"> 등 (BPS는 PBR 바로 뒤 <em>)
+_RATIO_IDS = {"PER": "_per", "EPS": "_eps", "PBR": "_pbr", "배당수익률": "_dvr"}
+_EM_BY_ID = etree.XPath("//em[@id=$id][1]")
+_BPS_EM = etree.XPath("//em[@id='_pbr'][1]/following-sibling::em[1]")
+
+
+def _em_number(ems) -> Optional[float]:
+    if not ems:
+        return None
+    try:
+        return float(_TEXT(ems[0]).strip().replace(",", ""))
+    except ValueError:
+        return None  # N/A, 빈 칸
+
+
+def extract_ratios(doc) -> Optional[dict]:
+    """종목 메인 페이지 → {"PER": 12.5, "EPS": 5700, "PBR": 1.2, "BPS": 59000, "배당수익률": 2.1}
+
+    투자정보 칸(em#_per)이 없으면 None (페이지 모양이 바뀜 → 호출하는 쪽이 표 전체를 훑음)
+    """
+    if doc is None or not _EM_BY_ID(doc, id="_per"):
+        return None
+    result = {}
+    for key, em_id in _RATIO_IDS.items():
+        value = _em_number(_EM_BY_ID(doc, id=em_id))
+        if value is not None:
+            result[key] = value
+    bps = _em_number(_BPS_EM(doc))
+    if bps is not None:
+        result["BPS"] = bps
+    return result
@@ -0,0 +1,123 @@
+"""
+네이버 차트 API(siseJson) 응답 파서 — ast.literal_eval 대신 NumPy 배열로 바로
+============================================================================
+siseJson.naver는 JSON이 아니라 JavaScript 배열 글자를 돌려줘요:
+
+  [['날짜', '시가', '고가', '저가', '종가', '거래량', '외국인소진율'],
+  ["20240102", 78200, 79800, 78200, 79600, 17142847, 53.39],
+  ...
+  ]
+
+예전에는 이걸 통째로 ast.literal_eval에 넣어서 줄마다 파이썬 리스트/문자열/숫자
+객체를 만들고, 그걸 다시 DataFrame으로 옮겼어요. 몇 년치 일봉이면 느리고,
+null 같은 JavaScript 글자가 하나만 섞여도 전체가 실패했습니다.
+
+parse_sise_json은 (초등학생 설명):
+  - 첫 줄이 제목 줄(['날짜', ...])이면 열 개수만 읽고 건너뛰고
+  - 나머지 글자에서 괄호/따옴표/공백을 한 번에 지우면 "값,값,값,..." 한 줄이 남고
+  - 그 줄을 np.fromstring으로 한 번에 읽어서 열마다 NumPy 배열로 나눠요
+    (날짜 → datetime64, 시가~거래량 → int64, 외국인소진율 → float64)
+  → 줄마다 파이썬 객체를 만들지 않음 (글자 처리는 모두 bytes/NumPy의 C 연산)
+  - 숫자로 못 읽는 칸(null 등)이 있는 열만 NaN으로 (예전 to_numeric(errors="coerce")와 같음)
+  - 날짜로 못 읽는 칸은 NaT (호출하는 쪽에서 그 줄을 버림)
+
+사용법:
+  columns = parse_sise_json(resp.content)   # {"날짜": datetime64[ns], "시가": int64, ...}
+  df = pd.DataFrame(columns)
+"""
+
+import numpy as np
+import pandas as pd
+
+# 열 위치별 이름 (네이버 제목 줄과 같은 순서)
+SISE_COLUMNS = ("날짜", "시가", "고가", "저가", "종가", "거래량", "외국인소진율")
+
+# 위치 1~5는 정수(가격/거래량), 6부터는 실수
+_INT_END = 6
+
+# 값 사이의 괄호/따옴표/공백 — 모두 지우면 "값,값,값,..." 한 줄이 남음
+_DELETE = b"[]\"' \t\r\n"
+
+# 이 글자들로만 되어 있으면 np.fromstring이 끝까지 읽을 수 있음
+_NUMBER_CHARS = b"0123456789.,-+eE"
+
+
+def _split_header(text: bytes) -> tuple[list[str], bytes, int]:
+    """→ (제목 줄 열 이름, 데이터 부분, 열 개수). 제목 줄이 없으면 첫 줄로 열 개수를 셈"""
+    start = text.find(b"[", 1)
+    end = text.find(b"]", start)
+    if start < 0 or end < 0:
+        return [], b"", 0
+    first = [cell.strip(_DELETE) for cell in text[start + 1:end].split(b",")]
+    if first[0].isdigit():
+        return [], text[start:], len(first)
+    header = [cell.decode("utf-8", "replace") for cell in first]
+    return header, text[end + 1:], len(header)
+
+
+def _ymd_dates(ymd: np.ndarray) -> np.ndarray:
+    """정수 20240102 → datetime64[ns] (2월 30일처럼 없는 날짜는 NaT)"""
+    year, md = np.divmod(ymd, 10000)
+    month, day = np.divmod(md, 100)
+    month_start = (year - 1970).astype("M8[Y]").astype("M8[M]") + (month - 1).astype("m8[M]")
+    dates = month_start.astype("M8[D]") + (day - 1).astype("m8[D]")
+    valid = (month >= 1) & (month <= 12) & (day >= 1) & (dates.astype("M8[M]") == month_start)
+    return np.where(valid, dates, np.datetime64("NaT")).astype("M8[ns]")
+
+
+def _from_floats(i: int, values: np.ndarray) -> np.ndarray:
+    """모두 숫자인 응답의 열 하나 (float64로 한 번에 읽은 것) → 열 타입"""
+    if i == 0:
+        return _ymd_dates(values.astype(np.int64))
+    if i < _INT_END and (values == np.trunc(values)).all():
+        return values.astype(np.int64)
+    return values.copy()
+
+
+def _from_bytes(i: int, cells: np.ndarray) -> np.ndarray:
+    """숫자가 아닌 칸(null 등)이 섞인 응답의 열 하나 → 열 타입 (못 읽는 칸은 NaT/NaN)"""
+    if i == 0:
+        try:
+            return _ymd_dates(cells.astype(np.int64))
+        except ValueError:
+            return pd.to_datetime(cells.astype(str), format="%Y%m%d", errors="coerce").to_numpy()
+    try:
+        return cells.astype(np.int64 if i < _INT_END else np.float64)
+    except ValueError:
+        return pd.to_numeric(pd.Series(cells.astype(str)), errors="coerce").to_numpy()
+
+
+def parse_sise_json(body: bytes) -> dict[str, np.ndarray]:
+    """siseJson.naver 응답 → 열 이름별 NumPy 배열 (데이터가 없으면 빈 dict)
+
+    Raises:
+        ValueError: 배열 응답이 아니거나 줄마다 칸 수가 다름 (HTML 오류 페이지 등)
+    """
+    text = body.strip()
+    if not text.startswith(b"["):
+        raise ValueError(f"siseJson 응답이 배열이 아님: {text[:40]!r}")
+    header, data, width = _split_header(text)
+    flat = data.translate(None, _DELETE).strip(b",")
+    if not width or not flat:
+        return {}
+
+    count = flat.count(b",") + 1
+    if count % width:
+        raise ValueError(f"siseJson 칸 수가 맞지 않음 (값 {count}개, 열 {width}개)")
+    grid = None
+    if b",," not in flat and not flat.translate(None, _NUMBER_CHARS):
+        # 모두 숫자 → 한 번에 float64로 읽음 (날짜/가격/거래량 모두 2^53 안이라 정확)
+        values = np.fromstring(flat, dtype=np.float64, sep=",")
+        if values.size == count:
+            grid, convert = values.reshape(-1, width), _from_floats
+    if grid is None:
+        grid, convert = np.array(flat.split(b",")).reshape(-1, width), _from_bytes
+
+    columns = {}
+    for i in range(width):
+        if i < len(SISE_COLUMNS):
+            name = SISE_COLUMNS[i]
+        else:
+            name = header[i] if header else i
+        columns[name] = convert(i, grid[:, i])
+    return columns
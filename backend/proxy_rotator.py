@@ -14,6 +14,13 @@ import logging
 from typing import Optional
 from fp.fp import FreeProxy
 
+try:
+    from .adaptive_concurrency import BACKOFF_STATUS, get_adaptive_concurrency
+    from .rate_limiter import get_rate_limiter
+except ImportError:
+    from adaptive_concurrency import BACKOFF_STATUS, get_adaptive_concurrency
+    from rate_limiter import get_rate_limiter
+
 logger = logging.getLogger(__name__)
 
 
@@ -139,6 +146,8 @@ class PyKRXProxyPatcher:
 
         pool = self.pool  # 클로저에서 참조
         patcher = self  # HTTPS 패치 메서드 참조
+        limiter = get_rate_limiter()  # 호스트별 속도 제한 (KRX/네이버 공용)
+        aimd = get_adaptive_concurrency()  # 호스트별 적응형 동시 요청 제한
 
         # KrxWebIo.url과 KrxFutureIo.url도 HTTPS로 패치
         krxio.KrxWebIo.url = property(
@@ -156,15 +165,23 @@ class PyKRXProxyPatcher:
             for attempt in range(max_retries):
                 proxy_dict = pool.next()
                 try:
-                    resp = requests.get(
-                        url,
-                        headers=headers,
-                        params=params,
-                        proxies=proxy_dict if proxy_dict else None,
-                        timeout=30,
-                    )
+                    with aimd.slot(url) as slot:
+                        limiter.acquire(url)
+                        resp = requests.get(
+                            url,
+                            headers=headers,
+                            params=params,
+                            proxies=proxy_dict if proxy_dict else None,
+                            timeout=30,
+                        )
+                        if resp.status_code in BACKOFF_STATUS:
+                            # 차단 신호 → 이 호스트의 동시 요청 창 축소
+                            slot.backoff(f"HTTP {resp.status_code}")
                     if resp.status_code == 200:
                         return resp
+                    if not proxy_dict:
+                        # 직접 연결이면 호스트 전체를 Retry-After만큼 보류
+                        limiter.note_response(url, resp.status_code, resp.headers)
                     if resp.status_code in (403, 429, 503):
                         logger.warning(f"IP 차단 감지 (GET {resp.status_code}), 프록시 교체...")
                         pool.mark_failed(proxy_dict)
@@ -178,6 +195,7 @@ class PyKRXProxyPatcher:
                     pool.mark_failed(proxy_dict)
                     continue
             logger.warning("모든 프록시 실패, 직접 연결 시도...")
+            limiter.acquire(url)
             return requests.get(url, headers=headers, params=params, timeout=30)
 
         def proxied_post_read(wio_self, **params):
@@ -189,15 +207,23 @@ class PyKRXProxyPatcher:
             for attempt in range(max_retries):
                 proxy_dict = pool.next()
                 try:
-                    resp = requests.post(
-                        url,
-                        headers=headers,
-                        data=params,
-                        proxies=proxy_dict if proxy_dict else None,
-                        timeout=30,
-                    )
+                    with aimd.slot(url) as slot:
+                        limiter.acquire(url)
+                        resp = requests.post(
+                            url,
+                            headers=headers,
+                            data=params,
+                            proxies=proxy_dict if proxy_dict else None,
+                            timeout=30,
+                        )
+                        if resp.status_code in BACKOFF_STATUS:
+                            # 차단 신호 → 이 호스트의 동시 요청 창 축소
+                            slot.backoff(f"HTTP {resp.status_code}")
                     if resp.status_code == 200:
                         return resp
+                    if not proxy_dict:
+                        # 직접 연결이면 호스트 전체를 Retry-After만큼 보류
+                        limiter.note_response(url, resp.status_code, resp.headers)
                     if resp.status_code in (403, 429, 503):
                         logger.warning(f"IP 차단 감지 (POST {resp.status_code}), 프록시 교체...")
                         pool.mark_failed(proxy_dict)
@@ -211,6 +237,7 @@ class PyKRXProxyPatcher:
                     pool.mark_failed(proxy_dict)
                     continue
             logger.warning("모든 프록시 실패, 직접 연결 시도...")
+            limiter.acquire(url)
             return requests.post(url, headers=headers, data=params, timeout=30)
 
         webio.Get.read = proxied_get_read
@@ -0,0 +1,273 @@
+"""
+업스트림 호스트별 요청 속도 제한 (token bucket)
+================================================
+지금까지는 요청마다 time.sleep(0.3~0.5)을 넣어서 IP 차단을 피했어요.
+하지만 요청을 동시에 여러 개 보내면 각자 자기만 쉬기 때문에
+호스트 입장에서는 전혀 느려지지 않고, 혼자 보낼 때는 괜히 기다리게 됩니다.
+
+RateLimiter는 (초등학생 설명):
+  - 호스트(naver, krx...)마다 "번호표 통"을 하나씩 두고
+  - 통에는 1초에 rate장씩 번호표가 채워져요 (최대 burst장까지)
+  - 요청을 보내려면 번호표를 한 장 뽑아야 하고, 없으면 채워질 때까지 기다려요
+  → 스레드/코루틴이 몇 개든 호스트로 나가는 속도는 rate 이하로 유지
+  - 서버가 429/503 + Retry-After로 "잠깐 쉬어!"라고 하면
+    그 시간 동안은 그 호스트로 가는 모든 요청이 기다려요
+
+설정:
+  KRX_RATE_LIMITS="api.finance.naver.com=10:20,finance.naver.com=4"  (초당 요청 수[:burst])
+  KRX_RATE_DEFAULT=5
+  KRX_RATE_BACKOFF_SEC=5   (Retry-After 없이 429/503을 받았을 때 쉬는 시간)
+
+사용법:
+  limiter = get_rate_limiter()
+  limiter.acquire(url)                   # 스레드 코드
+  await limiter.acquire_async(url)       # asyncio 코드
+  limiter.note_response(url, resp.status_code, resp.headers)
+
+  # 또는 한 번에
+  resp = limited_request(session, "POST", url, data=data)
+  resp = await limited_request_async(client, "POST", url, data=data)
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+from urllib.parse import urlparse
+
+try:
+    from .adaptive_concurrency import BACKOFF_STATUS, get_adaptive_concurrency
+except ImportError:
+    from adaptive_concurrency import BACKOFF_STATUS, get_adaptive_concurrency
+
+logger = logging.getLogger(__name__)
+
+# 호스트별 기본 (초당 요청 수, burst)
+HOST_RATES = {
+    "data.krx.co.kr": (5.0, 5.0),
+    "finance.naver.com": (4.0, 4.0),        # HTML 페이지
+    "api.finance.naver.com": (10.0, 10.0),  # 차트 API (가벼운 JSON)
+    "polling.finance.naver.com": (10.0, 10.0),  # 실시간 지수 폴링
+}
+
+# 목록에 없는 호스트의 속도
+DEFAULT_RATE = float(os.environ.get("KRX_RATE_DEFAULT", "5"))
+
+# Retry-After 없이 429/503을 받았을 때 호스트 전체를 쉬게 하는 시간 (초)
+DEFAULT_BACKOFF = float(os.environ.get("KRX_RATE_BACKOFF_SEC", "5"))
+
+# Retry-After를 믿을 최대 시간 (초) — 이상한 값으로 오래 멈추지 않도록
+MAX_RETRY_AFTER = 300.0
+
+# 속도 제한 대상 응답 코드
+THROTTLE_STATUS = (429, 503)
+
+
+def _parse_rates(value: str) -> dict[str, tuple[float, float]]:
+    rates = {}
+    for part in value.split(","):
+        host, _, spec = part.strip().partition("=")
+        if not host or not spec:
+            continue
+        rate, _, burst = spec.partition(":")
+        try:
+            rates[host.strip()] = (float(rate), float(burst or rate))
+        except ValueError:
+            logger.warning(f"KRX_RATE_LIMITS 항목 무시: {part!r}")
+    return rates
+
+
+HOST_RATES.update(_parse_rates(os.environ.get("KRX_RATE_LIMITS", "")))
+
+
+def host_of(url_or_host: str) -> str:
+    """URL이면 호스트만, 이미 호스트면 그대로"""
+    if "://" in url_or_host:
+        return urlparse(url_or_host).hostname or url_or_host
+    return url_or_host
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더 (초 또는 HTTP 날짜) → 기다릴 초"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if at.tzinfo is None:
+        at = at.replace(tzinfo=timezone.utc)
+    return max(0.0, (at - datetime.now(timezone.utc)).total_seconds())
+
+
+class _Bucket:
+    __slots__ = (
+        "rate", "burst", "tokens", "updated", "blocked_until",
+        "acquired", "waited", "max_wait", "throttled",
+    )
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.acquired = 0
+        self.waited = 0.0
+        self.max_wait = 0.0
+        self.throttled = 0
+
+    def refill(self, now: float):
+        # 쉬는 중(Retry-After)에는 번호표가 채워지지 않음
+        elapsed = max(0.0, now - max(self.updated, self.blocked_until))
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+        self.updated = max(now, self.updated)
+
+
+class RateLimiter:
+    """호스트별 token bucket (스레드 + asyncio 안전)
+
+    대기 시간 계산은 락 안에서 예약만 하고 끝내므로(번호표를 미리 뽑아둠),
+    실제 기다리기는 스레드는 time.sleep, 코루틴은 asyncio.sleep으로 따로 합니다.
+    """
+
+    def __init__(
+        self,
+        rates: Optional[dict[str, tuple[float, float]]] = None,
+        default_rate: float = DEFAULT_RATE,
+    ):
+        self.rates = dict(HOST_RATES if rates is None else rates)
+        self.default_rate = default_rate
+        self._lock = threading.Lock()
+        self._buckets: dict[str, _Bucket] = {}
+
+    def _bucket(self, host: str) -> _Bucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate, burst = self.rates.get(host, (self.default_rate, self.default_rate))
+            bucket = _Bucket(rate, burst)
+            self._buckets[host] = bucket
+        return bucket
+
+    def _reserve(self, host: str) -> float:
+        """번호표 한 장 예약 → 기다려야 할 초"""
+        with self._lock:
+            bucket = self._bucket(host)
+            now = time.monotonic()
+            bucket.refill(now)
+            # 음수까지 빌려 쓰고, 그만큼 기다리게 함 (먼저 온 순서대로)
+            bucket.tokens -= 1
+            wait = max(0.0, -bucket.tokens / bucket.rate) + max(0.0, bucket.blocked_until - now)
+            bucket.acquired += 1
+            bucket.waited += wait
+            bucket.max_wait = max(bucket.max_wait, wait)
+            return wait
+
+    def acquire(self, url_or_host: str) -> float:
+        """요청 전에 호출. 속도 한도를 넘으면 잠시 기다림 (기다린 초 반환)"""
+        wait = self._reserve(host_of(url_or_host))
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, url_or_host: str) -> float:
+        """acquire의 asyncio 버전 (이벤트 루프를 막지 않고 기다림)"""
+        wait = self._reserve(host_of(url_or_host))
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def block(self, url_or_host: str, seconds: float):
+        """호스트 전체를 seconds 동안 쉬게 함 (이미 더 길게 쉬는 중이면 유지)"""
+        seconds = min(max(0.0, seconds), MAX_RETRY_AFTER)
+        host = host_of(url_or_host)
+        with self._lock:
+            bucket = self._bucket(host)
+            now = time.monotonic()
+            bucket.refill(now)
+            bucket.blocked_until = max(bucket.blocked_until, now + seconds)
+            bucket.tokens = min(bucket.tokens, 0.0)
+            bucket.throttled += 1
+        logger.warning(f"속도 제한 응답 ({host}) — {seconds:.1f}초 동안 요청 보류")
+
+    def note_response(self, url_or_host: str, status_code: int, headers: Optional[Mapping] = None) -> bool:
+        """응답을 보고 429/503이면 Retry-After(없으면 기본값)만큼 쉬게 함
+
+        Returns:
+            속도 제한 응답이었는지
+        """
+        if status_code not in THROTTLE_STATUS:
+            return False
+        retry_after = parse_retry_after((headers or {}).get("Retry-After"))
+        self.block(url_or_host, DEFAULT_BACKOFF if retry_after is None else retry_after)
+        return True
+
+    def status(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            for b in self._buckets.values():
+                b.refill(now)
+            return {
+                "default_rate": self.default_rate,
+                "default_backoff_sec": DEFAULT_BACKOFF,
+                "hosts": {
+                    host: {
+                        "rate": b.rate,
+                        "burst": b.burst,
+                        "tokens": round(b.tokens, 2),
+                        "acquired": b.acquired,
+                        "waited_sec": round(b.waited, 2),
+                        "max_wait_sec": round(b.max_wait, 2),
+                        "throttled": b.throttled,
+                        "blocked_for_sec": round(max(0.0, b.blocked_until - now), 1),
+                    }
+                    for host, b in sorted(self._buckets.items())
+                },
+            }
+
+
+def limited_request(session, method: str, url: str, **kwargs):
+    """requests 세션 요청
+
+    동시 요청 자리(AIMD) → 속도 제한 대기 → 전송 → 403/429/503이면
+    동시 요청 창을 줄이고 (429/503은 Retry-After만큼 호스트 보류)
+    """
+    limiter = get_rate_limiter()
+    with get_adaptive_concurrency().slot(url) as slot:
+        limiter.acquire(url)
+        resp = session.request(method, url, **kwargs)
+        limiter.note_response(url, resp.status_code, resp.headers)
+        if resp.status_code in BACKOFF_STATUS:
+            slot.backoff(f"HTTP {resp.status_code}")
+    return resp
+
+
+async def limited_request_async(client, method: str, url: str, **kwargs):
+    """httpx.AsyncClient 요청 (limited_request의 asyncio 버전)"""
+    limiter = get_rate_limiter()
+    async with get_adaptive_concurrency().slot_async(url) as slot:
+        await limiter.acquire_async(url)
+        resp = await client.request(method, url, **kwargs)
+        limiter.note_response(url, resp.status_code, resp.headers)
+        if resp.status_code in BACKOFF_STATUS:
+            slot.backoff(f"HTTP {resp.status_code}")
+    return resp
+
+
+# 전역 싱글톤
+_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """호스트별 속도 제한기 싱글톤"""
+    global _limiter
+    if _limiter is None:
+        _limiter = RateLimiter()
+    return _limiter
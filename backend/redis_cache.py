@@ -0,0 +1,303 @@
+"""
+공유 캐시 백엔드 — Redis 프로토콜 서버에 DataFrame 저장
+========================================================
+uvicorn 워커를 여러 개 띄우면 워커마다 메모리 캐시가 따로 있어서
+같은 KRX 데이터를 워커 수만큼 받아오게 됩니다.
+
+RedisCache는 (초등학생 설명):
+  - 모든 워커가 같이 쓰는 "공용 냉장고"(Redis)에 데이터를 넣어두고
+  - 어느 워커든 먼저 받아온 데이터를 다른 워커도 꺼내 먹게 해줘요
+
+저장 형식:
+  키 = {KRX_CACHE_PREFIX}{krx_schema.FORMAT_VERSION}:{namespace}:{endpoint}:{파라미터 해시}
+  값 = [저장 시각, 만료 시각 (각 8바이트 double)] + Parquet 바이트
+  - Redis 만료(PX)는 TTL + STALE_KEEP → 만료 후에도 잠깐 남겨서
+    stale-while-revalidate용 peek()에 사용
+
+외부 패키지 없이 RESP(REdis Serialization Protocol)를 직접 구현하므로
+Redis, Valkey, KeyDB 같은 호환 서버나 테스트용 로컬 대체 서버와 모두 동작합니다.
+
+서버 장애 중에는 연결에 한 번 실패하면 KRX_CACHE_RETRY_SEC(기본 5초) 동안
+연결을 시도하지 않고 바로 "캐시 없음"으로 처리합니다 (status의 skipped).
+
+사용법:
+  export KRX_CACHE_URL=redis://:password@localhost:6379/0
+"""
+
+import hashlib
+import io
+import logging
+import os
+import socket
+import struct
+import threading
+import time
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+import pandas as pd
+
+try:
+    from .krx_cache import CacheBackend
+    from .krx_schema import FORMAT_VERSION
+except ImportError:
+    from krx_cache import CacheBackend
+    from krx_schema import FORMAT_VERSION
+
+logger = logging.getLogger(__name__)
+
+# 키 접두어 (같은 서버를 다른 용도와 함께 쓸 때 구분)
+KEY_PREFIX = os.environ.get("KRX_CACHE_PREFIX", "krx:")
+
+# 만료 후에도 peek()용으로 남겨두는 시간 (초)
+STALE_KEEP = int(os.environ.get("KRX_CACHE_STALE_KEEP_SEC", "3600"))
+
+# 소켓 타임아웃 (초) — 캐시가 느리면 KRX로 가는 편이 나음
+SOCKET_TIMEOUT = float(os.environ.get("KRX_CACHE_TIMEOUT_SEC", "2"))
+
+# 연결 실패 후 이 시간(초) 동안은 연결을 시도하지 않고 바로 캐시 없음으로 처리
+# (장애 중에 요청마다 SOCKET_TIMEOUT씩 기다리지 않도록)
+RETRY_AFTER = float(os.environ.get("KRX_CACHE_RETRY_SEC", "5"))
+
+# 헤더: 저장 시각, 만료 시각
+_HEADER = struct.Struct("!dd")
+
+
+class RespError(Exception):
+    """서버가 돌려준 오류 응답 (-ERR ...)"""
+
+
+class CacheUnavailable(ConnectionError):
+    """최근 연결에 실패해서 RETRY_AFTER 동안 서버를 건너뛰는 중"""
+
+
+class RespClient:
+    """최소한의 RESP2 클라이언트 (스레드마다 연결 하나)"""
+
+    def __init__(self, host: str, port: int, db: int = 0, password: Optional[str] = None,
+                 username: Optional[str] = None, timeout: float = SOCKET_TIMEOUT,
+                 retry_after: float = RETRY_AFTER):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.username = username
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._local = threading.local()
+        # 연결 실패 후 다시 시도할 시각 (monotonic, 모든 스레드 공유)
+        self._down_until = 0.0
+
+    def down_for(self) -> float:
+        """서버를 건너뛰는 남은 시간 (초, 0이면 정상)"""
+        return max(0.0, self._down_until - time.monotonic())
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._local.sock = sock
+        self._local.reader = sock.makefile("rb")
+        if self.password:
+            auth = [self.username, self.password] if self.username else [self.password]
+            self._call("AUTH", *auth)
+        if self.db:
+            self._call("SELECT", self.db)
+
+    def _close(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            try:
+                self._local.reader.close()
+                sock.close()
+            except OSError:
+                pass
+        self._local.sock = None
+
+    @staticmethod
+    def _encode(args) -> bytes:
+        out = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if isinstance(arg, bytes):
+                data = arg
+            else:
+                data = str(arg).encode("utf-8")
+            out.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(out)
+
+    def _read(self) -> Any:
+        line = self._local.reader.readline()
+        if not line:
+            raise ConnectionError("연결 끊김")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            raise RespError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            size = int(rest)
+            if size < 0:
+                return None
+            data = self._local.reader.read(size + 2)
+            return data[:-2]
+        if kind == b"*":
+            size = int(rest)
+            return None if size < 0 else [self._read() for _ in range(size)]
+        raise ConnectionError(f"알 수 없는 응답: {line[:20]!r}")
+
+    def _call(self, *args) -> Any:
+        self._local.sock.sendall(self._encode(args))
+        return self._read()
+
+    def execute(self, *args) -> Any:
+        """명령 실행. 연결이 끊겼으면 한 번 다시 연결해서 재시도"""
+        for attempt in range(2):
+            if getattr(self._local, "sock", None) is None:
+                if self.down_for():
+                    raise CacheUnavailable(f"{self.host}:{self.port} 연결 실패 후 대기 중")
+                try:
+                    self._connect()
+                except (OSError, ConnectionError):
+                    self._close()
+                    self._down_until = time.monotonic() + self.retry_after
+                    raise
+            try:
+                return self._call(*args)
+            except RespError:
+                raise
+            except (OSError, ConnectionError):
+                self._close()
+                if attempt:
+                    raise
+
+
+def _serialize(df: pd.DataFrame, stored_at: float, expires_at: float) -> bytes:
+    buf = io.BytesIO()
+    df.to_parquet(buf, index=False)
+    return _HEADER.pack(stored_at, expires_at) + buf.getvalue()
+
+
+def _deserialize(payload: bytes) -> tuple[pd.DataFrame, float, float]:
+    stored_at, expires_at = _HEADER.unpack_from(payload)
+    df = pd.read_parquet(io.BytesIO(payload[_HEADER.size:]))
+    return df, stored_at, expires_at
+
+
+class RedisCache(CacheBackend):
+    """Redis 프로토콜 서버를 쓰는 공유 캐시 (워커 간 공유)"""
+
+    def __init__(self, url: str, prefix: str = KEY_PREFIX):
+        parsed = urlparse(url)
+        self.prefix = prefix
+        self.display_url = f"redis://{parsed.hostname}:{parsed.port or 6379}{parsed.path or ''}"
+        self.client = RespClient(
+            host=parsed.hostname or "localhost",
+            port=parsed.port or 6379,
+            db=int((parsed.path or "/0").lstrip("/") or 0),
+            password=parsed.password,
+            username=parsed.username or None,
+        )
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stale_hits = 0
+        self._sets = 0
+        self._errors = 0
+        self._skipped = 0
+
+    def _key(self, key: tuple) -> str:
+        namespace, endpoint_key, params = key
+        digest = hashlib.sha1(repr(params).encode("utf-8")).hexdigest()[:16]
+        # 형식 버전이 바뀌면 옛 워커/옛 형식 값과 섞이지 않도록 키가 달라짐
+        return f"{self.prefix}{FORMAT_VERSION}:{namespace}:{endpoint_key}:{digest}"
+
+    def _bump(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def ping(self):
+        self.client.execute("PING")
+
+    def _load(self, key: tuple) -> Optional[tuple[pd.DataFrame, float, float]]:
+        try:
+            payload = self.client.execute("GET", self._key(key))
+            if payload is None:
+                return None
+            return _deserialize(payload)
+        except CacheUnavailable:
+            self._bump("_skipped")
+            return None
+        except Exception as e:
+            # 캐시 장애는 KRX 직접 조회로 넘어가도록 조용히 처리
+            logger.debug(f"공유 캐시 조회 실패: {e}")
+            self._bump("_errors")
+            return None
+
+    def get(self, key: tuple) -> Optional[Any]:
+        entry = self._load(key)
+        if entry is None or time.time() >= entry[2]:
+            self._bump("_misses")
+            return None
+        self._bump("_hits")
+        return entry[0]
+
+    def peek(self, key: tuple) -> Optional[tuple[Any, float, bool]]:
+        entry = self._load(key)
+        if entry is None:
+            return None
+        df, stored_at, expires_at = entry
+        now = time.time()
+        fresh = now < expires_at
+        self._bump("_hits" if fresh else "_stale_hits")
+        return df, now - stored_at, fresh
+
+    def set(self, key: tuple, value: Any, ttl: float):
+        if not isinstance(value, pd.DataFrame):
+            return
+        now = time.time()
+        try:
+            payload = _serialize(value, now, now + ttl)
+            self.client.execute(
+                "SET", self._key(key), payload, "PX", int((ttl + STALE_KEEP) * 1000)
+            )
+        except CacheUnavailable:
+            self._bump("_skipped")
+            return
+        except Exception as e:
+            logger.debug(f"공유 캐시 저장 실패 ({key[:2]}): {e}")
+            self._bump("_errors")
+            return
+        self._bump("_sets")
+
+    def clear(self):
+        """이 접두어의 키만 삭제 (SCAN으로 나눠서)"""
+        cursor = b"0"
+        while True:
+            cursor, keys = self.client.execute("SCAN", cursor, "MATCH", f"{self.prefix}*", "COUNT", 500)
+            if keys:
+                self.client.execute("DEL", *keys)
+            if cursor in (b"0", "0"):
+                break
+
+    def status(self) -> dict:
+        try:
+            self.ping()
+            connected = True
+        except Exception:
+            connected = False
+        with self._lock:
+            return {
+                "backend": "redis",
+                "url": self.display_url,
+                "connected": connected,
+                "prefix": self.prefix,
+                "format": FORMAT_VERSION,
+                "hits": self._hits,
+                "misses": self._misses,
+                "stale_hits": self._stale_hits,
+                "sets": self._sets,
+                "errors": self._errors,
+                "skipped": self._skipped,
+                "retry_in_sec": round(self.client.down_for(), 1),
+            }
@@ -0,0 +1,305 @@
+"""
+KRX 세션 풀 — 따로 로그인한 세션 여러 개로 요청 나눠 보내기
+==========================================================
+KRXAuth는 requests 세션을 딱 하나만 들고 있었고, 같은 계정으로 다시
+로그인하면(skipDup=Y) 먼저 로그인한 세션이 튕겨나서 모든 인증 요청이
+쿠키 하나로 줄을 섰어요. 백필이나 대시보드 여러 개가 동시에 돌면
+세션 하나가 버티는 만큼만 빨라질 수 있었습니다.
+
+SessionPool은 (초등학생 설명):
+  - 출입증(세션)을 여러 장 만들어두고 (계정마다 한 장, outerLoader는 원하는 만큼)
+  - 요청이 오면 지금 제일 한가한 출입증을 빌려줘요 (진행 중 요청 수가 가장 적은 것)
+  - 출입증이 튕기면(LOGOUT) 그 출입증만 빼고, 뒤에서 새로 만들어 채워요
+  - 만료 전 교체는 session_refresher가 풀 단위로 해줍니다
+  → 살아 있는 출입증이 하나라도 있으면 요청은 로그인을 기다리지 않음
+
+  - 새 세션 만들기가 실패한 자리는 retry_sec 동안 다시 시도하지 않음
+
+사용법:
+  pool = SessionPool("krx_auth", [("user1", build1), ("user2", build2)], ...)
+  with pool.checkout() as lease:
+      if not lease:
+          return {}                 # 살아 있는 세션을 못 만듦
+      resp = lease.session.post(...)
+      if "LOGOUT" in resp.text and pool.reissue(lease):
+          resp = lease.session.post(...)   # 다른(또는 새로 만든) 세션으로 재시도
+
+  build() → (세션, 메타정보) 또는 실패 시 None
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Slot:
+    __slots__ = (
+        "index", "label", "build", "session", "meta", "created_at", "alive",
+        "in_flight", "uses", "kicked", "failures", "rotations", "retry_at", "rotate_lock",
+    )
+
+    def __init__(self, index: int, label: str, build: Callable[[], Optional[tuple[Any, Any]]]):
+        self.index = index
+        self.label = label
+        self.build = build
+        self.session = None
+        self.meta = None
+        self.created_at = 0.0
+        self.alive = False
+        self.in_flight = 0
+        self.uses = 0
+        self.kicked = 0
+        self.failures = 0
+        self.rotations = 0
+        self.retry_at = 0.0
+        self.rotate_lock = threading.Lock()
+
+
+class Lease:
+    """checkout()으로 빌린 세션 (reissue()하면 다른 세션으로 바뀜)"""
+
+    __slots__ = ("slot", "session", "meta")
+
+    def __init__(self):
+        self.slot: Optional[_Slot] = None
+        self.session = None
+        self.meta = None
+
+    def __bool__(self) -> bool:
+        return self.session is not None
+
+    @property
+    def index(self) -> Optional[int]:
+        return None if self.slot is None else self.slot.index
+
+
+class SessionPool:
+    """따로 만든 세션 N개 (가장 한가한 세션 대여, 튕긴 세션 자동 교체)
+
+    session_refresher 프로토콜(refresh_age / session_age / rotate / rotation_status)을
+    그대로 갖추고 있어서 풀을 바로 등록하면 됩니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        builders: list[tuple[str, Callable[[], Optional[tuple[Any, Any]]]]],
+        max_age: float,
+        refresh_age: float,
+        retry_sec: float = 60,
+    ):
+        self.name = name
+        self.max_age = max_age
+        self.refresh_age = min(refresh_age, max_age)
+        self.retry_sec = retry_sec
+        self._lock = threading.Lock()
+        self._slots = [_Slot(i, label, build) for i, (label, build) in enumerate(builders)]
+
+    @property
+    def size(self) -> int:
+        return len(self._slots)
+
+    def _valid(self, slot: _Slot, now: float) -> bool:
+        return slot.session is not None and slot.alive and now - slot.created_at < self.max_age
+
+    # ── 대여 ──
+
+    def _take(self, lease: Lease) -> bool:
+        """살아 있는 세션 중 가장 한가한 것을 빌림 (없으면 False)"""
+        now = time.time()
+        with self._lock:
+            live = [s for s in self._slots if self._valid(s, now)]
+            if not live:
+                return False
+            slot = min(live, key=lambda s: (s.in_flight, s.uses))
+            slot.in_flight += 1
+            slot.uses += 1
+            lease.slot, lease.session, lease.meta = slot, slot.session, slot.meta
+            due = [
+                s for s in self._slots
+                if not self._valid(s, now) or now - s.created_at >= self.refresh_age
+            ]
+        # 교체 시점이 지났거나 빠진 자리는 뒤에서 채움 (요청은 기다리지 않음)
+        for s in due:
+            self._replace_in_background(s)
+        return True
+
+    def _acquire(self, lease: Lease, block: bool = True) -> bool:
+        if self._take(lease):
+            return True
+        if not block:
+            return False
+        # 살아 있는 세션이 하나도 없음 (첫 요청, 모두 튕김) → 이때만 로그인을 기다림
+        for slot in self._slots:
+            if self._replace(slot, wait=True) and self._take(lease):
+                return True
+        return self._take(lease)
+
+    def _release(self, lease: Lease):
+        if lease.slot is not None:
+            with self._lock:
+                lease.slot.in_flight -= 1
+        lease.slot = lease.session = lease.meta = None
+
+    @contextmanager
+    def checkout(self):
+        """세션 하나 빌리기 (lease가 False면 세션을 만들지 못한 것)"""
+        lease = Lease()
+        self._acquire(lease)
+        try:
+            yield lease
+        finally:
+            self._release(lease)
+
+    @asynccontextmanager
+    async def checkout_async(self):
+        """checkout의 asyncio 버전 (세션을 새로 만들 때만 스레드에서 기다림)"""
+        lease = Lease()
+        if not self._acquire(lease, block=False):
+            await asyncio.to_thread(self._acquire, lease)
+        try:
+            yield lease
+        finally:
+            self._release(lease)
+
+    def get(self):
+        """가장 한가한 세션 (대여 기록 없이 — 로그인 확인용)"""
+        with self.checkout() as lease:
+            return lease.session
+
+    def is_live(self) -> bool:
+        now = time.time()
+        with self._lock:
+            return any(self._valid(s, now) for s in self._slots)
+
+    # ── 튕긴 세션 처리 ──
+
+    def invalidate(self, lease: Lease):
+        """lease의 세션이 튕겼음 → 그 자리만 빼고 뒤에서 새로 만듦
+
+        그 사이 이미 새 세션으로 바뀐 자리는 건드리지 않습니다.
+        """
+        slot = lease.slot
+        if slot is None:
+            return
+        with self._lock:
+            if slot.session is not lease.session or not slot.alive:
+                return
+            slot.alive = False
+            slot.kicked += 1
+        logger.warning(f"[{self.name}] 세션 #{slot.index} ({slot.label}) 튕김 — 교체")
+        self._replace_in_background(slot)
+
+    def reissue(self, lease: Lease) -> bool:
+        """튕긴 세션을 반납하고 다른 세션을 다시 빌림"""
+        self.invalidate(lease)
+        self._release(lease)
+        return self._acquire(lease)
+
+    async def reissue_async(self, lease: Lease) -> bool:
+        self.invalidate(lease)
+        self._release(lease)
+        if self._acquire(lease, block=False):
+            return True
+        return await asyncio.to_thread(self._acquire, lease)
+
+    # ── 교체 ──
+
+    def _replace(self, slot: _Slot, wait: bool = False) -> bool:
+        """새 세션을 락 밖에서 만들고, 성공하면 그 자리에 한 번에 바꿔 끼움"""
+        if time.time() < slot.retry_at:
+            return False
+        if not slot.rotate_lock.acquire(blocking=wait):
+            return False
+        try:
+            if wait and self._valid(slot, time.time()):
+                return True  # 기다리는 동안 다른 스레드가 이미 교체함
+            built = slot.build()
+            if built is None:
+                with self._lock:
+                    slot.failures += 1
+                    slot.retry_at = time.time() + self.retry_sec
+                logger.warning(
+                    f"[{self.name}] 세션 #{slot.index} ({slot.label}) 준비 실패 — "
+                    f"{self.retry_sec:.0f}초 후 재시도"
+                )
+                return False
+            with self._lock:
+                slot.session, slot.meta = built
+                slot.created_at = time.time()
+                slot.alive = True
+                slot.failures = 0
+                slot.rotations += 1
+            logger.info(f"[{self.name}] 세션 #{slot.index} ({slot.label}) 준비 완료")
+            return True
+        finally:
+            slot.rotate_lock.release()
+
+    def _replace_in_background(self, slot: _Slot):
+        if slot.rotate_lock.locked() or time.time() < slot.retry_at:
+            return
+        threading.Thread(
+            target=self._replace, args=(slot,),
+            name=f"{self.name}-session-{slot.index}", daemon=True,
+        ).start()
+
+    # ── session_refresher 프로토콜 ──
+
+    def session_age(self) -> Optional[float]:
+        """가장 오래된 세션의 나이 (빠진 자리가 있으면 None → 바로 rotate)"""
+        now = time.time()
+        with self._lock:
+            if not all(self._valid(s, now) for s in self._slots):
+                return None
+            return max((now - s.created_at for s in self._slots), default=None)
+
+    def rotate(self) -> bool:
+        """교체 시점이 지났거나 빠진 자리를 모두 새 세션으로 (호출한 스레드에서)"""
+        now = time.time()
+        with self._lock:
+            due = [
+                s for s in self._slots
+                if not self._valid(s, now) or now - s.created_at >= self.refresh_age
+            ]
+        results = [self._replace(s) for s in due]
+        return any(results)
+
+    def rotation_status(self) -> dict:
+        now = time.time()
+        with self._lock:
+            sessions = [
+                {
+                    "index": s.index,
+                    "label": s.label,
+                    "meta": s.meta,
+                    "live": self._valid(s, now),
+                    "age_sec": int(now - s.created_at) if s.session is not None else None,
+                    "in_flight": s.in_flight,
+                    "uses": s.uses,
+                    "kicked": s.kicked,
+                    "rotations": s.rotations,
+                    "failures": s.failures,
+                    "rotating": s.rotate_lock.locked(),
+                }
+                for s in self._slots
+            ]
+        return {
+            "size": len(sessions),
+            "live": sum(1 for s in sessions if s["live"]),
+            "rotations": sum(s["rotations"] for s in sessions),
+            "rotate_failures": sum(1 for s in sessions if s["failures"]),
+            "sessions": sessions,
+        }
+
+    def status(self) -> dict:
+        return {
+            "name": self.name,
+            "max_age_sec": self.max_age,
+            "refresh_age_sec": self.refresh_age,
+            **self.rotation_status(),
+        }
@@ -0,0 +1,122 @@
+"""
+KRX 세션 백그라운드 교체 — 로그인이 사용자 요청을 기다리게 하지 않도록
+======================================================================
+KRXAuth는 세션이 25분을 넘기거나 LOGOUT 응답을 받아야 다시 로그인했어요.
+그러면 로그인 2단계(페이지 GET → 0.3초 쉬기 → 로그인 POST)를
+하필 그때 들어온 사용자 요청이 락을 잡은 채로 기다리고,
+다른 요청들도 모두 그 락 뒤에 줄을 섰습니다.
+KRXDirectFetcher의 outerLoader 세션도 5분마다 똑같았고요.
+
+SessionRefresher는 (초등학생 설명):
+  - 출입증이 만료되기 전에(refresh_age) 미리 새 출입증을 따로 만들어두고
+  - 다 만들어지면 헌 출입증과 "한 번에" 바꿔 끼워요 (락은 바꿔 끼울 때만 잠깐)
+  - 바꾸는 동안에도 요청들은 헌 출입증으로 계속 일해요
+  → 요청 시간에 로그인이 끼어들지 않음
+
+  - 백그라운드 스레드가 KRX_SESSION_CHECK_SEC(기본 15초)마다 세션 나이를 확인
+  - 스레드가 없는 프로세스(MCP 서버 등)에서도, 요청이 교체 시점이 지난
+    세션을 받으면 그 자리에서 백그라운드 교체를 시작 (요청은 기다리지 않음)
+
+세션 소유자(KRXAuth.pool, KRXDirectFetcher.pool — session_pool.SessionPool)가 갖춰야 할 것:
+  refresh_age          — 이 나이(초)가 되면 교체
+  session_age()        — 현재 세션 나이 (없으면 None)
+  rotate()             — 새 세션을 만들어 바꿔 끼움 (이미 교체 중이면 False)
+  rotation_status()    — 교체 횟수/실패 횟수 등
+
+사용법:
+  refresher = get_session_refresher()
+  refresher.register("krx_auth", get_krx_auth().pool)
+  refresher.start()       # main.py lifespan에서 호출
+  refresher.status()
+"""
+
+import logging
+import os
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+REFRESH_ENABLED = os.environ.get("KRX_SESSION_REFRESH", "1").lower() not in ("0", "false", "no")
+
+# 세션 나이를 확인하는 간격 (초)
+CHECK_INTERVAL = float(os.environ.get("KRX_SESSION_CHECK_SEC", "15"))
+
+
+class SessionRefresher:
+    """등록된 세션 소유자들의 세션을 만료 전에 백그라운드에서 교체"""
+
+    def __init__(self, interval: float = CHECK_INTERVAL):
+        self.interval = max(1.0, interval)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._owners: dict[str, object] = {}
+
+    def register(self, name: str, owner):
+        with self._lock:
+            self._owners[name] = owner
+
+    def start(self):
+        """교체 스레드 시작 (이미 실행 중이면 무시)"""
+        if not REFRESH_ENABLED:
+            logger.info("세션 백그라운드 교체 비활성화 (KRX_SESSION_REFRESH=0)")
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="krx-session-refresher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.check()
+            self._stop.wait(self.interval)
+
+    def check(self):
+        """교체 시점이 된(또는 세션이 없는) 소유자의 세션을 교체"""
+        with self._lock:
+            owners = list(self._owners.items())
+        for name, owner in owners:
+            age = owner.session_age()
+            if age is not None and age < owner.refresh_age:
+                continue
+            try:
+                owner.rotate()
+            except Exception as e:
+                logger.warning(f"세션 교체 실패 ({name}): {e}")
+
+    def status(self) -> dict:
+        with self._lock:
+            owners = dict(self._owners)
+            alive = bool(self._thread and self._thread.is_alive())
+        sessions = {}
+        for name, owner in owners.items():
+            age = owner.session_age()
+            sessions[name] = {
+                "session_age_sec": None if age is None else int(age),
+                "refresh_age_sec": owner.refresh_age,
+                **owner.rotation_status(),
+            }
+        return {
+            "enabled": REFRESH_ENABLED,
+            "thread_alive": alive,
+            "check_interval_sec": self.interval,
+            "sessions": sessions,
+        }
+
+
+# 전역 싱글톤
+_refresher: Optional[SessionRefresher] = None
+
+
+def get_session_refresher() -> SessionRefresher:
+    """세션 교체기 싱글톤"""
+    global _refresher
+    if _refresher is None:
+        _refresher = SessionRefresher()
+    return _refresher
@@ -0,0 +1,140 @@
+"""
+Single-flight — 동시에 들어온 똑같은 요청을 하나로 합치기
+==========================================================
+대시보드가 처음 열리거나 여러 MCP 클라이언트가 같은 질문을 하면
+똑같은 KRX/네이버 요청이 동시에 N번 나갑니다.
+
+Single-flight는 (초등학생 설명):
+  - 첫 번째 요청만 실제로 심부름을 보내고 (leader)
+  - 같은 심부름을 시키려던 나머지는 줄 서서 기다렸다가 (follower)
+  - 첫 번째 요청이 받아온 결과를 똑같이 나눠 받아요
+
+  → 업스트림에는 요청이 한 번만 나가고, 모두 같은 결과를 받음
+  → leader가 실패하면 기다리던 follower도 같은 예외를 받음
+
+사용법:
+  flight = SingleFlight("krx_auth")
+  result = flight.do(("bld", params_tuple), fetch_fn, bld, **params)
+
+  # asyncio 코드에서는
+  flight = AsyncSingleFlight("krx_auth_async")
+  result = await flight.do(key, coro_fn, bld, params)
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """진행 중인 요청 하나 (결과를 기다리는 follower들이 공유)"""
+
+    __slots__ = ("event", "result", "error", "waiters")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """키가 같은 동시 호출을 한 번의 실행으로 합치는 스레드 안전 도우미"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._executed = 0
+        self._shared = 0
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """key로 진행 중인 호출이 있으면 그 결과를 기다리고, 없으면 직접 실행"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            with self._lock:
+                self._shared += 1
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+                self._executed += 1
+            if call.waiters:
+                logger.debug(f"[{self.name}] 동시 요청 {call.waiters}건 합침: {key!r:.120}")
+            call.event.set()
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "executed": self._executed,
+                "shared": self._shared,
+            }
+
+
+class AsyncSingleFlight:
+    """SingleFlight의 asyncio 버전 (같은 이벤트 루프 안의 코루틴끼리 합침)
+
+    follower는 스레드를 막지 않고 leader의 Future를 await 합니다.
+    이벤트 루프가 여러 개면(예: MCP 서버 + 웹 서버) 루프별로 따로 합칩니다.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: dict[tuple, asyncio.Future] = {}
+        self._executed = 0
+        self._shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+        future = self._calls.get(loop_key)
+        if future is not None:
+            self._shared += 1
+            # shield: follower가 취소돼도 leader의 요청은 계속 진행
+            return await asyncio.shield(future)
+
+        future = loop.create_future()
+        self._calls[loop_key] = future
+        try:
+            result = await fn(*args, **kwargs)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._calls.pop(loop_key, None)
+            self._executed += 1
+            # follower가 없으면 예외를 꺼내줘서 "never retrieved" 경고 방지
+            if future.done() and not future.cancelled():
+                future.exception()
+
+    def status(self) -> dict:
+        return {
+            "in_flight": len(self._calls),
+            "executed": self._executed,
+            "shared": self._shared,
+        }
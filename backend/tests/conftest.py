@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# backend 모듈을 패키지(backend.xxx)로 import — 저장소 루트를 경로에 추가
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
@@ -0,0 +1,58 @@
+"""slot_async: 자리가 나면 폴링 없이 바로 깨어나는지 (스레드에서 반납해도)"""
+
+import asyncio
+import threading
+import time
+
+from backend.adaptive_concurrency import AdaptiveConcurrency
+
+
+def test_async_waiter_wakes_on_release_from_thread():
+    aimd = AdaptiveConcurrency(initial=1, minimum=1, maximum=1)
+
+    async def main():
+        held = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with aimd.slot("krx"):
+                held.set()
+                release.wait()
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        held.wait()
+
+        async def enter():
+            async with aimd.slot_async("krx"):
+                return time.monotonic()
+
+        task = asyncio.create_task(enter())
+        await asyncio.sleep(0.05)
+        assert not task.done()
+        assert aimd._async_waiters["krx"]
+
+        released_at = time.monotonic()
+        release.set()
+        entered_at = await asyncio.wait_for(task, 1)
+        thread.join()
+        return entered_at - released_at
+
+    assert asyncio.run(main()) < 0.5
+    assert aimd.status()["hosts"]["krx"]["in_flight"] == 0
+
+
+def test_cancelled_waiter_is_removed():
+    aimd = AdaptiveConcurrency(initial=1, minimum=1, maximum=1)
+
+    async def main():
+        async with aimd.slot_async("krx"):
+            task = asyncio.create_task(aimd.slot_async("krx").__aenter__())
+            await asyncio.sleep(0.01)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            assert not aimd._async_waiters.get("krx")
+        async with aimd.slot_async("krx"):
+            pass
+
+    asyncio.run(main())
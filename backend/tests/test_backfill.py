@@ -0,0 +1,76 @@
+"""백필: 도중에 죽은 작업이 JSONL 체크포인트부터 이어지는지, 오류는 state "error"로"""
+
+import pandas as pd
+import pytest
+
+from backend import krx_backfill, krx_store
+
+START, END = "20240102", "20240110"   # 거래일 7일
+
+
+class Crash(BaseException):
+    """프로세스가 죽는 것처럼 except Exception으로도 잡히지 않는 중단"""
+
+
+class FakeAuth:
+    def __init__(self, crash_after=None):
+        self.calls = []
+        self.crash_after = crash_after
+
+    def collect(self, endpoint_key, **params):
+        if self.crash_after is not None and len(self.calls) >= self.crash_after:
+            raise Crash()
+        self.calls.append(params["trdDd"])
+        return pd.DataFrame({"ISU_SRT_CD": ["005930"]})
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    store = krx_store.SnapshotStore(str(tmp_path / "store"))
+    monkeypatch.setattr(krx_backfill, "get_snapshot_store", lambda: store)
+    auth = {}
+    monkeypatch.setattr(krx_backfill, "get_krx_auth", lambda: auth["current"])
+    return tmp_path / "checkpoints", auth
+
+
+def _job(checkpoints):
+    return krx_backfill.BackfillJob(
+        ["all_stock_price"], START, END, markets=["STK"], concurrency=1,
+        checkpoint_dir=str(checkpoints),
+    )
+
+
+def test_crashed_job_resumes_from_checkpoint(env):
+    checkpoints, auth = env
+    auth["current"] = FakeAuth(crash_after=3)
+    job = _job(checkpoints)
+    with pytest.raises(Crash):
+        job.run()
+    # 죽으면서 마지막 줄을 반쯤 씀
+    with open(job._log_path, "a", encoding="utf-8") as f:
+        f.write('{"task": "all_stock_price|2024')
+
+    auth["current"] = FakeAuth()
+    status = _job(checkpoints).run()
+    assert status["state"] == "finished"
+    assert status["total"] == 7 and status["resumed"] == 3 and status["done"] == 4
+    assert auth["current"].calls == ["20240105", "20240108", "20240109", "20240110"]
+
+    # 세 번째 실행은 할 일이 없음
+    status = _job(checkpoints).run()
+    assert status["resumed"] == 7 and status["done"] == 0
+
+
+def test_error_sets_state_instead_of_killing_thread_silently(env, monkeypatch):
+    checkpoints, auth = env
+    auth["current"] = FakeAuth()
+    job = _job(checkpoints)
+    monkeypatch.setattr(job, "tasks", lambda: (_ for _ in ()).throw(OSError("디스크 가득 참")))
+
+    manager = krx_backfill.BackfillManager()
+    job, started = manager.start(job)
+    assert started
+    manager._threads[job.job_id].join(5)
+    status = job.status()
+    assert status["state"] == "error"
+    assert "디스크 가득 참" in status["error"]
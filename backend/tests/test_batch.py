@@ -0,0 +1,65 @@
+"""/batch 항목이 개별 엔드포인트와 같은 기본값(기간 시작일 등)으로 조회되는지"""
+
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend import data_explorer_routes
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    seen = []
+
+    async def fetch(endpoint_key, **params):
+        seen.append((endpoint_key, params))
+        return pd.DataFrame({"x": [1]}), None
+
+    monkeypatch.setattr(data_explorer_routes, "_fetch", fetch)
+    monkeypatch.setattr(data_explorer_routes, "_today", lambda: "20261016")
+    return seen
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(data_explorer_routes.router, prefix="/api/data-explore")
+    return TestClient(app)
+
+
+def test_batch_range_defaults_match_routes(client, calls):
+    items = [
+        {"id": "trend", "endpoint": "investor_trend"},
+        {"id": "bond", "endpoint": "bond_yield_trend"},
+        {"id": "index", "endpoint": "index_trend"},
+    ]
+    resp = client.post("/api/data-explore/batch", json={"items": items})
+
+    assert resp.status_code == 200
+    assert resp.json()["failed"] == 0
+    params = dict(calls)
+    days_ago = lambda n: (datetime.now() - timedelta(days=n)).strftime("%Y%m%d")
+    assert params["investor_trend"] == {"strtDd": days_ago(30), "endDd": "20261016"}
+    assert params["bond_yield_trend"] == {"strtDd": days_ago(90), "endDd": "20261016"}
+    assert params["index_trend"]["idxCd"] == "1"
+
+    # 개별 라우트도 같은 값으로 조회
+    calls.clear()
+    client.get("/api/data-explore/investor-trend")
+    assert calls[0][1]["strtDd"] == days_ago(30)
+
+
+def test_batch_range_without_default_start_is_item_error(client, calls):
+    items = [
+        {"id": "daily", "endpoint": "stock_daily", "params": {"isuCd": "KR7005930003"}},
+        {"id": "cap", "endpoint": "market_cap"},
+    ]
+    body = client.post("/api/data-explore/batch", json={"items": items}).json()
+
+    assert body["results"]["daily"]["ok"] is False
+    assert "strtDd" in body["results"]["daily"]["error"]
+    assert body["results"]["cap"]["ok"] is True
+    assert [endpoint for endpoint, _ in calls] == ["market_cap"]
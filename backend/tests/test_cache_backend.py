@@ -0,0 +1,24 @@
+"""CacheBackend: 메서드가 빠진 백엔드는 만들 때 실패"""
+
+import pytest
+
+from backend.krx_cache import CacheBackend, TTLCache
+
+
+def test_incomplete_backend_fails_on_construction():
+    class NoPeek(CacheBackend):
+        def get(self, key):
+            return None
+
+        def set(self, key, value, ttl):
+            pass
+
+        def clear(self):
+            pass
+
+        def status(self):
+            return {}
+
+    with pytest.raises(TypeError, match="peek"):
+        NoPeek()
+    TTLCache()  # 모든 메서드를 구현한 백엔드는 그대로
@@ -0,0 +1,35 @@
+"""거래일 달력: 백필 범위의 음력/임시 휴장일, 표가 없는 미래 연도"""
+
+import pytest
+
+from backend import krx_calendar
+
+
+@pytest.fixture
+def cal(monkeypatch):
+    # KRX 보정 스레드는 띄우지 않음 (내장 표만 확인)
+    monkeypatch.setattr(krx_calendar.KRXCalendar, "_maybe_refresh", lambda self: None)
+    return krx_calendar.KRXCalendar()
+
+
+def test_2023_lunar_and_temporary_holidays(cal):
+    assert cal.trading_days("20230120", "20230126") == ["20230120", "20230125", "20230126"]
+    for day in ("20230928", "20230929", "20231002", "20231003"):
+        assert not cal.is_trading_day(day)
+    assert cal.is_trading_day("20231004")
+
+
+def test_unbundled_future_year_falls_back_to_solar_holidays(cal):
+    last = max(cal._holidays)
+    assert last not in krx_calendar.HOLIDAYS
+    days = cal.trading_days(f"{last}0101", f"{last}1231")
+    assert days and f"{last}0101" not in days and f"{last}1225" not in days
+    assert cal.next_trading_day(f"{last - 1}1231") is not None
+
+
+def test_calendar_extends_when_years_run_out(cal, monkeypatch):
+    last = max(cal._holidays)
+    monkeypatch.setattr(krx_calendar, "YEARS_AHEAD", krx_calendar.YEARS_AHEAD + 3)
+    cal._extend()
+    assert max(cal._holidays) == last + 3
+    assert cal.trading_days(f"{last + 3}0101", f"{last + 3}0110")
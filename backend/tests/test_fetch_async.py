@@ -0,0 +1,37 @@
+"""fetch_async: 캐시/스냅샷/변환은 스레드에서, KRX 요청만 이벤트 루프에서"""
+
+import asyncio
+import threading
+
+from backend import krx_auth
+
+
+def test_lookup_and_finish_run_off_the_event_loop(monkeypatch):
+    auth = krx_auth.KRXAuth()
+    threads = {}
+
+    def record(name, fn):
+        def wrapper(*args, **kwargs):
+            threads[name] = threading.get_ident()
+            return fn(*args, **kwargs)
+        return wrapper
+
+    monkeypatch.setattr(auth, "_lookup", record("lookup", auth._lookup))
+    monkeypatch.setattr(auth, "_finish", record("finish", auth._finish))
+
+    async def fetch_items(ep, params):
+        threads["request"] = threading.get_ident()
+        return [{"ISU_SRT_CD": "005930", "ISU_ABBRV": "삼성전자", "TDD_CLSPRC": "71,000"}]
+
+    monkeypatch.setattr(auth, "_fetch_items_async", fetch_items)
+
+    async def main():
+        loop_thread = threading.get_ident()
+        df = await auth.fetch_async("all_stock_price", mktId="STK", trdDd="20991231")
+        return loop_thread, df
+
+    loop_thread, df = asyncio.run(main())
+    assert df["ISU_SRT_CD"].tolist() == ["005930"]
+    assert threads["request"] == loop_thread
+    assert threads["lookup"] != loop_thread
+    assert threads["finish"] != loop_thread
@@ -0,0 +1,61 @@
+"""자연어 질의 응답에 숫자 컬럼의 "-"(적자 종목 EPS/PER 등)가 섞여도 JSON으로 나가는지"""
+
+import json
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend import data_explorer_routes, krx_ontology
+from backend.krx_auth import KRXAuth
+
+ITEMS = [
+    {"ISU_SRT_CD": "005930", "ISU_ABBRV": "삼성전자", "EPS": "2,131", "PER": "26.42",
+     "BPS": "52,002", "PBR": "1.08", "DPS": "1,444", "DVD_YLD": "2.56"},
+    {"ISU_SRT_CD": "000660", "ISU_ABBRV": "적자기업", "EPS": "-", "PER": "-",
+     "BPS": "31,000", "PBR": "0.91", "DPS": "-", "DVD_YLD": "-"},
+]
+
+
+class FakeAuth:
+    async def fetch_async(self, endpoint_key, **params):
+        return KRXAuth._to_frame(endpoint_key, ITEMS)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    async def plan(query):
+        return {"intent": "외국인 보유", "endpoints": [{"name": "foreign_holding", "params": {}}]}
+
+    monkeypatch.setattr(krx_ontology, "natural_language_to_api", plan)
+    monkeypatch.setattr(krx_ontology, "get_krx_auth", lambda: FakeAuth())
+    app = FastAPI()
+    app.include_router(data_explorer_routes.router, prefix="/api/data-explore")
+    return TestClient(app)
+
+
+def test_nl_query_dash_cells_become_null(client):
+    frame = KRXAuth._to_frame("foreign_holding", ITEMS)
+    assert frame["EPS"].isna().any()  # "-"가 실제로 NaN으로 바뀌는 경우
+
+    resp = client.get("/api/data-explore/nl-query", params={"q": "외국인 보유 현황"})
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["rows"] == 2
+    loss = next(row for row in body["data"] if row["ISU_SRT_CD"] == "000660")
+    assert loss["EPS"] is None and loss["PER"] is None and loss["DVD_YLD"] is None
+    assert loss["PBR"] == pytest.approx(0.91)
+
+
+def test_mcp_result_dash_cells_become_null(monkeypatch):
+    pytest.importorskip("fastmcp")
+    # krx_mcp는 backend 폴더에서 단독 실행하는 모듈 (절대 import)
+    monkeypatch.syspath_prepend(str(Path(__file__).resolve().parents[1]))
+    import krx_mcp
+
+    result = krx_mcp._df_to_result(KRXAuth._to_frame("foreign_holding", ITEMS))
+
+    json.dumps(result["data"], allow_nan=False)
+    assert result["data"][1]["EPS"] is None
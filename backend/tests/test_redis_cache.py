@@ -0,0 +1,164 @@
+"""RedisCache를 로컬 RESP 대체 서버(socketserver 스레드)에 붙여서 확인"""
+
+import fnmatch
+import socketserver
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from backend import redis_cache
+from backend.krx_schema import FORMAT_VERSION
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        assert line[:1] == b"*"
+        args = []
+        for _ in range(int(line[1:-2])):
+            size = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(size + 2)[:-2])
+        return args
+
+    def _reply(self, value):
+        if value is None:
+            self.wfile.write(b"$-1\r\n")
+        elif isinstance(value, str):
+            self.wfile.write(b"+%s\r\n" % value.encode())
+        elif isinstance(value, int):
+            self.wfile.write(b":%d\r\n" % value)
+        elif isinstance(value, bytes):
+            self.wfile.write(b"$%d\r\n%s\r\n" % (len(value), value))
+        else:
+            self.wfile.write(b"*%d\r\n" % len(value))
+            for item in value:
+                self._reply(item)
+
+    def handle(self):
+        server = self.server
+        while True:
+            args = self._read_command()
+            if args is None:
+                return
+            name, rest = args[0].upper().decode(), args[1:]
+            server.commands.append(name)
+            with server.lock:
+                now = time.monotonic()
+                for key in [k for k, (_, exp) in server.data.items() if exp is not None and exp <= now]:
+                    del server.data[key]
+                if name in ("PING", "AUTH", "SELECT"):
+                    self._reply("PONG" if name == "PING" else "OK")
+                elif name == "GET":
+                    entry = server.data.get(rest[0])
+                    self._reply(entry[0] if entry else None)
+                elif name == "SET":
+                    px = int(rest[3]) if len(rest) > 3 and rest[2].upper() == b"PX" else None
+                    server.px[rest[0]] = px
+                    server.data[rest[0]] = (rest[1], None if px is None else now + px / 1000)
+                    self._reply("OK")
+                elif name == "SCAN":
+                    pattern = rest[rest.index(b"MATCH") + 1].decode()
+                    keys = [k for k in server.data if fnmatch.fnmatchcase(k.decode(), pattern)]
+                    self._reply([b"0", keys])
+                elif name == "DEL":
+                    self._reply(sum(server.data.pop(k, None) is not None for k in rest))
+                else:
+                    self.wfile.write(b"-ERR unknown command\r\n")
+
+
+class _StandIn(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.lock = threading.Lock()
+        self.data: dict[bytes, tuple[bytes, float]] = {}
+        self.px: dict[bytes, int] = {}
+        self.commands: list[str] = []
+
+
+@pytest.fixture
+def server():
+    srv = _StandIn()
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture
+def cache(server):
+    return redis_cache.RedisCache(f"redis://127.0.0.1:{server.server_address[1]}/0", prefix="t:")
+
+
+KEY = ("krx_auth", "all_stock_price", (("mktId", "STK"), ("trdDd", "20260312")))
+DF = pd.DataFrame({"ISU_SRT_CD": ["005930"], "TDD_CLSPRC": [71000]})
+
+
+def test_set_get_and_key_prefix(cache, server):
+    assert cache.get(KEY) is None
+    cache.set(KEY, DF, ttl=60)
+    pd.testing.assert_frame_equal(cache.get(KEY), DF)
+
+    (key,) = server.data
+    assert key.decode().startswith(f"t:{FORMAT_VERSION}:krx_auth:all_stock_price:")
+    assert server.px[key] == int((60 + redis_cache.STALE_KEEP) * 1000)
+    status = cache.status()
+    assert status["connected"] and status["hits"] == 1 and status["misses"] == 1 and status["sets"] == 1
+
+
+def test_expired_value_is_peekable_until_server_expiry(cache, server, monkeypatch):
+    monkeypatch.setattr(redis_cache, "STALE_KEEP", 0.3)
+    cache.set(KEY, DF, ttl=0.1)
+    df, age, fresh = cache.peek(KEY)
+    assert fresh and age < 0.1
+
+    time.sleep(0.15)
+    assert cache.get(KEY) is None           # 헤더의 만료 시각이 지남
+    df, age, fresh = cache.peek(KEY)        # 서버에는 아직 남아 있음 (stale)
+    assert not fresh and age >= 0.1
+    pd.testing.assert_frame_equal(df, DF)
+    assert cache.status()["stale_hits"] == 1
+
+    time.sleep(0.35)
+    assert cache.peek(KEY) is None          # PX로 서버에서도 만료
+
+
+def test_clear_only_deletes_own_prefix(cache, server):
+    cache.set(KEY, DF, ttl=60)
+    server.data[b"other:key"] = (b"x", None)
+    cache.clear()
+    assert list(server.data) == [b"other:key"]
+    assert "SCAN" in server.commands and "DEL" in server.commands
+
+
+def test_failed_connect_skips_server_for_a_while(monkeypatch):
+    attempts = []
+
+    def refuse(address, timeout=None):
+        attempts.append(address)
+        raise ConnectionRefusedError("서버 다운")
+
+    monkeypatch.setattr(redis_cache.socket, "create_connection", refuse)
+    cache = redis_cache.RedisCache("redis://127.0.0.1:1/0", prefix="t:")
+    cache.client.retry_after = 0.2
+
+    assert cache.get(KEY) is None
+    assert len(attempts) == 1
+    # 대기 중에는 연결을 시도하지 않고 바로 캐시 없음
+    assert cache.get(KEY) is None
+    assert cache.peek(KEY) is None
+    cache.set(KEY, DF, ttl=60)
+    assert len(attempts) == 1
+    status = cache.status()
+    assert status["errors"] == 1 and status["skipped"] == 3 and status["retry_in_sec"] > 0
+
+    time.sleep(0.25)
+    assert cache.get(KEY) is None
+    assert len(attempts) == 2
@@ -0,0 +1,51 @@
+"""스냅샷 저장소 경로: 형식 버전이 들어가서 옛 형식 스냅샷을 읽지 않는지"""
+
+import os
+
+import pandas as pd
+
+from backend import krx_store
+from backend.krx_schema import FORMAT_VERSION
+
+PARAMS = {"trdDd": "20240102", "mktId": "STK", "share": "1"}
+
+
+def test_path_has_format_version(tmp_path):
+    store = krx_store.SnapshotStore(str(tmp_path))
+    path = store._path("all_stock_price", PARAMS)
+    assert os.path.relpath(path, tmp_path).split(os.sep)[:2] == [FORMAT_VERSION, "all_stock_price"]
+
+
+def test_old_unversioned_snapshot_is_ignored(tmp_path):
+    store = krx_store.SnapshotStore(str(tmp_path))
+    # 형식 버전 없이 저장된 옛 스냅샷 (종목코드가 정수)
+    old = os.path.relpath(store._path("all_stock_price", PARAMS), tmp_path).split(os.sep)[1:]
+    os.makedirs(tmp_path.joinpath(*old[:-1]))
+    pd.DataFrame({"ISU_SRT_CD": [5930]}).to_parquet(tmp_path.joinpath(*old))
+    assert store.get("all_stock_price", PARAMS) is None
+
+    store.put("all_stock_price", PARAMS, pd.DataFrame({"ISU_SRT_CD": ["005930"]}))
+    assert store.get("all_stock_price", PARAMS)["ISU_SRT_CD"].tolist() == ["005930"]
+
+
+def test_partition_values_cannot_escape_root(tmp_path):
+    store = krx_store.SnapshotStore(str(tmp_path / "store"))
+    df = pd.DataFrame({"ISU_SRT_CD": ["005930"]})
+    for bad in ({"trdDd": "../../x", "mktId": "STK"}, {"trdDd": "20240102", "mktId": "../../etc"},
+                {"trdDd": "20240102\n", "mktId": "STK"}):
+        assert store.put("all_stock_price", bad, df) is False
+        assert store.get("all_stock_price", bad) is None
+        assert not store.has("all_stock_price", bad)
+        assert not store.accepts({"date_param": "trdDd"}, bad)
+    assert store.put("../all_stock_price", PARAMS, df) is False
+    assert not any(tmp_path.rglob("*.parquet"))
+
+
+def test_symlink_out_of_root_is_rejected(tmp_path):
+    store = krx_store.SnapshotStore(str(tmp_path / "store"))
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (tmp_path / "store" / FORMAT_VERSION).mkdir(parents=True)
+    os.symlink(outside, tmp_path / "store" / FORMAT_VERSION / "all_stock_price")
+    assert store.put("all_stock_price", PARAMS, pd.DataFrame({"ISU_SRT_CD": ["005930"]})) is False
+    assert not any(outside.rglob("*"))
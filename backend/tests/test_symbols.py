@@ -0,0 +1,68 @@
+"""종목 마스터: async 호출자는 첫 생성을 기다리지 않고 stock_aliases로 처리"""
+
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from backend import krx_ontology, krx_symbols
+
+
+def _index() -> krx_symbols._Index:
+    frame = pd.DataFrame({
+        "code": ["005930"], "isin": ["KR7005930003"], "name": ["삼성전자"],
+        "market": ["KOSPI"], "kind": ["stock"], "sector": ["전기전자"],
+    })
+    return krx_symbols._Index(frame, "20260312")
+
+
+def test_resolve_without_wait_builds_in_background(monkeypatch):
+    master = krx_symbols.SymbolMaster()
+    release = threading.Event()
+    built = threading.Event()
+
+    def build():
+        release.wait(5)
+        built.set()
+        return _index()
+
+    monkeypatch.setattr(master, "_build", build)
+    monkeypatch.setattr(krx_ontology, "get_symbol_master", lambda: master)
+
+    # 마스터가 없어도 바로 돌아옴 → stock_aliases
+    alias = krx_ontology.KRX_ONTOLOGY["stock_aliases"]["삼성전자"]
+    assert krx_ontology._resolve_isin("삼성전자") == alias
+    assert master.status()["refreshing"]
+
+    release.set()
+    assert built.wait(5)
+    for _ in range(100):
+        if not master.status()["refreshing"]:
+            break
+        time.sleep(0.01)
+    assert master.resolve("삼성전자", wait=False) == "005930"
+    assert krx_ontology._resolve_isin("삼성전자") == "KR7005930003"
+
+
+def test_elw_names_come_from_elw_price(monkeypatch):
+    frames = {
+        "all_stock_price": pd.DataFrame({
+            "ISU_SRT_CD": ["005930"], "ISU_CD": ["KR7005930003"], "ISU_ABBRV": ["삼성전자"],
+        }),
+        "elw_price": pd.DataFrame({"ISU_CD": ["58K123", "57J001"], "ISU_ABBRV": ["한국K123삼성전자콜", "미래J001KOSPI200풋"]}),
+    }
+
+    class FakeAuth:
+        def fetch(self, endpoint_key, **params):
+            return frames.get(endpoint_key, pd.DataFrame())
+
+    monkeypatch.setattr(krx_symbols, "get_krx_auth", lambda: FakeAuth())
+    monkeypatch.setattr(krx_symbols, "_candidate_days", lambda: ["20260312"])
+    master = krx_symbols.SymbolMaster()
+    monkeypatch.setattr(master, "_fallback_name", lambda code, kind: pytest.fail(f"개별 조회: {code}"))
+
+    df = master.attach(pd.DataFrame({"종목코드": ["58K123", "57J001"]}), kind="elw")
+    assert df["종목명"].tolist() == ["한국K123삼성전자콜", "미래J001KOSPI200풋"]
+    assert master.get("58K123")["kind"] == "elw"
+    assert master.name_of("005930") == "삼성전자"
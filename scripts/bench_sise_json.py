@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+네이버 siseJson 응답 파싱 벤치마크 — ast.literal_eval vs naver_sise.parse_sise_json
+
+여러 해 치 일봉 응답(제목 줄 포함, 네이버와 같은 줄바꿈/탭 모양)을 만들어서
+예전 방식(literal_eval → DataFrame → to_datetime/to_numeric)과
+새 파서(bytes → NumPy 배열 → DataFrame)의 결과가 같은지 확인하고,
+파싱 시간과 최대 메모리를 비교합니다.
+
+사용법:
+  python scripts/bench_sise_json.py                   # 1/5/10/20/30년 치
+  python scripts/bench_sise_json.py --years 3 25 --repeat 10
+  python scripts/bench_sise_json.py --file resp.txt   # 실제로 받아둔 응답 파일
+"""
+
+import argparse
+import ast
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from naver_sise import parse_sise_json  # noqa: E402
+
+HEADER = "[['날짜', '시가', '고가', '저가', '종가', '거래량', '외국인소진율'],"
+
+
+def make_fixture(years: int, seed: int = 0) -> bytes:
+    """years년 치 평일 일봉 siseJson 응답 (가격은 랜덤 워크)"""
+    rng = random.Random(seed)
+    days = pd.bdate_range(end="2026-10-16", periods=years * 250)
+    price = 50000
+    lines = ["", " " + HEADER]
+    for day in days:
+        open_ = price
+        close = max(100, int(open_ * (1 + rng.gauss(0, 0.02))) // 10 * 10)
+        high = max(open_, close) + rng.randrange(0, 1000, 10)
+        low = max(10, min(open_, close) - rng.randrange(0, 1000, 10))
+        volume = rng.randrange(100_000, 40_000_000)
+        ratio = round(rng.uniform(10, 60), 2)
+        lines.append("\t\t")
+        lines.append(f'["{day:%Y%m%d}", {open_}, {high}, {low}, {close}, {volume}, {ratio}],')
+        price = close
+    lines[-1] = lines[-1].rstrip(",")
+    lines += ["\t\t", "]", ""]
+    return "\n".join(lines).encode("utf-8")
+
+
+def legacy_frame(body: bytes) -> pd.DataFrame:
+    """예전 get_ohlcv의 파싱 부분 (literal_eval)"""
+    data = ast.literal_eval(body.decode("utf-8").strip())
+    if isinstance(data[0][0], str) and not data[0][0].isdigit():
+        data = data[1:]
+    df = pd.DataFrame(data)
+    df.columns = ["날짜", "시가", "고가", "저가", "종가", "거래량"] + list(df.columns[6:])
+    df["날짜"] = df["날짜"].astype(str).str.strip().str.replace("'", "")
+    df["날짜"] = pd.to_datetime(df["날짜"], format="%Y%m%d", errors="coerce")
+    df = df.dropna(subset=["날짜"]).set_index("날짜")
+    for col in ["시가", "고가", "저가", "종가", "거래량"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df
+
+
+def new_frame(body: bytes) -> pd.DataFrame:
+    """지금 get_ohlcv의 파싱 부분 (parse_sise_json)"""
+    df = pd.DataFrame(parse_sise_json(body))
+    return df.dropna(subset=["날짜"]).set_index("날짜")
+
+
+def measure(fn, body: bytes, repeat: int) -> tuple[float, float]:
+    """→ (가장 빠른 실행 ms, 최대 메모리 MB)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(body)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1000, peak / 1024 / 1024
+
+
+def check_same(body: bytes):
+    old = legacy_frame(body)
+    new = new_frame(body)
+    # 예전에는 7번째 열 이름이 6 (제목 줄을 버렸음)
+    old = old.rename(columns={6: "외국인소진율"})
+    pd.testing.assert_frame_equal(old, new, check_index_type=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--years", type=int, nargs="+", default=[1, 5, 10, 20, 30])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--file", type=Path, help="받아둔 siseJson 응답 파일")
+    args = parser.parse_args()
+
+    if args.file:
+        cases = [(args.file.name, args.file.read_bytes())]
+    else:
+        cases = [(f"{years}년", make_fixture(years)) for years in args.years]
+
+    print(f"{'응답':>10} {'줄 수':>7} {'크기':>8} | {'literal_eval':>20} | {'parse_sise_json':>20} | {'배':>5}")
+    for label, body in cases:
+        check_same(body)
+        rows = len(new_frame(body))
+        old_ms, old_mb = measure(legacy_frame, body, args.repeat)
+        new_ms, new_mb = measure(new_frame, body, args.repeat)
+        print(
+            f"{label:>10} {rows:>7,} {len(body) / 1024:>6.0f}KB | "
+            f"{old_ms:>8.1f} ms {old_mb:>7.1f} MB | {new_ms:>8.1f} ms {new_mb:>7.1f} MB | "
+            f"{old_ms / new_ms:>4.0f}x"
+        )
+    print("결과 DataFrame 일치 확인 완료 (numpy", np.__version__, "/ pandas", pd.__version__ + ")")
+
+
+if __name__ == "__main__":
+    main()